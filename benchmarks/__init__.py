@@ -0,0 +1,3 @@
+"""
+Benchmarks guarding KeynoteGenie's startup time and pipeline overhead.
+"""
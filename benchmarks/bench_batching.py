@@ -0,0 +1,165 @@
+"""
+Throughput of the local provider with and without micro-batching.
+
+Concurrent callers, standing in for agents of parallel runs, send single-prompt
+requests to a ``LocalModel``. Each batching setting is run in turn, and the
+benchmark reports generated tokens per second, request latency and the batch
+sizes the scheduler achieved. The first setting (by default ``max_batch=1``,
+i.e. no batching) is the baseline for the speedup.
+
+By default the model is simulated, so the numbers describe the scheduler rather
+than any real model's speed. Each generate() call sleeps for one decoding
+step per new token, and a step costs ``--step-ms`` plus ``--per-seq-ms`` for
+every prompt in the batch, modelling a memory-bound forward pass whose cost
+grows slowly with batch size. With ``--model`` a real Hugging Face model runs on
+CPU instead (requires transformers and torch).
+
+    python -m benchmarks.bench_batching
+    python -m benchmarks.bench_batching --batch 1,4,8,16 --wait-ms 0,5 --concurrency 32
+    python -m benchmarks.bench_batching --model flan-t5-small --max-new-tokens 32
+"""
+
+import argparse
+import itertools
+import json
+import math
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+BENCHMARKS_DIR = Path(__file__).parent.resolve()
+ROOT_DIR = BENCHMARKS_DIR.parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+
+def _parse_list(value: str, cast=int) -> List[Any]:
+    return [cast(v) for v in value.split(",") if v.strip()]
+
+
+class SimulatedBackend:
+    """Generation cost model of a small CPU model: a fixed cost per decoding step plus a little per prompt."""
+
+    def __init__(self, step_ms: float, per_seq_ms: float):
+        self.step_ms = step_ms
+        self.per_seq_ms = per_seq_ms
+
+    def format_prompt(self, messages):
+        return "\n\n".join(str(m.get("content", "")) for m in messages)
+
+    def generate(self, prompts, max_new_tokens, temperature):
+        time.sleep(max_new_tokens * (self.step_ms + self.per_seq_ms * len(prompts)) / 1000)
+        return [(" ".join(["token"] * max_new_tokens), len(prompt.split()), max_new_tokens) for prompt in prompts]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile, like ``LatencyTracker.percentile``."""
+    values = sorted(values)
+    return values[min(len(values), max(1, math.ceil(len(values) * pct / 100))) - 1] if values else 0.0
+
+
+def run_scenario(backend: Any, max_batch: int, wait_ms: float, concurrency: int, requests: int,
+                 max_new_tokens: int) -> Dict[str, Any]:
+    """Send ``requests`` prompts from ``concurrency`` threads through one batching setting."""
+    from src.models.config.local import LocalModel
+
+    model = LocalModel(f"bench-b{max_batch}-w{wait_ms}", backend=backend, max_batch=max_batch,
+                       max_wait=wait_ms / 1000)
+
+    def ask(i: int):
+        start = time.perf_counter()
+        _, _, completion_tokens = model.complete(
+            [{"role": "user", "content": f"Suggest a search query about topic {i} for a keynote on applied AI"}],
+            max_tokens=max_new_tokens,
+        )
+        return time.perf_counter() - start, completion_tokens
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(ask, range(requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        model.batcher.close()
+
+    latencies = [latency for latency, _ in results]
+    tokens = sum(tokens for _, tokens in results)
+    stats = model.batcher.stats()
+    return {
+        "max_batch": max_batch,
+        "wait_ms": wait_ms,
+        "requests": len(results),
+        "completion_tokens": tokens,
+        "elapsed_s": round(elapsed, 3),
+        "tokens_per_s": round(tokens / elapsed, 1) if elapsed else 0.0,
+        "latency_p50_s": round(_percentile(latencies, 50), 3),
+        "latency_p95_s": round(_percentile(latencies, 95), 3),
+        "batches": stats["batches"],
+        "mean_batch_size": stats["mean_batch_size"],
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark local-model throughput with micro-batching")
+    parser.add_argument("--batch", type=_parse_list, default=[1, 4, 8, 16],
+                        help="Comma-separated max batch sizes; the first is the baseline (default: 1,4,8,16)")
+    parser.add_argument("--wait-ms", type=lambda v: _parse_list(v, float), default=[5.0],
+                        help="Comma-separated max waits in milliseconds (default: 5)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent callers")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per scenario")
+    parser.add_argument("--max-new-tokens", type=int, default=16, help="Tokens generated per request")
+    parser.add_argument("--model", help="Hugging Face model ID or shorthand to run instead of the simulation")
+    parser.add_argument("--step-ms", type=float, default=4.0, help="Simulated cost of a decoding step")
+    parser.add_argument("--per-seq-ms", type=float, default=0.25,
+                        help="Simulated extra cost of a decoding step per prompt in the batch")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+    sys.path.insert(0, str(ROOT_DIR))
+
+    if args.model:
+        from src.models.config.local import TransformersBackend, resolve_model_id
+
+        print(f"Loading {resolve_model_id(args.model)}...")
+        backend = TransformersBackend(resolve_model_id(args.model))
+    else:
+        backend = SimulatedBackend(args.step_ms, args.per_seq_ms)
+
+    scenarios = []
+    for max_batch, wait_ms in itertools.product(args.batch, args.wait_ms):
+        print(f"Running {args.requests} requests from {args.concurrency} callers, "
+              f"max batch {max_batch}, max wait {wait_ms} ms...")
+        scenarios.append(run_scenario(backend, max_batch, wait_ms, args.concurrency, args.requests,
+                                      args.max_new_tokens))
+    base = scenarios[0]["tokens_per_s"] if scenarios else 0
+    for scenario in scenarios:
+        scenario["speedup"] = round(scenario["tokens_per_s"] / base, 2) if base else None
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "model": args.model or "simulated",
+            "concurrency": args.concurrency,
+            "max_new_tokens": args.max_new_tokens,
+            "step_ms": None if args.model else args.step_ms,
+            "per_seq_ms": None if args.model else args.per_seq_ms,
+        },
+        "scenarios": scenarios,
+    }
+    output = args.output or RESULTS_DIR / f"batching_{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    print(f"{'batch':>6} {'wait ms':>8} {'tokens/s':>9} {'speedup':>8} {'mean batch':>11} {'p50 s':>7} {'p95 s':>7}")
+    for s in scenarios:
+        print(f"{s['max_batch']:>6} {s['wait_ms']:>8} {s['tokens_per_s']:>9} {s['speedup']:>8} "
+              f"{s['mean_batch_size']:>11} {s['latency_p50_s']:>7} {s['latency_p95_s']:>7}")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
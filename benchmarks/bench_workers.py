@@ -0,0 +1,117 @@
+"""
+Throughput of the worker process pool against the number of workers.
+
+Runs the same batch of distinct topics through ``WorkerPool`` with each worker
+count, using the offline LLM and search stand-ins, and reports runs per second
+and the speedup over a single worker. Worker start-up and warm-up are timed
+separately so the figures show steady-state throughput.
+
+    python -m benchmarks.bench_workers
+    python -m benchmarks.bench_workers --workers 1,2,4,8 --topics 32 --latency-ms 50
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+BENCHMARKS_DIR = Path(__file__).parent.resolve()
+ROOT_DIR = BENCHMARKS_DIR.parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+
+def _parse_int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def run_scenario(workers: int, topic_count: int, max_jobs: int) -> Dict[str, Any]:
+    """Start a pool with ``workers`` processes and run ``topic_count`` topics through it."""
+    from src.agents.worker_pool import WorkerPool
+
+    topics = [f"Worker benchmark w{workers} topic {i} on applied AI" for i in range(topic_count)]
+    start = time.perf_counter()
+    pool = WorkerPool(processes=workers, max_jobs_per_worker=max_jobs).start()
+    try:
+        pool.wait_ready()
+        startup_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = pool.map(topics)
+        elapsed = time.perf_counter() - start
+        stats = dict(pool.stats)
+    finally:
+        pool.close()
+
+    completed = [r for r in results if not isinstance(r, Exception)]
+    return {
+        "workers": workers,
+        "topics": topic_count,
+        "completed": len(completed),
+        "errors": len(results) - len(completed),
+        "startup_s": round(startup_s, 3),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_runs_per_s": round(len(completed) / elapsed, 3) if elapsed else 0.0,
+        "workers_used": len({r["worker"] for r in completed}),
+        "recycled": stats["recycled"],
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark WorkerPool throughput against worker count")
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, max(1, cores // 2), cores})
+    parser.add_argument("--workers", type=_parse_int_list, default=default_workers,
+                        help="Comma-separated worker counts (default: 1, half and all cores)")
+    parser.add_argument("--topics", type=int, default=max(8, 4 * cores), help="Topics per scenario")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Fake LLM latency per call")
+    parser.add_argument("--max-jobs-per-worker", type=int, default=0, help="Recycle workers after N jobs (0: never)")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    # Worker processes inherit this environment when they are spawned
+    os.environ.update({
+        "KEYNOTEGENIE_LLM_PROVIDER": "fake",
+        "KEYNOTEGENIE_SEARCH_PROVIDER": "fake",
+        "KEYNOTEGENIE_OUTPUTS_DIR": tempfile.mkdtemp(prefix="keynotegenie-bench-"),
+        "KEYNOTEGENIE_CACHE_DIR": tempfile.mkdtemp(prefix="keynotegenie-bench-cache-"),
+        "FAKE_LLM_LATENCY_MS": str(args.latency_ms),
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+    })
+    sys.path.insert(0, str(ROOT_DIR))
+
+    scenarios = []
+    for workers in args.workers:
+        print(f"Running {args.topics} topics with {workers} workers...")
+        scenarios.append(run_scenario(workers, args.topics, args.max_jobs_per_worker))
+    base = scenarios[0]["throughput_runs_per_s"] if scenarios else 0
+    for scenario in scenarios:
+        scenario["speedup"] = round(scenario["throughput_runs_per_s"] / base, 2) if base else None
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": cores,
+        "settings": {"latency_ms": args.latency_ms, "max_jobs_per_worker": args.max_jobs_per_worker},
+        "scenarios": scenarios,
+    }
+    output = args.output or RESULTS_DIR / f"workers_{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    print(f"{'workers':>8} {'runs/s':>8} {'speedup':>8} {'startup s':>10}")
+    for scenario in scenarios:
+        print(f"{scenario['workers']:>8} {scenario['throughput_runs_per_s']:>8} "
+              f"{scenario['speedup']:>8} {scenario['startup_s']:>10}")
+    print(f"Results written to {output}")
+    return 0 if all(not s["errors"] for s in scenarios) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
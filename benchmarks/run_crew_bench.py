@@ -0,0 +1,274 @@
+"""
+End-to-end benchmark for ``run_crew`` against the offline LLM and search stand-ins.
+
+Runs the full pipeline (CrewAI orchestration, logging, output store, history index)
+for each combination of concurrency level and topic count, and records wall time,
+per-stage latency, peak RSS, log bytes written and module startup time. Results
+are written to a JSON file and compared against the committed baseline; failed
+runs, fewer completed runs or slower metrics than the baseline fail the benchmark.
+
+    python -m benchmarks.run_crew_bench
+    python -m benchmarks.run_crew_bench --concurrency 1,4 --topics 4,16 --latency-ms 20
+    python -m benchmarks.run_crew_bench --save-baseline
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+BENCHMARKS_DIR = Path(__file__).parent.resolve()
+ROOT_DIR = BENCHMARKS_DIR.parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+BASELINE_FILE = BENCHMARKS_DIR / "baseline.json"
+
+# Allowed slowdown relative to the baseline before a metric counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Timed metrics must also slow down by this many seconds; offline runs take tenths
+# of a second, where scheduling noise alone exceeds the relative tolerance
+DEFAULT_MIN_DELTA_S = 0.2
+
+# Same for the startup import time, which takes tens of milliseconds
+DEFAULT_MIN_DELTA_MS = 20.0
+
+# Metrics compared against the baseline; all are "lower is better"
+COMPARED_METRICS = ("wall_p50_s", "wall_p95_s", "research_p50_s", "keynote_p50_s", "log_bytes_per_run")
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def log_bytes() -> int:
+    """Total size of the log files the root logger is writing to."""
+    total = 0
+    for handler in logging.getLogger().handlers:
+        filename = getattr(handler, "baseFilename", None)
+        if filename and os.path.exists(filename):
+            handler.flush()
+            total += os.path.getsize(filename)
+    return total
+
+
+def run_scenario(run_crew, store, concurrency: int, topic_count: int, label: str) -> Dict[str, Any]:
+    """Run ``topic_count`` distinct topics through ``run_crew`` with a thread pool."""
+    topics = [f"Benchmark {label} topic {i} on applied AI" for i in range(topic_count)]
+    wall_times: List[float] = []
+    errors = 0
+
+    def timed_run(topic: str) -> float:
+        start = time.perf_counter()
+        run_crew(topic)
+        return time.perf_counter() - start
+
+    log_before = log_bytes()
+    scenario_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(timed_run, topic) for topic in topics]
+        for future in futures:
+            try:
+                wall_times.append(future.result())
+            except Exception:
+                errors += 1
+    elapsed = time.perf_counter() - scenario_start
+    written = log_bytes() - log_before
+
+    stages: Dict[str, List[float]] = {"research": [], "keynote": []}
+    tiers: Dict[str, Dict[str, Any]] = {}
+    for topic in topics:
+        meta = store.read_metadata(topic) or {}
+        for stage, seconds in meta.get("timings", {}).get("stages", {}).items():
+            stages.setdefault(stage, []).append(seconds)
+        # Per-tier LLM latency, tokens and cost summed over the scenario's runs
+        for tier, usage in (meta.get("llm_usage") or {}).items():
+            totals = tiers.setdefault(tier, {"model": usage["model"], "calls": 0, "latency_s": 0.0,
+                                             "tokens": 0, "cost_usd": 0.0})
+            totals["calls"] += usage["calls"]
+            totals["latency_s"] = round(totals["latency_s"] + usage["latency_s"], 3)
+            totals["tokens"] += usage["prompt_tokens"] + usage["completion_tokens"]
+            if usage["cost_usd"] is None or totals["cost_usd"] is None:
+                totals["cost_usd"] = None
+            else:
+                totals["cost_usd"] = round(totals["cost_usd"] + usage["cost_usd"], 6)
+
+    completed = len(wall_times)
+    return {
+        "concurrency": concurrency,
+        "topics": topic_count,
+        "completed": completed,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_runs_per_s": round(completed / elapsed, 3) if elapsed else 0.0,
+        "wall_p50_s": round(_percentile(wall_times, 50), 4),
+        "wall_p95_s": round(_percentile(wall_times, 95), 4),
+        "research_p50_s": round(_percentile(stages["research"], 50), 4),
+        "keynote_p50_s": round(_percentile(stages["keynote"], 50), 4),
+        "log_bytes": written,
+        "log_bytes_per_run": round(written / completed) if completed else 0,
+        "peak_rss_mb": peak_rss_mb(),
+        "tiers": tiers,
+    }
+
+
+def run_failures(results: Dict[str, Any]) -> List[str]:
+    """Return human-readable descriptions of scenarios in which runs failed."""
+    return [
+        f"c={scenario['concurrency']} n={scenario['topics']}: {scenario['errors']} of {scenario['topics']} runs failed"
+        for scenario in results["scenarios"] if scenario["errors"]
+    ]
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+                        min_delta_s: float = DEFAULT_MIN_DELTA_S,
+                        min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[str]:
+    """Return human-readable regressions of ``results`` versus ``baseline``."""
+    regressions = run_failures(results)
+    baseline_scenarios = {(s["concurrency"], s["topics"]): s for s in baseline.get("scenarios", [])}
+    for scenario in results["scenarios"]:
+        reference = baseline_scenarios.get((scenario["concurrency"], scenario["topics"]))
+        if not reference:
+            continue
+        if scenario["completed"] < reference.get("completed", 0):
+            regressions.append(
+                f"c={scenario['concurrency']} n={scenario['topics']}: completed {reference['completed']} -> "
+                f"{scenario['completed']}"
+            )
+        for metric in COMPARED_METRICS:
+            old, new = reference.get(metric), scenario.get(metric)
+            slack = min_delta_s if metric.endswith("_s") else 0
+            if old and new is not None and new > old * (1 + tolerance) and new - old > slack:
+                regressions.append(
+                    f"c={scenario['concurrency']} n={scenario['topics']}: {metric} {old} -> {new} "
+                    f"(+{(new / old - 1):.0%}, tolerance {tolerance:.0%})"
+                )
+
+    old_startup = baseline.get("startup", {}).get("import_ms")
+    new_startup = results.get("startup", {}).get("import_ms")
+    if (old_startup and new_startup and new_startup > old_startup * (1 + tolerance)
+            and new_startup - old_startup > min_delta_ms):
+        regressions.append(f"startup import_ms {old_startup} -> {new_startup}")
+    return regressions
+
+
+def _parse_int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark run_crew against offline stand-ins")
+    parser.add_argument("--concurrency", type=_parse_int_list, default=[1, 4], help="Comma-separated thread counts")
+    parser.add_argument("--topics", type=_parse_int_list, default=[4], help="Comma-separated topic counts")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Fake LLM latency per call")
+    parser.add_argument("--search-latency-ms", type=float, default=0, help="Fake search latency per call")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="Baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed relative slowdown")
+    parser.add_argument("--min-delta-s", type=float, default=DEFAULT_MIN_DELTA_S,
+                        help="Smallest slowdown in seconds that counts as a regression of a timed metric")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="Smallest slowdown in milliseconds that counts as a startup regression")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    # Configure offline providers and isolated output and cache directories before importing
+    # the agent, so neither earlier runs nor the user's caches can skew the numbers
+    work_dir = tempfile.mkdtemp(prefix="keynotegenie-bench-")
+    os.environ.update({
+        "KEYNOTEGENIE_LLM_PROVIDER": "fake",
+        "KEYNOTEGENIE_SEARCH_PROVIDER": "fake",
+        "KEYNOTEGENIE_OUTPUTS_DIR": work_dir,
+        "KEYNOTEGENIE_CACHE_DIR": tempfile.mkdtemp(prefix="keynotegenie-bench-cache-"),
+        "FAKE_LLM_LATENCY_MS": str(args.latency_ms),
+        "FAKE_SEARCH_LATENCY_MS": str(args.search_latency_ms),
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+    })
+    sys.path.insert(0, str(ROOT_DIR))
+
+    from benchmarks.startup import measure_import
+    startup = measure_import("src.agents.agent", runs=3)
+
+    from src.agents.agent import run_crew
+    from src.agents.runtime import get_runtime
+
+    # Warm up once so one-time initialization is reported separately from steady state
+    warmup_start = time.perf_counter()
+    run_crew("Benchmark warmup topic")
+    warmup_s = time.perf_counter() - warmup_start
+
+    store = get_runtime().output_store
+    scenarios = []
+    for topic_count in args.topics:
+        for concurrency in args.concurrency:
+            label = f"c{concurrency}n{topic_count}"
+            print(f"Running scenario concurrency={concurrency} topics={topic_count}...")
+            scenarios.append(run_scenario(run_crew, store, concurrency, topic_count, label))
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"latency_ms": args.latency_ms, "search_latency_ms": args.search_latency_ms},
+        "startup": startup,
+        "warmup_s": round(warmup_s, 3),
+        "crews_built": get_runtime().crew_pool.created,
+        "scenarios": scenarios,
+    }
+
+    output = args.output or RESULTS_DIR / f"run_crew_{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+
+    if args.save_baseline:
+        failures = run_failures(results)
+        if failures:
+            print("Not saving a baseline with failed runs:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        args.baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 1
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta_s, args.min_delta_ms)
+    if regressions:
+        print("REGRESSIONS:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
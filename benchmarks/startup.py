@@ -0,0 +1,90 @@
+"""
+Startup benchmark based on ``python -X importtime``.
+
+Imports a module in a fresh interpreter, reports its cumulative import time and
+fails if it exceeds a budget or pulls in modules that must only load on first use.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --module src.agents.agent --max-ms 300
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+ROOT_DIR = Path(__file__).parent.parent.resolve()
+
+DEFAULT_MODULE = "src.agents.agent"
+
+# Modules that are slow to import and must be deferred until a run starts
+HEAVY_MODULES = ("crewai", "crewai_tools", "litellm", "pkg_resources")
+
+DEFAULT_MAX_MS = 500.0
+
+
+def measure_import(module: str = DEFAULT_MODULE, runs: int = 3) -> Dict[str, object]:
+    """Import ``module`` in fresh interpreters and return the best-of-N timings."""
+    best_ms = None
+    imported: List[str] = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=str(ROOT_DIR),
+            env=dict(os.environ, PYTHONPATH=str(ROOT_DIR)),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+        cumulative_us = {}
+        for line in result.stderr.splitlines():
+            # Format: "import time: <self us> | <cumulative us> | <indented module name>"
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            parts = line[len("import time:"):].split("|")
+            try:
+                cumulative = int(parts[1].strip())
+            except ValueError:
+                continue  # Header line
+            cumulative_us[parts[2].strip()] = cumulative
+
+        if module not in cumulative_us:
+            raise RuntimeError(f"No importtime entry found for {module}")
+        elapsed_ms = cumulative_us[module] / 1000
+        if best_ms is None or elapsed_ms < best_ms:
+            best_ms = elapsed_ms
+            imported = sorted(cumulative_us)
+
+    heavy = sorted({name for name in imported if name.split(".")[0] in HEAVY_MODULES})
+    return {"module": module, "import_ms": round(best_ms, 2), "modules_imported": len(imported), "heavy_imports": heavy}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure module import time with -X importtime")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="Module to import")
+    parser.add_argument("--runs", type=int, default=3, help="Number of fresh interpreters (best is reported)")
+    parser.add_argument("--max-ms", type=float, default=DEFAULT_MAX_MS, help="Fail above this import time")
+    args = parser.parse_args(argv)
+
+    result = measure_import(args.module, runs=args.runs)
+    print(json.dumps(result, indent=2))
+
+    failed = False
+    if result["heavy_imports"]:
+        print(f"FAIL: {args.module} imports heavy modules at import time: {', '.join(result['heavy_imports'])}")
+        failed = True
+    if result["import_ms"] > args.max_ms:
+        print(f"FAIL: import took {result['import_ms']} ms (budget {args.max_ms} ms)")
+        failed = True
+    if not failed:
+        print(f"OK: {args.module} imported in {result['import_ms']} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+#!/usr/bin/env python
+"""
+Script to run KeynoteGenie node workers and queue jobs in distributed mode
+"""
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+from src.agents.node_worker import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+#!/usr/bin/env python
+"""
+Script to inspect, pin and warm cached KeynoteGenie topics
+"""
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.append(str(Path(__file__).parent.parent.resolve()))
+
+from src.utils.result_cache import main
+
+if __name__ == "__main__":
+    sys.exit(main())
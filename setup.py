@@ -13,9 +13,13 @@ setup(
         "python-dotenv>=1.0.1",
         "colorama>=0.4.6",
         "requests>=2.31.0",
+        "httpx>=0.24.0",
+        "starlette>=0.27.0",
+        "uvicorn>=0.23.0",
         "crewai>=0.16.0",
         "crewai-tools>=0.0.15",
         "streamlit>=1.31.0",
+        "numpy>=1.24.0",
         "pathlib>=1.0.1",
     ],
     python_requires=">=3.8",
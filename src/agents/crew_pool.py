@@ -0,0 +1,256 @@
+"""
+Reusable researcher/writer crews for long-lived processes.
+
+Agents, tasks and the crew are built once with a ``{topic}`` placeholder that
+CrewAI interpolates on each kickoff, so per-run setup is just a reset of the
+previous run's task outputs. Crews are not safe to run concurrently, so a pool
+hands each caller its own instance and keeps a bounded number idle for reuse.
+
+Given a run checkpoint, a crew saves each finished task to it and skips the
+tasks it already holds, so an interrupted run resumes where it stopped.
+"""
+
+import dataclasses
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from src.config.settings import COMPACTION_TOKEN_BUDGET, RESEARCH_TASK_DESCRIPTION, WRITING_MODE
+from src.models.tiers import TierStats, build_llm
+from src.utils.checkpoints import RunCheckpoint
+from src.utils.compaction import CompactionResult, compact_research
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Maximum number of idle crews kept for reuse
+DEFAULT_MAX_IDLE = 4
+
+
+class ResearchCrew:
+    """Topic-parameterized researcher and writer crew, built once and reused."""
+
+    def __init__(self, models: Union[str, Dict[str, str]], search: Optional[Any] = None,
+                 compaction_budget: int = COMPACTION_TOKEN_BUDGET, writing_mode: str = WRITING_MODE):
+        from crewai import Agent, Crew, Task
+
+        if writing_mode not in ("single", "sectioned"):
+            raise ValueError(f"Unknown writing mode: {writing_mode}")
+        tools = [search] if search else []
+        # A single model name serves every tier
+        self.models = {"fast": models, "large": models} if isinstance(models, str) else dict(models)
+        self.model_name = self.models["large"]
+        # Per-tier latency and token usage of the last run
+        self.llm_stats = TierStats()
+        self.compaction_budget = compaction_budget
+        self.writing_mode = writing_mode
+        self.runs = 0
+        self.topic = ""
+        # Full research text, compaction stats and keynote of the last run
+        self.research_text = ""
+        self.compaction: Optional[CompactionResult] = None
+        self.keynote_text = ""
+        self._sectioned_writer = None
+        self._writing_timings: Dict[str, float] = {}
+        self._on_stage: Optional[Callable[[str], None]] = None
+        self._checkpoint: Optional[RunCheckpoint] = None
+        # Tasks of the last run loaded from its checkpoint instead of executed
+        self.resumed_steps: List[str] = []
+
+        # Create the researcher agent
+        self.researcher = Agent(
+            llm=build_llm(self.models, "researcher", self.llm_stats, uses_tools=bool(tools)),
+            role="Senior Researcher",
+            goal="Find promising research in the field of {topic}.",
+            backstory="You are a veteran researcher with deep expertise in the requested topic.",
+            allow_delegation=False,
+            tools=tools,
+            verbose=False,
+        )
+        logger.info(f"Created researcher agent with {len(tools)} tools")
+
+        # Create research task
+        self.research_task = Task(
+            description=RESEARCH_TASK_DESCRIPTION,
+            expected_output="A detailed bullet point summary on each of the topics. Each bullet point should cover the topic, background and why the innovation is useful.",
+            agent=self.researcher,
+            callback=self._compact_research,
+        )
+
+        # Create the writer agent
+        self.writer = Agent(
+            llm=build_llm(self.models, "writer", self.llm_stats),
+            role="Senior Speech Writer",
+            goal="Write engaging and witty keynote speeches about {topic} from provided research.",
+            backstory="You are a veteran writer with a background in creating compelling narratives from technical content.",
+            allow_delegation=False,
+            verbose=False,
+        )
+
+        # Create writing task
+        self.keynote_task = Task(
+            description="Create a compelling keynote speech about {topic}.",
+            expected_output="A detailed keynote speech with an intro, body and conclusion.",
+            agent=self.writer,
+            context=[self.research_task],
+            callback=self._save_keynote,
+        )
+
+        self.crew = Crew(
+            agents=[self.researcher, self.writer],
+            tasks=[self.research_task, self.keynote_task],
+            verbose=0
+        )
+        # Research-only crew for the sectioned writing mode, which replaces the keynote task
+        self.research_crew = Crew(agents=[self.researcher], tasks=[self.research_task], verbose=0)
+        # Writer-only crew for runs resumed after the research task; CrewAI reads the
+        # keynote task's context from the research task's output even outside the crew
+        self.writer_crew = Crew(agents=[self.writer], tasks=[self.keynote_task], verbose=0)
+
+    def _compact_research(self, output: Any) -> None:
+        """Shrink the research output the writer receives as context to the token budget."""
+        self.research_text = output.raw
+        self.compaction = compact_research(output.raw, self.compaction_budget, self.topic)
+        if self.compaction is not None:
+            # The keynote task reads its context from this output's raw text
+            output.raw = self.compaction.text
+        if self._checkpoint is not None:
+            self._checkpoint.save("research", {
+                "raw": self.research_text,
+                "compaction": dataclasses.asdict(self.compaction) if self.compaction else None,
+            })
+        if self._on_stage is not None:
+            self._on_stage("research_complete")
+
+    def _restore_research(self, saved: Dict[str, Any]) -> None:
+        """Load checkpointed research as if the research task had just run."""
+        from crewai.tasks.task_output import TaskOutput
+
+        self.research_text = saved["raw"]
+        self.compaction = CompactionResult(**saved["compaction"]) if saved.get("compaction") else None
+        self.research_task.output = TaskOutput(
+            description=self.research_task.description,
+            raw=self.compaction.text if self.compaction else self.research_text,
+            agent=self.researcher.role,
+        )
+        self.resumed_steps.append("research")
+        if self._on_stage is not None:
+            self._on_stage("research_complete")
+
+    def _save_keynote(self, output: Any) -> None:
+        if self._checkpoint is not None:
+            self._checkpoint.save("keynote", {"text": output.raw})
+
+    def reset(self) -> None:
+        """Clear state left over from the previous run."""
+        for task in self.crew.tasks:
+            task.output = None
+            task.start_time = None
+            task.end_time = None
+        self.research_text = ""
+        self.compaction = None
+        self.keynote_text = ""
+        self._writing_timings = {}
+        self._on_stage = None
+        self._checkpoint = None
+        self.resumed_steps = []
+        self.llm_stats.reset()
+
+    def stage_timings(self) -> Dict[str, float]:
+        """Seconds spent in each task of the last run."""
+        timings = {}
+        for stage, task in (("research", self.research_task), ("keynote", self.keynote_task)):
+            if task.start_time and task.end_time:
+                timings[stage] = round((task.end_time - task.start_time).total_seconds(), 3)
+        if self._writing_timings:
+            # Sectioned writing reports its passes, and their total as the keynote stage
+            timings.update(self._writing_timings)
+            timings["keynote"] = round(sum(self._writing_timings.values()), 3)
+        return timings
+
+    @property
+    def sectioned_writer(self):
+        """Outline/section/stitch crews, built on the first sectioned run."""
+        if self._sectioned_writer is None:
+            from src.agents.sectioned_writer import SectionedWriter
+            self._sectioned_writer = SectionedWriter(
+                build_llm(self.models, "writer", self.llm_stats),
+                build_llm(self.models, "outliner", self.llm_stats),
+            )
+        return self._sectioned_writer
+
+    def kickoff(self, topic: str, on_stage: Optional[Callable[[str], None]] = None,
+                checkpoint: Optional[RunCheckpoint] = None) -> Any:
+        """
+        Run the crew for a topic, calling ``on_stage`` with the name of each completed stage.
+
+        With a checkpoint, finished tasks are saved to it and tasks it already
+        holds are loaded instead of run again.
+        """
+        self.reset()
+        self.runs += 1
+        self.topic = topic
+        self._on_stage = on_stage
+        self._checkpoint = checkpoint
+        research = checkpoint.get("research") if checkpoint is not None else None
+        keynote = checkpoint.get("keynote") if checkpoint is not None else None
+        if research is not None:
+            self._restore_research(research)
+        if research is not None and keynote is not None:
+            # Interrupted after writing but before the artifacts were saved
+            self.resumed_steps.append("keynote")
+            self.keynote_text = keynote["text"]
+            return self.keynote_text
+
+        if self.writing_mode == "single":
+            return (self.writer_crew if research is not None else self.crew).kickoff(inputs={"topic": topic})
+
+        if research is None:
+            self.research_crew.kickoff(inputs={"topic": topic})
+        # The research output holds the compacted research the writer should see
+        self.keynote_text = self.sectioned_writer.write(topic, self.research_task.output.raw, checkpoint)
+        self._writing_timings = dict(self.sectioned_writer.timings)
+        self.resumed_steps.extend(self.sectioned_writer.restored)
+        if checkpoint is not None:
+            checkpoint.save("keynote", {"text": self.keynote_text})
+        return self.keynote_text
+
+
+class CrewPool:
+    """Thread-safe pool of reusable crews."""
+
+    def __init__(self, factory: Callable[[], ResearchCrew], max_idle: int = DEFAULT_MAX_IDLE):
+        self._factory = factory
+        self._max_idle = max_idle
+        self._idle: List[ResearchCrew] = []
+        self._lock = threading.Lock()
+        self.created = 0
+
+    @contextmanager
+    def acquire(self) -> Iterator[ResearchCrew]:
+        """Borrow a crew for one run, building a new one only if none is idle."""
+        with self._lock:
+            crew = self._idle.pop() if self._idle else None
+        if crew is None:
+            crew = self._factory()
+            with self._lock:
+                self.created += 1
+            logger.info(f"Built new crew (total built: {self.created})")
+
+        failed = False
+        try:
+            yield crew
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            crew.reset()
+            with self._lock:
+                # Drop crews from failed runs in case they were left inconsistent
+                if not failed and len(self._idle) < self._max_idle:
+                    self._idle.append(crew)
+
+    @property
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
@@ -0,0 +1,83 @@
+"""
+Offline, deterministic stand-in for SerperDevTool.
+
+Returns canned ``organic`` results derived from a hash of the query, with the same
+shape as Serper's response, so the research pipeline can be benchmarked without
+network access. Latency and errors are configurable through environment variables:
+- FAKE_SEARCH_LATENCY_MS: mean search latency (default 0)
+- FAKE_SEARCH_JITTER_MS: uniform +/- jitter around the mean (default 0)
+- FAKE_SEARCH_ERROR_RATE: probability of raising an error (default 0)
+- FAKE_SEARCH_SEED: seed for the latency/error random generator (default 0)
+"""
+
+import hashlib
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field, PrivateAttr
+
+from src.models.config.fake import FakeLLMConfig, deterministic_text
+
+# Number of organic results returned per query
+RESULTS_PER_QUERY = 10
+
+
+class FakeSearchSchema(BaseModel):
+    """Input for FakeSerperDevTool, matching SerperDevTool's argument name."""
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the internet")
+
+
+class FakeSerperDevTool(BaseTool):
+    name: str = "Search the internet with Serper"
+    description: str = "A tool that can be used to search the internet with a search_query."
+    args_schema: Type[BaseModel] = FakeSearchSchema
+    _config: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    calls: int = 0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Reuse the LLM stub's sampling logic with search-specific settings
+        self._config = FakeLLMConfig(
+            latency_ms=_env("FAKE_SEARCH_LATENCY_MS"),
+            jitter_ms=_env("FAKE_SEARCH_JITTER_MS"),
+            error_rate=_env("FAKE_SEARCH_ERROR_RATE"),
+            seed=int(_env("FAKE_SEARCH_SEED")),
+        )
+
+    def _run(self, search_query: str = "", **kwargs: Any) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+        delay, error_status = self._config.sample()
+        if delay:
+            time.sleep(delay)
+        if error_status:
+            raise RuntimeError(f"Injected fake search error ({error_status})")
+        return fake_search_results(search_query)
+
+
+def _env(name: str) -> float:
+    try:
+        return float(os.getenv(name, 0))
+    except ValueError:
+        return 0.0
+
+
+def fake_search_results(query: str, count: int = RESULTS_PER_QUERY) -> Dict[str, Any]:
+    """Build a Serper-shaped response for a query."""
+    digest = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    rng = random.Random(digest)
+    organic = []
+    for position in range(1, count + 1):
+        slug = f"{digest[:8]}-{position}"
+        organic.append({
+            "title": f"{query.title()[:60]} - insight {position}",
+            "link": f"https://example.com/{slug}",
+            "snippet": deterministic_text(f"{query}:{position}", rng.randint(20, 40)).replace("\n", " "),
+            "position": position,
+        })
+    return {"searchParameters": {"q": query, "type": "search", "engine": "fake"}, "organic": organic}
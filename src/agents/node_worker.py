@@ -0,0 +1,208 @@
+"""
+Distributed mode: a node that runs jobs claimed from a shared broker.
+
+Start one node worker per host. Each claims as many jobs as its local worker
+process pool has processes. It renews the leases of its running jobs with
+heartbeats and reports the outcome to the broker. Capacity grows by starting
+nodes on more hosts; if a node dies, its leases expire and other nodes pick
+its jobs up. Finished artifacts land in the shared output store, either
+because the nodes' output directory is on the shared volume or by publishing
+them there (``--publish-dir``).
+
+    python scripts/distributed.py worker --processes 4
+    python scripts/distributed.py submit "Edge AI" "Solid-state batteries"
+    python scripts/distributed.py status
+"""
+
+import argparse
+import functools
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from src.agents.worker_pool import WorkerPool, run_topic
+from src.config.settings import (
+    BROKER_HEARTBEAT_SECONDS,
+    BROKER_LEASE_SECONDS,
+    BROKER_POLL_SECONDS,
+    BROKER_URL,
+    OUTPUTS_DIR,
+    SHARED_OUTPUTS_DIR,
+    WORKER_MAX_JOBS,
+    WORKER_PROCESSES,
+)
+from src.utils.broker import Broker, get_broker
+from src.utils.output_store import ARTIFACT_FILES, OutputStore
+
+logger = logging.getLogger(__name__)
+
+# Metadata fields the target store sets itself
+_STORE_FIELDS = ("topic", "key", "updated_at")
+
+
+def publish_artifacts(topic: str, source: OutputStore, target: OutputStore) -> None:
+    """Copy a topic's artifacts, streamed in chunks, and metadata from a node's store to the shared store."""
+    for kind in ARTIFACT_FILES:
+        chunks = source.iter_artifact(topic, kind)
+        first = next(chunks, "")
+        if first:
+            with target.artifact_writer(topic, kind) as f:
+                f.write(first)
+                for chunk in chunks:
+                    f.write(chunk)
+    meta = {k: v for k, v in (source.read_metadata(topic) or {}).items() if k not in _STORE_FIELDS}
+    target.write_metadata(topic, **meta)
+
+
+def run_and_publish(topic: str, on_stage: Callable[[str], None], on_start: Callable[[str], None],
+                    publish_dir: Optional[str] = None) -> None:
+    """Run a crew in a worker process, then publish its artifacts if the shared store is elsewhere."""
+    run_topic(topic, on_stage, on_start)
+    if publish_dir and os.path.realpath(publish_dir) != os.path.realpath(OUTPUTS_DIR):
+        publish_artifacts(topic, OutputStore(), OutputStore(publish_dir))
+        on_stage("published")
+
+
+class NodeWorker:
+    """Claims jobs from a broker and runs them on a local worker pool."""
+
+    def __init__(self, broker: Broker, pool: WorkerPool, node_id: Optional[str] = None,
+                 lease_seconds: float = BROKER_LEASE_SECONDS, heartbeat_seconds: float = BROKER_HEARTBEAT_SECONDS,
+                 poll_seconds: float = BROKER_POLL_SECONDS):
+        self.broker = broker
+        self.pool = pool
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = min(heartbeat_seconds, lease_seconds / 2)
+        self.poll_seconds = poll_seconds
+        self.capacity = pool.processes
+        self.processed = 0
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+
+    def stop(self) -> None:
+        """Stop claiming jobs; running jobs are finished and reported first."""
+        self._stopping.set()
+        self._wake.set()
+
+    def _on_stage(self, job_id: str, stage: str) -> None:
+        entry = self._inflight.get(job_id)
+        if entry is not None:
+            entry["stage"] = stage
+            self._wake.set()
+
+    def step(self) -> bool:
+        """Report finished jobs, renew leases and claim new jobs; returns whether anything changed."""
+        changed = False
+        now = time.monotonic()
+        for job_id, entry in list(self._inflight.items()):
+            future = entry["future"]
+            if entry.get("lost"):
+                if future.done():
+                    del self._inflight[job_id]
+                    changed = True
+                    logger.info(f"Run of lost job {job_id} ended; its slot is free again")
+            elif future.done():
+                del self._inflight[job_id]
+                self.processed += 1
+                changed = True
+                error = future.exception()
+                reported = (self.broker.fail(job_id, self.node_id, str(error)) if error
+                            else self.broker.complete(job_id, self.node_id))
+                if not reported:
+                    logger.warning(f"Lease on job {job_id} was lost before it finished; result not reported")
+                else:
+                    logger.info(f"Job {job_id} {'failed: ' + str(error) if error else 'complete'}")
+            elif now >= entry["next_heartbeat"] or entry["stage"] != entry["reported_stage"]:
+                if not self.broker.heartbeat(job_id, self.node_id, self.lease_seconds, entry["stage"]):
+                    # Another node may be running it now; stop renewing and ignore our result, but the
+                    # run keeps its worker busy, so its slot stays taken until it ends
+                    logger.warning(f"Lost lease on job {job_id}")
+                    entry["lost"] = True
+                    entry["next_heartbeat"] = float("inf")
+                    continue
+                entry["reported_stage"] = entry["stage"]
+                entry["next_heartbeat"] = now + self.heartbeat_seconds
+
+        while not self._stopping.is_set() and len(self._inflight) < self.capacity:
+            job = self.broker.claim(self.node_id, self.lease_seconds)
+            if job is None:
+                break
+            changed = True
+            logger.info(f"Claimed job {job.id} ({job.topic}), attempt {job.attempts}")
+            entry = {"stage": None, "reported_stage": None, "next_heartbeat": now + self.heartbeat_seconds}
+            self._inflight[job.id] = entry
+            entry["future"] = self.pool.submit(job.topic, on_stage=functools.partial(self._on_stage, job.id))
+            entry["future"].add_done_callback(lambda _: self._wake.set())
+        return changed
+
+    def run(self, max_jobs: Optional[int] = None) -> int:
+        """Process jobs until stopped (or ``max_jobs`` have finished); returns the number processed."""
+        logger.info(f"Node {self.node_id} running up to {self.capacity} jobs at a time")
+        while True:
+            if max_jobs is not None and self.processed >= max_jobs:
+                self.stop()
+            self.step()
+            if self._stopping.is_set() and not self._inflight:
+                return self.processed
+            # Sleep until a job finishes or reports a stage, a heartbeat is due or it is time to poll
+            timeout = self.poll_seconds
+            if self._inflight:
+                next_heartbeat = min(entry["next_heartbeat"] for entry in self._inflight.values())
+                timeout = max(0.0, min(timeout, next_heartbeat - time.monotonic()))
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="KeynoteGenie distributed mode")
+    parser.add_argument("--broker", default=BROKER_URL, help="sqlite:///path/on/shared/volume or redis://host:port/db")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    worker = subparsers.add_parser("worker", help="Run jobs from the broker on this node")
+    worker.add_argument("--processes", type=int, default=WORKER_PROCESSES)
+    worker.add_argument("--max-jobs-per-worker", type=int, default=WORKER_MAX_JOBS)
+    worker.add_argument("--publish-dir", default=SHARED_OUTPUTS_DIR,
+                        help="Shared output store to publish artifacts to")
+    worker.add_argument("--node-id", help="Name of this node in the broker (default: host-pid)")
+
+    submit = subparsers.add_parser("submit", help="Queue topics")
+    submit.add_argument("topics", nargs="+")
+
+    status = subparsers.add_parser("status", help="Show queue counts and recent jobs")
+    status.add_argument("--limit", type=int, default=20)
+
+    subparsers.add_parser("requeue", help="Return jobs with expired leases to the queue")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    broker = get_broker(args.broker)
+
+    if args.command == "submit":
+        for topic in args.topics:
+            print(f"{broker.enqueue(topic).id}  {topic}")
+    elif args.command == "status":
+        print("  ".join(f"{state}: {count}" for state, count in broker.counts().items()))
+        for job in broker.list(limit=args.limit):
+            detail = job.error or job.stage or ""
+            print(f"{job.id}  {job.status:<8}  {job.worker or '-':<24}  {job.topic}  {detail}")
+    elif args.command == "requeue":
+        print(f"Requeued {broker.requeue_expired()} jobs")
+    else:
+        run_fn = functools.partial(run_and_publish, publish_dir=args.publish_dir)
+        with WorkerPool(args.processes, args.max_jobs_per_worker, run_fn=run_fn) as pool:
+            node = NodeWorker(broker, pool, args.node_id)
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *_: node.stop())
+            node.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Speculative prefetch of web searches while the user is still typing a topic.
+
+Once the topic input has been stable for a debounce interval, the searches the
+researcher is likely to issue first are run in the background and stored in the
+shared search cache. LLM calls are never made speculatively. When the run starts,
+the researcher's first searches are served from the warm cache.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from src.agents.search_cache import SearchCache, normalize_query
+from src.config.settings import PREFETCH_DEBOUNCE_SECONDS, RESEARCH_TASK_DESCRIPTION, SEARCH_PROVIDER
+
+logger = logging.getLogger(__name__)
+
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+
+# Number of organic results requested, matching SerperDevTool's default
+SERPER_RESULTS = 10
+
+
+def prefetch_queries(topic: str) -> List[str]:
+    """Queries the researcher is likely to issue first for a topic."""
+    topic = topic.strip()
+    queries = [topic, RESEARCH_TASK_DESCRIPTION.format(topic=topic)]
+    # Drop queries that normalize to the same cache entry
+    unique: Dict[str, str] = {}
+    for query in queries:
+        unique.setdefault(normalize_query(query), query)
+    return list(unique.values())
+
+
+def serper_search(query: str) -> Dict[str, Any]:
+    """Call the Serper API directly (the UI process does not load crewai_tools)."""
+    import requests
+
+    api_key = os.getenv("SERPER_API_KEY")
+    if not api_key:
+        from src.config.snapshot import load_environment
+        load_environment()
+        api_key = os.getenv("SERPER_API_KEY")
+    if not api_key:
+        raise ValueError("SERPER_API_KEY is missing. Please add it to your .env file.")
+
+    response = requests.post(
+        SERPER_SEARCH_URL,
+        headers={"X-API-KEY": api_key, "Content-Type": "application/json"},
+        json={"q": query, "num": SERPER_RESULTS},
+        timeout=15,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def default_search_fn(provider: str = SEARCH_PROVIDER) -> Callable[[str], Dict[str, Any]]:
+    """Search function matching the provider the agent will use."""
+    if provider == "fake":
+        from src.agents.fake_search import fake_search_results
+        return fake_search_results
+    return serper_search
+
+
+class SpeculativePrefetcher:
+    """Debounced background prefetcher that warms the search cache for a topic."""
+
+    def __init__(self, search_fn: Optional[Callable[[str], Dict[str, Any]]] = None,
+                 cache: Optional[SearchCache] = None,
+                 debounce_seconds: float = PREFETCH_DEBOUNCE_SECONDS,
+                 provider: str = SEARCH_PROVIDER):
+        # The search function and cache must belong to the same provider as the agent's
+        self.search_fn = search_fn or default_search_fn(provider)
+        self.cache = cache or SearchCache(provider=provider)
+        self.debounce_seconds = debounce_seconds
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._inflight: Set[str] = set()
+        self.prefetched = 0
+
+    def update(self, topic: str) -> None:
+        """Note a change to the topic input; prefetch once it stops changing."""
+        if not topic or not topic.strip():
+            return
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce_seconds, self.prefetch, args=(topic,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self) -> None:
+        """Drop any pending prefetch (e.g. when the run starts immediately)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def prefetch(self, topic: str) -> int:
+        """Run the likely searches for a topic now. Returns the number fetched."""
+        fetched = 0
+        for query in prefetch_queries(topic):
+            key = normalize_query(query)
+            with self._lock:
+                if key in self._inflight:
+                    continue
+                self._inflight.add(key)
+            try:
+                if self.cache.contains(query):
+                    continue
+                logger.info(f"Prefetching search results for: {query}")
+                self.cache.put(query, self.search_fn(query), source="prefetch")
+                fetched += 1
+            except Exception as e:
+                # Prefetching is best effort; the researcher will search normally
+                logger.warning(f"Search prefetch failed for '{query}': {str(e)}")
+            finally:
+                with self._lock:
+                    self._inflight.discard(key)
+        with self._lock:
+            self.prefetched += fetched
+        return fetched
@@ -0,0 +1,258 @@
+"""
+Lazily initialized runtime context shared by every crew run in a process.
+
+Nothing here touches the network, the environment or heavy dependencies at import
+time. Each component (environment, LLM selection, search tool, output store) is
+initialized on first use and then reused for the lifetime of the process. The
+environment and the LLM selection come from the configuration snapshot
+(``src.config.snapshot``), so they are only resolved from scratch when the .env
+file or the provider settings change.
+"""
+
+import os
+import sys
+import threading
+import traceback
+from typing import Any, Dict, Optional
+
+from src.config.settings import LLM_CACHE, LLM_PROVIDER, PAGE_FETCH_TOP_N, SEARCH_PROVIDER
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Environment variables the research pipeline needs
+REQUIRED_VARS = ["SERPER_API_KEY"]
+
+_UNSET = object()
+
+# Errors (by class name, as raised by litellm or the OpenAI client) that mean the
+# selected provider itself is unusable rather than that a single request failed
+PROVIDER_ERRORS = {
+    "AuthenticationError",
+    "PermissionDeniedError",
+    "NotFoundError",
+    "APIConnectionError",
+    "ServiceUnavailableError",
+}
+
+
+def is_provider_error(error: BaseException) -> bool:
+    """Whether ``error``, or an error it was raised from, comes from an unusable LLM provider"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if any(cls.__name__ in PROVIDER_ERRORS for cls in type(error).__mro__):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def mask_secret(value: Optional[str]) -> str:
+    """Show only the first and last few characters of a secret"""
+    if not value:
+        return "<missing>"
+    return value[:4] + "..." + value[-4:] if len(value) > 8 else "***"
+
+
+class AgentRuntime:
+    """Process-wide components for running crews, each created once on first use."""
+
+    def __init__(self, model_type: str = LLM_PROVIDER, search_provider: str = SEARCH_PROVIDER):
+        self.model_type = model_type
+        self.search_provider = search_provider
+        self._lock = threading.RLock()
+        self._env_loaded = False
+        self._model_name = _UNSET
+        self._tier_models: Optional[Dict[str, str]] = None
+        self._search = _UNSET
+        self._output_store = None
+        self._run_history = None
+        self._crew_pool = None
+        self._checkpoints = None
+
+    def load_env(self) -> None:
+        """Load the .env values (through the configuration snapshot) and report on required variables."""
+        with self._lock:
+            if self._env_loaded:
+                return
+            from src.config.snapshot import get_snapshot
+
+            dotenv_path = get_snapshot().load_environment()
+            if dotenv_path:
+                logger.info(f"Loaded environment from: {dotenv_path}")
+            else:
+                logger.warning("No .env file found in any of the expected locations")
+
+            missing_vars = [var for var in REQUIRED_VARS if not os.getenv(var)]
+            if missing_vars:
+                logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
+            else:
+                logger.info(f"SERPER_API_KEY found in environment: {mask_secret(os.getenv('SERPER_API_KEY'))}")
+            self._env_loaded = True
+
+    @property
+    def model_name(self) -> str:
+        """The LLM selected by the provider fallback chain (tested once, then reused from the snapshot)."""
+        with self._lock:
+            if self._model_name is _UNSET:
+                self.load_env()
+                from src.config.snapshot import get_snapshot
+
+                snapshot = get_snapshot()
+                selection = snapshot.selection(self.model_type)
+                if selection is None:
+                    selection = self._select_model(snapshot)
+                else:
+                    logger.info(f"Using {selection['provider']} selection from the configuration snapshot")
+                    if selection["provider"] == "fake":
+                        # The stub server lives in this process, so each process starts its own
+                        from src.models.config.fake import ensure_fake_llm_server
+                        ensure_fake_llm_server()
+                logger.info(f"Using model: {selection['model_name']}")
+                if LLM_CACHE:
+                    from src.models.llm_cache import enable_llm_cache
+                    enable_llm_cache()
+                self._model_name = selection["model_name"]
+                self._tier_models = selection["tier_models"]
+                logger.info(f"Model tiers: {self._tier_models}")
+            return self._model_name
+
+    def _select_model(self, snapshot) -> Dict[str, Any]:
+        """Run the provider fallback chain with connection tests and save the outcome."""
+        from src.config.snapshot import selection_inputs
+        from src.models.llm import get_model
+        from src.models.tiers import provider_for_model, resolve_tier_models
+
+        inputs = selection_inputs()
+        model_name, _ = get_model(model_type=self.model_type, test=True)
+        if model_name is None:
+            raise ValueError("Failed to initialize any LLM. Please check your API keys and try again.")
+        return snapshot.record_selection(self.model_type, model_name, provider_for_model(model_name),
+                                         resolve_tier_models(model_name), inputs=inputs)
+
+    def handle_run_error(self, error: BaseException) -> bool:
+        """
+        Forget the provider selection if a run failed because of the provider.
+
+        The cached selection is dropped from the snapshot and from this runtime,
+        along with the crews built on it, so the next run tests the fallback
+        chain again instead of reusing a provider whose key was revoked or
+        whose endpoint went away. Returns whether the selection was dropped.
+        """
+        if not is_provider_error(error):
+            return False
+        with self._lock:
+            from src.config.snapshot import get_snapshot
+
+            get_snapshot().forget_selection(self.model_type)
+            self._model_name = _UNSET
+            self._tier_models = None
+            self._crew_pool = None
+        logger.warning(f"Provider error ({type(error).__name__}); the {self.model_type} selection "
+                       "will be tested again on the next run")
+        return True
+
+    @property
+    def tier_models(self) -> Dict[str, str]:
+        """Model for each tier; the large tier is the model selected by the provider chain."""
+        with self._lock:
+            self.model_name
+            return self._tier_models
+
+    @property
+    def search(self) -> Any:
+        """The instrumented SerperDevTool instance, or None if it could not be created."""
+        with self._lock:
+            if self._search is _UNSET:
+                self.load_env()
+                from src.agents.search_cache import SearchCache
+                from src.agents.search_tool import instrument_search_tool
+                from src.utils.page_fetcher import PageFetcher
+
+                # The fake provider's links are placeholders, so there are no pages to fetch
+                fetch_pages = PAGE_FETCH_TOP_N > 0 and self.search_provider != "fake"
+                self._search = instrument_search_tool(
+                    self._create_search_tool(self.search_provider),
+                    SearchCache(provider=self.search_provider),
+                    PageFetcher() if fetch_pages else None,
+                )
+            return self._search
+
+    @staticmethod
+    def _create_search_tool(provider: str) -> Any:
+        if provider == "fake":
+            from src.agents.fake_search import FakeSerperDevTool
+            logger.info("Using offline fake search tool")
+            return FakeSerperDevTool()
+
+        try:
+            from crewai_tools import SerperDevTool
+        except ImportError as e:
+            logger.error(f"ImportError when importing SerperDevTool: {str(e)}")
+            logger.error(f"Python path: {sys.path}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error when importing SerperDevTool: {str(e)}")
+            logger.error(f"Detailed error: {traceback.format_exc()}")
+            return None
+
+        try:
+            search = SerperDevTool()
+            logger.info(f"Successfully initialized SerperDevTool with API key: {mask_secret(os.getenv('SERPER_API_KEY'))}")
+            return search
+        except Exception as e:
+            logger.error(f"Error initializing SerperDevTool instance: {str(e)}")
+            logger.error(f"Detailed error: {traceback.format_exc()}")
+            return None
+
+    @property
+    def output_store(self):
+        """Shared store for research summaries and keynote speeches."""
+        with self._lock:
+            if self._output_store is None:
+                from src.utils.output_store import OutputStore
+                self._output_store = OutputStore()
+            return self._output_store
+
+    @property
+    def crew_pool(self):
+        """Pool of reusable crews bound to this runtime's model and search tool."""
+        with self._lock:
+            if self._crew_pool is None:
+                from src.agents.crew_pool import CrewPool, ResearchCrew
+
+                models, search = self.tier_models, self.search
+                self._crew_pool = CrewPool(lambda: ResearchCrew(models, search))
+            return self._crew_pool
+
+    @property
+    def checkpoints(self):
+        """Checkpoints of in-progress and interrupted runs."""
+        with self._lock:
+            if self._checkpoints is None:
+                from src.utils.checkpoints import CheckpointStore
+                self._checkpoints = CheckpointStore()
+                self._checkpoints.prune()
+            return self._checkpoints
+
+    @property
+    def run_history(self):
+        """Search index over completed runs."""
+        with self._lock:
+            if self._run_history is None:
+                from src.utils.run_history import RunHistory
+                self._run_history = RunHistory()
+            return self._run_history
+
+
+_runtime: Optional[AgentRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> AgentRuntime:
+    """Return the process-wide runtime, creating it on first call."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = AgentRuntime()
+        return _runtime
@@ -0,0 +1,66 @@
+"""
+On-disk cache of web search results shared between processes.
+
+Entries are one JSON file per normalized query, written atomically, so the UI
+process (prefetching) and agent processes (searching) can use the same cache
+concurrently without locks. Each search provider has a directory of its own, so
+placeholder results of the offline fake provider are never served to real runs.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from src.config.settings import SEARCH_CACHE_DIR, SEARCH_CACHE_TTL_SECONDS, SEARCH_PROVIDER
+from src.utils.output_store import atomic_write_json, read_json
+
+logger = logging.getLogger(__name__)
+
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]", re.UNICODE)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivial formatting differences share a cache entry."""
+    return " ".join(PUNCTUATION_PATTERN.sub(" ", query.lower()).split())
+
+
+class SearchCache:
+    """TTL cache of one search provider's results keyed by normalized query."""
+
+    def __init__(self, cache_dir: Union[str, Path] = SEARCH_CACHE_DIR, ttl_seconds: float = SEARCH_CACHE_TTL_SECONDS,
+                 provider: str = SEARCH_PROVIDER):
+        self.provider = provider
+        self.cache_dir = Path(cache_dir) / provider
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, query: str) -> Path:
+        digest = hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest[:32]}.json"
+
+    def get(self, query: str) -> Optional[Any]:
+        """Return the cached result for a query, or None if missing or expired."""
+        entry = read_json(self._path(query))
+        if not entry:
+            return None
+        if time.time() - entry.get("stored_at", 0) > self.ttl_seconds:
+            return None
+        return entry.get("result")
+
+    def contains(self, query: str) -> bool:
+        return self.get(query) is not None
+
+    def put(self, query: str, result: Any, source: str = "search") -> None:
+        """Store a result for a query."""
+        try:
+            atomic_write_json(self._path(query), {
+                "query": query,
+                "stored_at": time.time(),
+                "source": source,
+                "result": result,
+            })
+        except (OSError, TypeError, ValueError) as e:
+            # A result that cannot be cached must never break the search itself
+            logger.warning(f"Could not cache search result for '{query}': {str(e)}")
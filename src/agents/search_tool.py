@@ -0,0 +1,119 @@
+"""
+Logging, caching and checkpointing instrumentation for the SerperDevTool used by the researcher agent.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from src.agents.search_cache import SearchCache
+from src.utils.checkpoints import active_checkpoint
+from src.utils.logger import get_logger
+from src.utils.page_fetcher import PageFetcher, enrich_search_results
+
+logger = get_logger(__name__)
+
+# Attribute marking a tool whose search method has already been wrapped
+INSTRUMENTED_FLAG = "_keynotegenie_instrumented"
+
+# Prefix extract_query uses when it cannot find the query
+UNKNOWN_QUERY_PREFIX = "unknown ("
+
+
+def extract_query(args: tuple, kwargs: dict) -> str:
+    """Find the search query in the different ways CrewAI may pass it."""
+    if 'search_query' in kwargs:
+        return kwargs.get('search_query')
+    if 'query' in kwargs:
+        return kwargs.get('query')
+    if len(args) > 0 and isinstance(args[0], dict) and 'query' in args[0]:
+        return args[0]['query']
+    if len(args) > 0 and isinstance(args[0], str):
+        return args[0]
+    if 'input' in kwargs:
+        return kwargs.get('input')
+    # Inspect all args and kwargs for debugging
+    return f"{UNKNOWN_QUERY_PREFIX}args={str(args)[:50]}..., kwargs_keys={list(kwargs.keys())})"
+
+
+def search_step(query: str) -> str:
+    """Checkpoint step name of a search call."""
+    return f"search-{hashlib.sha256(query.encode('utf-8')).hexdigest()[:16]}"
+
+
+def log_search_results(result: Any) -> None:
+    """Log the count, titles and links of organic search results."""
+    organic_results = result.get('organic', []) if isinstance(result, dict) else []
+    logger.info(f"Serper search completed with {len(organic_results)} organic results")
+
+    if organic_results:
+        logger.info("Search results:")
+        for i, res in enumerate(organic_results[:10], 1):
+            title = res.get('title', 'No title')
+            link = res.get('link', 'No link')
+            logger.info(f"  {i}. {title} - {link}")
+
+
+def instrument_search_tool(search: Optional[Any], cache: Optional[SearchCache] = None,
+                           fetcher: Optional[PageFetcher] = None) -> Optional[Any]:
+    """
+    Wrap the tool's search method with logging, caching, page enrichment and
+    run checkpoints, exactly once per tool instance.
+
+    Calling this again on an already instrumented tool is a no-op, so the wrapper
+    never nests no matter how many runs share the tool.
+    """
+    if search is None or getattr(search, INSTRUMENTED_FLAG, False):
+        return search
+
+    # Try using _run method first (new API), then fall back to execute
+    method_name = next((name for name in ('_run', 'execute') if hasattr(search, name)), None)
+    if method_name is None:
+        logger.warning("Could not wrap SerperDevTool methods - API may have changed")
+        return search
+
+    try:
+        original_execute = getattr(search, method_name)
+
+        def execute_with_logging(*args, **kwargs):
+            query = extract_query(args, kwargs)
+            known_query = isinstance(query, str) and not query.startswith(UNKNOWN_QUERY_PREFIX)
+            cacheable = cache is not None and known_query
+
+            # A resumed run replays the searches it completed before it was interrupted
+            checkpoint = active_checkpoint() if known_query else None
+            if checkpoint is not None:
+                saved = checkpoint.get(search_step(query))
+                if saved is not None:
+                    logger.info(f"Serper search restored from checkpoint for query: {query}")
+                    return saved["result"]
+
+            # Serve prefetched or recently seen queries from the shared cache
+            cached = cache.get(query) if cacheable else None
+            if cached is not None:
+                logger.info(f"Serper search cache hit for query: {query}")
+                result = cached
+            else:
+                logger.info(f"Executing Serper search with query: {query}")
+                result = original_execute(*args, **kwargs)
+            log_search_results(result)
+
+            # Add the text of the top pages so the researcher needn't search again for detail
+            enriched = 0
+            if fetcher is not None:
+                try:
+                    enriched = enrich_search_results(result, fetcher, query)
+                except Exception as e:
+                    logger.warning(f"Could not enrich search results with page text: {str(e)}")
+
+            if cacheable and isinstance(result, dict) and (cached is None or enriched):
+                cache.put(query, result)
+            if checkpoint is not None and isinstance(result, (dict, str)):
+                checkpoint.save(search_step(query), {"query": query, "result": result})
+            return result
+
+        object.__setattr__(search, method_name, execute_with_logging)
+        object.__setattr__(search, INSTRUMENTED_FLAG, True)
+        logger.info(f"Successfully wrapped SerperDevTool.{method_name} with logging")
+    except Exception as e:
+        logger.warning(f"Error setting up SerperDevTool logging wrapper: {str(e)}")
+    return search
@@ -0,0 +1,185 @@
+"""
+Sectioned keynote writing: outline, parallel section drafts, then a stitch pass.
+
+Instead of one long generation for the whole speech, a short outline call
+names the body sections, each section is drafted by its own writer agent in
+parallel, and a final short call writes the introduction and conclusion around
+the drafted sections. Each writer agent has its own crew because CrewAI agents
+keep per-execution state and cannot run two tasks at once. The outline pass is
+a cheap subtask and can use a faster model than the writers. Each pass is
+checkpointed, so a resumed run only drafts what it had not finished.
+"""
+
+import queue
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.config.settings import KEYNOTE_SECTIONS, SECTION_PARALLELISM
+from src.utils.checkpoints import RunCheckpoint
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Separator the stitch pass puts between the introduction and the conclusion
+STITCH_SEPARATOR = "---"
+
+OUTLINE_PREFIX_PATTERN = re.compile(r"^\s*(?:[-*•]|\d+[.)]|#+|section\s+\d+\s*[:.-])\s*", re.IGNORECASE)
+FINAL_ANSWER_PATTERN = re.compile(r"^\s*final answer\s*:\s*", re.IGNORECASE)
+
+# Section titles longer than this are cut, since outline lines may be full sentences
+MAX_TITLE_CHARS = 80
+
+WRITER_ROLE = "Senior Speech Writer"
+WRITER_BACKSTORY = "You are a veteran writer with a background in creating compelling narratives from technical content."
+
+
+def parse_outline(text: str, sections: int) -> List[str]:
+    """Extract up to ``sections`` distinct section titles from an outline."""
+    titles: List[str] = []
+    for line in text.splitlines():
+        title = OUTLINE_PREFIX_PATTERN.sub("", FINAL_ANSWER_PATTERN.sub("", line)).strip(" *_:.\t")
+        if not title or title.lower() in (t.lower() for t in titles):
+            continue
+        titles.append(title[:MAX_TITLE_CHARS].rstrip())
+        if len(titles) == sections:
+            break
+    return titles
+
+
+def split_stitch(text: str) -> Tuple[str, str]:
+    """Split the stitch pass output into introduction and conclusion."""
+    lines = text.strip().splitlines()
+    for index, line in enumerate(lines):
+        if line.strip() == STITCH_SEPARATOR:
+            return "\n".join(lines[:index]).strip(), "\n".join(lines[index + 1:]).strip()
+    # No separator: treat the first paragraph as the introduction and the rest as the conclusion
+    paragraphs = [p for p in text.strip().split("\n\n") if p.strip()]
+    if len(paragraphs) > 1:
+        return paragraphs[0].strip(), "\n\n".join(paragraphs[1:]).strip()
+    return text.strip(), ""
+
+
+def assemble_keynote(intro: str, titles: List[str], drafts: List[str], conclusion: str) -> str:
+    """Join the introduction, drafted sections and conclusion into one speech."""
+    parts = [intro] if intro else []
+    for title, draft in zip(titles, drafts):
+        parts.append(f"## {title}\n\n{draft.strip()}")
+    if conclusion:
+        parts.append(conclusion)
+    return "\n\n".join(parts)
+
+
+class SectionedWriter:
+    """Outline, section and stitch crews, built once and reused across runs."""
+
+    def __init__(self, llm: Any, outline_llm: Any = None, sections: int = KEYNOTE_SECTIONS,
+                 parallelism: int = SECTION_PARALLELISM):
+        from crewai import Agent, Crew, Task
+
+        self.sections = max(1, sections)
+        self.parallelism = max(1, min(parallelism, self.sections))
+        self.timings: Dict[str, float] = {}
+        # Passes of the last write loaded from its checkpoint
+        self.restored: List[str] = []
+
+        def writer_crew(goal: str, description: str, expected_output: str, writer_llm: Any = llm) -> Any:
+            writer = Agent(llm=writer_llm, role=WRITER_ROLE, goal=goal, backstory=WRITER_BACKSTORY,
+                           allow_delegation=False, verbose=False)
+            task = Task(description=description, expected_output=expected_output, agent=writer)
+            return Crew(agents=[writer], tasks=[task], verbose=0)
+
+        self.outline_crew = writer_crew(
+            goal="Plan engaging keynote speeches about {topic}.",
+            description=(
+                "Plan the body of a keynote speech about {topic} based on this research:\n\n{research}\n\n"
+                "List exactly {sections} body section titles, one per line, in speaking order."
+            ),
+            expected_output="{sections} section titles, one per line, with no other text.",
+            writer_llm=outline_llm or llm,
+        )
+
+        # One crew per parallel slot; each drafts one section at a time
+        self._section_crews: "queue.Queue[Any]" = queue.Queue()
+        for _ in range(self.parallelism):
+            self._section_crews.put(writer_crew(
+                goal="Write engaging and witty keynote speech sections about {topic} from provided research.",
+                description=(
+                    "Write the section \"{section}\" (section {index} of {count}) of a keynote speech about {topic}.\n"
+                    "Full outline:\n{outline}\n\n"
+                    "Open with a one-sentence transition from the previous section, \"{previous}\". "
+                    "Do not write an introduction or conclusion for the speech.\n\nResearch:\n\n{research}"
+                ),
+                expected_output="The spoken text of this one section, a few paragraphs long.",
+            ))
+
+        self.stitch_crew = writer_crew(
+            goal="Write engaging and witty keynote speeches about {topic} from provided research.",
+            description=(
+                "These sections form the body of a keynote speech about {topic}:\n\n{body}\n\n"
+                "Write an opening introduction that leads into the first section, then a line containing only "
+                f"\"{STITCH_SEPARATOR}\", then a conclusion that ties the sections together."
+            ),
+            expected_output=f"An introduction, a \"{STITCH_SEPARATOR}\" line, and a conclusion.",
+        )
+
+    def _pass(self, checkpoint: Optional[RunCheckpoint], step: str, run: Callable[[], str]) -> str:
+        """Run a writing pass, or load its text if the checkpoint has it."""
+        saved = checkpoint.get(step) if checkpoint is not None else None
+        if saved is not None:
+            logger.info(f"Restored writing pass {step} from checkpoint")
+            self.restored.append(step)
+            return saved["text"]
+        text = run()
+        if checkpoint is not None:
+            checkpoint.save(step, {"text": text})
+        return text
+
+    def _draft(self, inputs: Dict[str, str]) -> str:
+        crew = self._section_crews.get()
+        try:
+            return str(crew.kickoff(inputs=inputs).raw)
+        finally:
+            self._section_crews.put(crew)
+
+    def write(self, topic: str, research: str, checkpoint: Optional[RunCheckpoint] = None) -> str:
+        """Write a keynote for a topic from research text, resuming from ``checkpoint`` if given."""
+        self.timings = {}
+        self.restored = []
+        start = time.perf_counter()
+        outline_text = self._pass(checkpoint, "outline", lambda: str(self.outline_crew.kickoff(
+            inputs={"topic": topic, "research": research, "sections": str(self.sections)}
+        ).raw))
+        titles = parse_outline(outline_text, self.sections) or [topic]
+        self.timings["outline"] = round(time.perf_counter() - start, 3)
+        logger.info(f"Outlined {len(titles)} sections; drafting with parallelism {self.parallelism}")
+
+        start = time.perf_counter()
+        outline = "\n".join(f"{i}. {title}" for i, title in enumerate(titles, 1))
+        section_inputs = [
+            {
+                "topic": topic,
+                "research": research,
+                "outline": outline,
+                "section": title,
+                "index": str(index),
+                "count": str(len(titles)),
+                "previous": titles[index - 2] if index > 1 else "the introduction",
+            }
+            for index, title in enumerate(titles, 1)
+        ]
+        with ThreadPoolExecutor(max_workers=self.parallelism, thread_name_prefix="section-writer") as executor:
+            drafts = list(executor.map(
+                lambda inputs: self._pass(checkpoint, f"section-{inputs['index']}", lambda: self._draft(inputs)),
+                section_inputs,
+            ))
+        self.timings["sections"] = round(time.perf_counter() - start, 3)
+
+        start = time.perf_counter()
+        body = "\n\n".join(f"## {title}\n{draft}" for title, draft in zip(titles, drafts))
+        intro, conclusion = split_stitch(self._pass(checkpoint, "stitch", lambda: str(
+            self.stitch_crew.kickoff(inputs={"topic": topic, "body": body}).raw
+        )))
+        self.timings["stitch"] = round(time.perf_counter() - start, 3)
+        return assemble_keynote(intro, titles, drafts, conclusion)
@@ -0,0 +1,14 @@
+import unittest
+
+from benchmarks.startup import measure_import
+
+
+class TestAgentStartup(unittest.TestCase):
+    def test_agent_import_defers_heavy_modules(self):
+        """Importing the agent module must not load crewai, litellm or pkg_resources"""
+        result = measure_import("src.agents.agent", runs=1)
+        self.assertEqual(result["heavy_imports"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from src.agents.crew_pool import CrewPool, ResearchCrew
+from src.models.config.fake import TIER_MODELS, ensure_fake_llm_server
+
+RESEARCH = "\n".join(
+    f"- Finding {i}: quantum sensors measure magnetic fields in hospital trial number {i} with better precision."
+    for i in range(60)
+)
+
+
+class StubCrew:
+    """Stands in for a ResearchCrew in the pool, counting resets"""
+
+    def __init__(self):
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+
+class TestCrewPool(unittest.TestCase):
+    def test_failed_runs_do_not_return_their_crew(self):
+        """A crew whose run raised is dropped; the next caller gets a new one"""
+        pool = CrewPool(StubCrew, max_idle=1)
+        with self.assertRaises(RuntimeError):
+            with pool.acquire() as failed:
+                raise RuntimeError("crew failed")
+        self.assertEqual((pool.idle_count, failed.resets), (0, 1))
+
+        with pool.acquire() as crew:
+            self.assertIsNot(crew, failed)
+        with pool.acquire() as reused:
+            self.assertIs(reused, crew)
+        self.assertEqual((pool.created, pool.idle_count), (2, 1))
+
+        # Only max_idle crews are kept when more are returned at once
+        with pool.acquire(), pool.acquire():
+            pass
+        self.assertEqual(pool.idle_count, 1)
+
+
+class TestResearchCrew(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Crews talk to the offline stand-in LLM; the environment it sets is restored afterwards"""
+        cls.env = mock.patch.dict(os.environ)
+        cls.env.start()
+        ensure_fake_llm_server()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.env.stop()
+
+    def test_topics_do_not_leak_between_runs(self):
+        """A reused crew's run matches a fresh crew's run of the same topic"""
+        pool = CrewPool(lambda: ResearchCrew(TIER_MODELS, compaction_budget=0, writing_mode="single"))
+        with pool.acquire() as crew:
+            crew.kickoff("Edge AI")
+        with pool.acquire() as reused:
+            self.assertIs(reused, crew)
+            reused.kickoff("Quantum sensing")
+            reused_keynote = reused.keynote_task.output.raw
+            prompts = [reused.research_task.description, reused.keynote_task.description, reused.researcher.goal,
+                       reused.writer.goal]
+            research = reused.research_text
+
+        self.assertTrue(all("Quantum sensing" in prompt and "Edge AI" not in prompt for prompt in prompts))
+        fresh = ResearchCrew(TIER_MODELS, compaction_budget=0, writing_mode="single")
+        fresh.kickoff("Quantum sensing")
+        self.assertEqual(fresh.keynote_task.output.raw, reused_keynote)
+        self.assertEqual(fresh.research_text, research)
+        self.assertEqual(pool.created, 1)
+
+    def test_research_is_compacted_for_the_writer(self):
+        """The writer's context is the compacted research; the full text and stats are kept for saving"""
+        crew = ResearchCrew(TIER_MODELS, compaction_budget=200, writing_mode="single")
+        crew.topic = "quantum sensors"
+        stages, checkpoint = [], mock.Mock()
+        crew._on_stage, crew._checkpoint = stages.append, checkpoint
+        output = SimpleNamespace(raw=RESEARCH)
+        crew._compact_research(output)
+
+        self.assertEqual(crew.research_text, RESEARCH)
+        self.assertEqual(output.raw, crew.compaction.text)
+        self.assertLessEqual(crew.compaction.compacted_tokens, 200)
+        self.assertLess(len(output.raw), len(RESEARCH))
+        step, saved = checkpoint.save.call_args[0]
+        self.assertEqual((step, saved["raw"], saved["compaction"]["text"]), ("research", RESEARCH, output.raw))
+        self.assertEqual(stages, ["research_complete"])
+
+        # Without a budget the writer sees the research unchanged
+        crew = ResearchCrew(TIER_MODELS, compaction_budget=0, writing_mode="single")
+        output = SimpleNamespace(raw=RESEARCH)
+        crew._compact_research(output)
+        self.assertEqual((output.raw, crew.compaction), (RESEARCH, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
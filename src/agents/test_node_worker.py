@@ -0,0 +1,76 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.agents.node_worker import NodeWorker, publish_artifacts
+from src.agents.worker_pool import WorkerPool
+from src.utils.broker import COMPLETE, FAILED, QUEUED, RUNNING, SQLiteBroker
+from src.utils.output_store import OutputStore
+
+
+def fake_run(topic, on_stage, on_start):
+    """Stand-in for run_crew that runs in the worker processes"""
+    if topic == "boom":
+        raise ValueError("crew failed")
+    time.sleep(0.5 if topic == "slow" else 0.05)
+    on_stage("research_complete")
+
+
+class TestNodeWorker(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.broker = SQLiteBroker(Path(self.tmp_dir.name) / "jobs.db")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_nodes_share_the_queue(self):
+        """Two nodes drain one broker and report every outcome"""
+        jobs = [self.broker.enqueue(topic) for topic in ["Edge AI", "boom", "Quantum sensing", "Fusion"]]
+        with WorkerPool(processes=1, run_fn=fake_run, initializer=None) as pool_a, \
+                WorkerPool(processes=1, run_fn=fake_run, initializer=None) as pool_b:
+            node_a = NodeWorker(self.broker, pool_a, "node-a", poll_seconds=0.05)
+            node_b = NodeWorker(self.broker, pool_b, "node-b", poll_seconds=0.05)
+            deadline = time.time() + 30
+            while node_a.processed + node_b.processed < len(jobs) and time.time() < deadline:
+                node_a.step()
+                node_b.step()
+                time.sleep(0.01)
+
+        statuses = {job.topic: self.broker.get(job.id).status for job in jobs}
+        self.assertEqual(statuses, {"Edge AI": COMPLETE, "boom": FAILED, "Quantum sensing": COMPLETE,
+                                    "Fusion": COMPLETE})
+        self.assertEqual({self.broker.get(job.id).worker for job in jobs}, {"node-a", "node-b"})
+
+    def test_lost_jobs_hold_their_slot_until_they_end(self):
+        """A job whose lease was lost keeps its worker busy, so the node claims nothing new until it ends"""
+        slow, queued = self.broker.enqueue("slow"), self.broker.enqueue("Edge AI")
+        with WorkerPool(processes=1, run_fn=fake_run, initializer=None) as pool:
+            node = NodeWorker(self.broker, pool, "node-a", heartbeat_seconds=0.01, poll_seconds=0.05)
+            node.step()
+            future = node._inflight[slow.id]["future"]
+            time.sleep(0.02)
+            with mock.patch.object(self.broker, "heartbeat", return_value=False):
+                node.step()
+            self.assertEqual(self.broker.get(queued.id).status, QUEUED)
+
+            future.result(timeout=30)
+            node.step()
+            self.assertEqual(list(node._inflight), [queued.id])
+            self.assertEqual(self.broker.get(queued.id).status, RUNNING)
+            self.assertEqual(node.processed, 0)
+
+    def test_publish_artifacts(self):
+        """Artifacts and metadata are copied to the shared store"""
+        local, shared = OutputStore(Path(self.tmp_dir.name) / "local"), OutputStore(Path(self.tmp_dir.name) / "shared")
+        local.write_artifact("Edge AI", "keynote", "Keynote text")
+        local.write_metadata("Edge AI", status="complete", model="fake")
+        publish_artifacts("Edge AI", local, shared)
+        self.assertEqual(shared.read_artifact("Edge AI", "keynote"), "Keynote text")
+        self.assertEqual(shared.read_metadata("Edge AI")["status"], "complete")
+
+
+if __name__ == "__main__":
+    unittest.main()
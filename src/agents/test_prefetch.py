@@ -0,0 +1,102 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.agents.prefetch import SERPER_SEARCH_URL, SpeculativePrefetcher, prefetch_queries, serper_search
+from src.agents.search_cache import SearchCache
+
+
+class RecordingSearch:
+    """Search function that records its queries"""
+
+    def __init__(self):
+        self.queries = []
+        self.lock = threading.Lock()
+
+    def __call__(self, query):
+        with self.lock:
+            self.queries.append(query)
+        return {"organic": [{"title": f"Result for {query}"}]}
+
+
+class TestSearchCacheProviders(unittest.TestCase):
+    def test_providers_do_not_share_entries(self):
+        """Results cached by the fake provider are never served to Serper, and vice versa"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fake, serper = SearchCache(cache_dir, provider="fake"), SearchCache(cache_dir, provider="serper")
+            fake.put("Edge AI", {"organic": [{"title": "placeholder"}]})
+            self.assertIsNone(serper.get("Edge AI"))
+            serper.put("edge ai!", {"organic": [{"title": "real"}]})
+            self.assertEqual(fake.get("Edge AI")["organic"][0]["title"], "placeholder")
+            self.assertEqual(SearchCache(cache_dir, provider="serper").get("Edge AI")["organic"][0]["title"], "real")
+
+
+class TestSpeculativePrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.search = RecordingSearch()
+        self.cache = SearchCache(self.tmp_dir.name, provider="fake")
+        self.prefetcher = SpeculativePrefetcher(self.search, self.cache, debounce_seconds=0.1)
+
+    def tearDown(self):
+        self.prefetcher.cancel()
+        self.tmp_dir.cleanup()
+
+    def test_only_the_settled_topic_is_prefetched(self):
+        """Rapid edits restart the debounce; only the final topic is searched, once"""
+        for topic in ("Qu", "Quantum", "Quantum computing"):
+            self.prefetcher.update(topic)
+            time.sleep(0.02)
+        time.sleep(0.3)
+        self.assertEqual(sorted(self.search.queries), sorted(prefetch_queries("Quantum computing")))
+        self.assertTrue(all(self.cache.contains(q) for q in prefetch_queries("Quantum computing")))
+
+        # Already cached queries are not searched again
+        self.assertEqual(self.prefetcher.prefetch("Quantum computing"), 0)
+        self.assertEqual(self.prefetcher.prefetched, len(prefetch_queries("Quantum computing")))
+
+    def test_cancel_drops_the_pending_prefetch(self):
+        """A run that starts before the debounce expires cancels the speculative searches"""
+        self.prefetcher.update("Fusion power")
+        self.prefetcher.cancel()
+        time.sleep(0.25)
+        self.assertEqual(self.search.queries, [])
+
+    def test_failed_searches_are_not_cached(self):
+        """A failing search is logged and skipped without caching anything"""
+        prefetcher = SpeculativePrefetcher(mock.Mock(side_effect=RuntimeError("rate limited")), self.cache)
+        self.assertEqual(prefetcher.prefetch("Edge AI"), 0)
+        self.assertFalse(self.cache.contains("Edge AI"))
+
+
+class TestSerperSearch(unittest.TestCase):
+    def test_calls_the_serper_api(self):
+        """The query and API key are sent to Serper and its JSON is returned"""
+        response = mock.Mock()
+        response.json.return_value = {"organic": []}
+        with mock.patch.dict(os.environ, {"SERPER_API_KEY": "test-key"}), \
+                mock.patch("requests.post", return_value=response) as post:
+            self.assertEqual(serper_search("edge ai"), {"organic": []})
+        args, kwargs = post.call_args
+        self.assertEqual(args[0], SERPER_SEARCH_URL)
+        self.assertEqual(kwargs["headers"]["X-API-KEY"], "test-key")
+        self.assertEqual(kwargs["json"]["q"], "edge ai")
+        response.raise_for_status.assert_called_once()
+
+    def test_missing_key_is_an_error(self):
+        """Without SERPER_API_KEY, even after loading the environment, no request is sent"""
+        env = {k: v for k, v in os.environ.items() if k != "SERPER_API_KEY"}
+        with mock.patch.dict(os.environ, env, clear=True), \
+                mock.patch("src.config.snapshot.load_environment") as load_environment, \
+                mock.patch("requests.post") as post:
+            with self.assertRaises(ValueError):
+                serper_search("edge ai")
+        load_environment.assert_called_once()
+        post.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
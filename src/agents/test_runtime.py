@@ -0,0 +1,106 @@
+import tempfile
+import unittest
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+from src.agents.agent import execute_run
+from src.agents.runtime import AgentRuntime, is_provider_error
+from src.config.snapshot import ConfigSnapshot
+from src.utils.checkpoints import CheckpointStore
+from src.utils.output_store import OutputStore
+
+MODELS = {"fast": "mistral/mistral-small-latest", "large": "mistral/mistral-large-latest"}
+
+
+class AuthenticationError(Exception):
+    """Named like the litellm/OpenAI error raised for a revoked API key"""
+
+
+class FailingCrew:
+    def __init__(self, error):
+        self.error = error
+
+    def kickoff(self, topic, on_stage=None, checkpoint=None):
+        raise self.error
+
+
+class FailingPool:
+    def __init__(self, error):
+        self.error = error
+
+    @contextmanager
+    def acquire(self):
+        yield FailingCrew(self.error)
+
+
+class TestProviderFailures(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.tmp_dir.name)
+        self.snapshot = ConfigSnapshot(root / "snapshot.json", dotenv_paths=[], enabled=True)
+        patcher = mock.patch("src.config.snapshot.get_snapshot", return_value=self.snapshot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # A runtime whose selection was already made and cached by an earlier run
+        self.snapshot.record_selection("mistral", MODELS["large"], "mistral", MODELS)
+        self.runtime = AgentRuntime(model_type="mistral", search_provider="fake")
+        self.runtime._env_loaded = True
+        self.runtime._output_store = OutputStore(root / "outputs")
+        self.runtime._checkpoints = CheckpointStore(root / "checkpoints")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_failing(self, error):
+        with mock.patch.object(AgentRuntime, "_select_model", side_effect=AssertionError("no re-test expected")):
+            self.assertEqual(self.runtime.model_name, MODELS["large"])
+        self.runtime._crew_pool = FailingPool(error)
+        checkpoint = self.runtime.checkpoints.create("Edge AI")
+        with self.assertRaises(type(error)):
+            execute_run(self.runtime, "Edge AI", checkpoint)
+        self.assertEqual(self.runtime.checkpoints.open(checkpoint.run_id).status, "failed")
+        self.assertEqual(self.runtime.output_store.read_metadata("Edge AI")["status"], "failed")
+
+    def test_provider_error_forgets_the_selection(self):
+        """A run failing on an auth error drops the cached selection, so the next run tests the chain again"""
+        try:
+            try:
+                raise AuthenticationError("invalid api key")
+            except AuthenticationError as e:
+                raise RuntimeError("crew failed") from e
+        except RuntimeError as wrapped:
+            error = wrapped
+        self.assertTrue(is_provider_error(error))
+        self.run_failing(error)
+        self.assertIsNone(self.snapshot.selection("mistral"))
+
+        reselected = {"model_name": "openai/gpt-4o", "tier_models": {"fast": "openai/gpt-4o-mini",
+                                                                     "large": "openai/gpt-4o"}}
+        with mock.patch.object(AgentRuntime, "_select_model", return_value=reselected) as select_model:
+            self.assertEqual(self.runtime.model_name, "openai/gpt-4o")
+        select_model.assert_called_once()
+        self.assertEqual(self.runtime.tier_models["fast"], "openai/gpt-4o-mini")
+
+    def test_other_errors_keep_the_selection(self):
+        """Failures unrelated to the provider leave the cached selection in place"""
+        self.assertFalse(is_provider_error(ValueError("bad output")))
+        self.run_failing(ValueError("bad output"))
+        self.assertEqual(self.snapshot.selection("mistral")["model_name"], MODELS["large"])
+
+    def test_run_fails_when_no_provider_initializes(self):
+        """A failed model selection marks the run failed instead of leaving it running"""
+        self.snapshot.forget_selection("mistral")
+        checkpoint = self.runtime.checkpoints.create("Edge AI")
+        no_provider = ValueError("Failed to initialize any LLM. Please check your API keys and try again.")
+        with mock.patch.object(AgentRuntime, "_select_model", side_effect=no_provider):
+            with self.assertRaises(ValueError):
+                execute_run(self.runtime, "Edge AI", checkpoint)
+        self.assertEqual(self.runtime.checkpoints.open(checkpoint.run_id).status, "failed")
+        meta = self.runtime.output_store.read_metadata("Edge AI")
+        self.assertEqual((meta["status"], meta["error"]), ("failed", str(no_provider)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import io
+import json
+import tempfile
+import threading
+import unittest
+
+from src.agents.sectioned_writer import (
+    STITCH_SEPARATOR,
+    SectionedWriter,
+    assemble_keynote,
+    parse_outline,
+    split_stitch,
+)
+from src.models.config.fake import FAKE_MODEL_ID, FakeLLMConfig, FakeLLMServer, _FakeLLMHandler
+from src.utils.checkpoints import CheckpointStore
+
+
+class CountingHandler(_FakeLLMHandler):
+    """Stand-in LLM handler that tracks concurrent requests and fails the prompts it is told to"""
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        prompt = json.dumps(json.loads(body or b"{}").get("messages", []))
+        with server.lock:
+            server.prompts.append(prompt)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            if server.fail_on and server.fail_on in prompt:
+                self._send_json(500, {"error": {"message": "Injected section failure", "type": "server_error"}})
+                return
+            # Hand the consumed body back to the stand-in's own handler
+            self.rfile = io.BytesIO(body)
+            super().do_POST()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+class TestSectionedWriter(unittest.TestCase):
+    def test_parse_outline(self):
+        """Numbering, bullets and repeats are stripped from outline titles"""
+        outline = "Final Answer: 1. The quantum leap\n- **Sensors in medicine**\n\n3) Sensors in medicine\nSection 4: What comes next\nExtra"
+        self.assertEqual(parse_outline(outline, 3), ["The quantum leap", "Sensors in medicine", "What comes next"])
+
+    def test_split_stitch(self):
+        """The stitch output is split on the separator line, or by paragraph without one"""
+        self.assertEqual(split_stitch(f"Hello all.\n{STITCH_SEPARATOR}\nThank you."), ("Hello all.", "Thank you."))
+        self.assertEqual(split_stitch("Hello all.\n\nThank you."), ("Hello all.", "Thank you."))
+
+    def test_assemble_keynote(self):
+        """Sections appear in outline order between the introduction and conclusion"""
+        speech = assemble_keynote("Intro.", ["First", "Second"], ["One.", "Two."], "Outro.")
+        self.assertEqual(speech, "Intro.\n\n## First\n\nOne.\n\n## Second\n\nTwo.\n\nOutro.")
+
+
+class TestSectionedWriterRuns(unittest.TestCase):
+    def setUp(self):
+        """A sectioned writer on a slow stand-in LLM, with checkpoints in a temporary directory"""
+        from crewai import LLM
+
+        self.server = FakeLLMServer(config=FakeLLMConfig(latency_ms=150, response_words=80))
+        self.server.httpd.RequestHandlerClass = CountingHandler
+        httpd = self.server.httpd
+        httpd.lock, httpd.prompts, httpd.active, httpd.peak, httpd.fail_on = threading.Lock(), [], 0, 0, None
+        self.server.start()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.checkpoints = CheckpointStore(self.tmp_dir.name)
+        llm = LLM(model=f"openai/{FAKE_MODEL_ID}", base_url=self.server.base_url, api_key="fake-key",
+                  max_retries=0)
+        self.writer = SectionedWriter(llm, sections=4, parallelism=2)
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp_dir.cleanup()
+
+    def prompts(self, marker):
+        return [prompt for prompt in self.server.httpd.prompts if marker in prompt]
+
+    def test_sections_run_in_parallel_and_resume_from_checkpoints(self):
+        """Sections are drafted concurrently up to the parallelism; a failed section fails the write,
+        and a retry with the checkpoint only drafts what had not finished"""
+        httpd = self.server.httpd
+        checkpoint = self.checkpoints.create("Quantum sensing")
+        httpd.fail_on = "(section 3 of 4)"
+        with self.assertRaises(Exception):
+            self.writer.write("Quantum sensing", "- Sensors measure fields.", checkpoint)
+        self.assertEqual(httpd.peak, 2)
+        self.assertIsNone(checkpoint.get("section-3"))
+        self.assertIsNone(checkpoint.get("stitch"))
+        self.assertEqual(len(self.prompts("Plan the body")), 1)
+
+        httpd.fail_on, httpd.prompts = None, []
+        keynote = self.writer.write("Quantum sensing", "- Sensors measure fields.", checkpoint)
+        self.assertEqual(sorted(self.writer.restored), ["outline", "section-1", "section-2", "section-4"])
+        self.assertEqual(len(self.prompts("Plan the body")), 0)
+        self.assertEqual(len(self.prompts("(section 3 of 4)")), 1)
+        self.assertEqual(len(self.prompts("(section 1 of 4)")), 0)
+        self.assertEqual(len(self.prompts("Write an opening introduction")), 1)
+        self.assertEqual(keynote.count("\n## "), 4)
+
+        # Every pass is checkpointed now, so writing again needs no LLM calls and gives the same speech
+        httpd.prompts = []
+        self.assertEqual(self.writer.write("Quantum sensing", "- Sensors measure fields.", checkpoint), keynote)
+        self.assertEqual(httpd.prompts, [])
+        self.assertEqual(len(self.writer.restored), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import time
+import unittest
+
+from src.agents.worker_pool import WorkerPool
+
+
+def fake_run(topic, on_stage, on_start):
+    """Stand-in for run_crew that runs in the worker processes"""
+    if topic == "crash":
+        os._exit(3)
+    if topic == "boom":
+        raise ValueError("crew failed")
+    on_start(f"run of {topic}")
+    time.sleep(0.05)
+    on_stage("research_complete")
+
+
+class TestWorkerPool(unittest.TestCase):
+    def test_runs_topics_and_recycles_workers(self):
+        """Jobs are spread over the workers, which are replaced after their job limit"""
+        stages, started = [], []
+        with WorkerPool(processes=2, max_jobs_per_worker=2, run_fn=fake_run, initializer=None) as pool:
+            first = pool.run("topic 0", on_stage=stages.append, on_start=started.append)
+            results = pool.map([f"topic {i}" for i in range(1, 7)])
+            stats = dict(pool.stats)
+
+        self.assertEqual((stages, started), (["research_complete"], ["run of topic 0"]))
+        self.assertEqual(first["run_id"], "run of topic 0")
+        self.assertTrue(all(not isinstance(result, Exception) for result in results))
+        self.assertGreaterEqual(len({first["worker"]} | {result["worker"] for result in results}), 3)
+        self.assertEqual(stats["completed"], 7)
+        self.assertGreaterEqual(stats["recycled"], 2)
+
+    def test_close_drains_the_queue(self):
+        """Jobs queued before close all run, even when workers reach their job limit while draining"""
+        pool = WorkerPool(processes=1, max_jobs_per_worker=1, run_fn=fake_run, initializer=None).start()
+        futures = [pool.submit(f"topic {i}") for i in range(3)]
+        pool.close()
+
+        self.assertEqual([future.result(timeout=0)["run_id"] for future in futures],
+                         [f"run of topic {i}" for i in range(3)])
+        self.assertEqual(pool.stats["completed"], 3)
+        self.assertFalse(pool._workers)
+
+    def test_failures_and_crashes(self):
+        """Errors fail only their own job, and a crashed worker is replaced"""
+        with WorkerPool(processes=1, run_fn=fake_run, initializer=None) as pool:
+            failed, crashed, ok = pool.map(["boom", "crash", "after crash"])
+            stats = dict(pool.stats)
+
+        self.assertIn("crew failed", str(failed))
+        self.assertIn("exited", str(crashed))
+        self.assertNotIsInstance(ok, Exception)
+        self.assertEqual(stats["crashed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
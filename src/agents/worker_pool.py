@@ -0,0 +1,341 @@
+"""
+Pool of worker processes that runs crews on every CPU core.
+
+A crew run spends real CPU time in a single Python thread (prompt assembly,
+logging, output parsing), so threads in one process cannot use more than one
+core. The pool starts one long-lived process per core, each holding its own
+warm runtime. All workers pull jobs from one shared queue: an idle worker
+always takes the next job, so a slow run never holds up work another worker
+could do. After ``max_jobs_per_worker`` jobs a worker exits and is replaced by
+a fresh process, which caps memory growth from long-lived CrewAI state.
+
+Workers share the on-disk search, page and (optionally) LLM caches; those use
+atomic file replacement or SQLite, so concurrent readers and writers are safe.
+
+    python -m src.agents.worker_pool "Edge AI" "Solid-state batteries" --processes 4
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from multiprocessing import connection
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from src.config.settings import WORKER_MAX_JOBS, WORKER_PROCESSES
+
+logger = logging.getLogger(__name__)
+
+# How often the supervisor checks for workers that died without reporting
+SUPERVISOR_POLL_SECONDS = 1.0
+
+
+def warm_runtime() -> None:
+    """Initialize the worker's runtime and one crew before it takes jobs."""
+    from src.agents.runtime import get_runtime
+
+    runtime = get_runtime()
+    runtime.search
+    with runtime.crew_pool.acquire():
+        pass
+
+
+def run_topic(topic: str, on_stage: Callable[[str], None], on_start: Callable[[str], None]) -> None:
+    """Run a crew for one topic in the worker process, reporting its run ID when it starts."""
+    from src.agents.agent import run_crew
+
+    run_crew(topic, on_stage=on_stage, on_start=on_start)
+
+
+def _worker_main(worker_id: int, jobs: Any, conn: Any, max_jobs: int,
+                 run_fn: Callable[[str, Callable[[str], None], Callable[[str], None]], Any],
+                 initializer: Optional[Callable[[], None]]) -> None:
+    """Process entry point: warm up, then run jobs from the shared queue until recycled."""
+    # Ctrl+C reaches the whole process group; the parent decides when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Pipe sends are synchronous, so "started" is delivered even if the process dies mid-job
+    send_lock = threading.Lock()
+
+    def send(job_id: Optional[int], event: str, data: Dict[str, Any]) -> None:
+        with send_lock:
+            conn.send((job_id, event, data))
+
+    if initializer is not None:
+        try:
+            initializer()
+        except Exception as e:
+            # Runs still report their own errors; a failed warm-up only costs latency
+            send(None, "warm_up_failed", {"error": str(e)})
+    send(None, "ready", {"pid": os.getpid()})
+
+    done = 0
+    while max_jobs <= 0 or done < max_jobs:
+        item = jobs.get()
+        if item is None:
+            break
+        job_id, topic = item
+        send(job_id, "started", {})
+        start = time.perf_counter()
+        try:
+            run_fn(topic, lambda stage: send(job_id, "stage", {"stage": stage}),
+                   lambda run_id: send(job_id, "run_started", {"run_id": run_id}))
+            send(job_id, "complete", {"duration_s": round(time.perf_counter() - start, 3)})
+        except Exception as e:
+            send(job_id, "failed", {"error": str(e)})
+        done += 1
+    # Workers leaving at their job limit are replaced; those stopped by the pool are not
+    send(None, "exit", {"jobs": done, "recycled": 0 < max_jobs <= done})
+    conn.close()
+
+
+@dataclass
+class _Worker:
+    process: Any
+    conn: Any
+    job_id: Optional[int] = None
+    ready: bool = False
+    exited: bool = False
+    recycled: bool = False
+
+
+class WorkerPool:
+    """Fixed number of worker processes fed from one shared job queue."""
+
+    def __init__(self, processes: int = WORKER_PROCESSES, max_jobs_per_worker: int = WORKER_MAX_JOBS,
+                 run_fn: Callable[[str, Callable[[str], None], Callable[[str], None]], Any] = run_topic,
+                 initializer: Optional[Callable[[], None]] = warm_runtime, start_method: str = "spawn"):
+        # Spawned workers do not inherit the parent's threads or locks
+        self._context = multiprocessing.get_context(start_method)
+        self.processes = max(1, processes)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._run_fn = run_fn
+        self._initializer = initializer
+        self._jobs = self._context.Queue()
+        self._lock = threading.Lock()
+        self._workers: Dict[int, _Worker] = {}
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._next_job = 0
+        self._next_worker = 0
+        self._closing = False
+        self._closed = False
+        self._supervisor: Optional[threading.Thread] = None
+        self.stats = {"completed": 0, "failed": 0, "recycled": 0, "crashed": 0}
+
+    # Lifecycle
+
+    def start(self) -> "WorkerPool":
+        with self._lock:
+            for _ in range(self.processes):
+                self._spawn()
+        self._supervisor = threading.Thread(target=self._supervise, name="worker-pool-supervisor", daemon=True)
+        self._supervisor.start()
+        logger.info(f"Started {self.processes} worker processes "
+                    f"(recycled after {self.max_jobs_per_worker or 'unlimited'} jobs)")
+        return self
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Let workers finish the jobs already queued, then stop them; jobs left after ``timeout`` fail."""
+        with self._lock:
+            self._closing = True
+            workers = len(self._workers)
+        # Queued after every job, so workers (and replacements of recycled ones) drain the queue first
+        for _ in range(workers):
+            self._jobs.put(None)
+        if self._supervisor is not None:
+            self._supervisor.join(timeout)
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers.values())
+        for worker in workers:
+            worker.process.terminate()
+            worker.process.join()
+        if self._supervisor is not None:
+            self._supervisor.join(timeout)
+        with self._lock:
+            for job_id in list(self._pending):
+                self._finish(job_id, error="Worker pool closed")
+
+    def wait_ready(self, timeout: float = 300.0) -> bool:
+        """Wait until every worker has warmed up; returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if len(self._workers) == self.processes and all(w.ready for w in self._workers.values()):
+                    return True
+            time.sleep(0.05)
+        return False
+
+    def __enter__(self) -> "WorkerPool":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _spawn(self) -> None:
+        """Start a new worker process; the caller holds the lock."""
+        worker_id = self._next_worker
+        self._next_worker += 1
+        reader, writer = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_worker_main, name=f"keynote-worker-{worker_id}", daemon=True,
+            args=(worker_id, self._jobs, writer, self.max_jobs_per_worker, self._run_fn, self._initializer),
+        )
+        process.start()
+        # Only the child writes; closing our copy lets the reader see EOF when it exits
+        writer.close()
+        self._workers[worker_id] = _Worker(process, reader)
+
+    # Submission
+
+    def submit(self, topic: str, on_stage: Optional[Callable[[str], None]] = None,
+               on_start: Optional[Callable[[str], None]] = None) -> Future:
+        """Queue a topic; the future resolves with the run's ID and duration or raises its error."""
+        future: Future = Future()
+        with self._lock:
+            if self._closing:
+                raise RuntimeError("Worker pool is closed")
+            job_id = self._next_job
+            self._next_job += 1
+            self._pending[job_id] = {"future": future, "on_stage": on_stage, "on_start": on_start}
+        self._jobs.put((job_id, topic))
+        return future
+
+    def run(self, topic: str, on_stage: Optional[Callable[[str], None]] = None,
+            on_start: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Run a topic on a worker and wait for it; usable as a ``JobManager`` run function."""
+        return self.submit(topic, on_stage, on_start).result()
+
+    def map(self, topics: Sequence[str]) -> List[Any]:
+        """Run topics across all workers; each result is the run info or the exception raised."""
+        futures = [self.submit(topic) for topic in topics]
+        return [future.exception() or future.result() for future in futures]
+
+    # Supervision
+
+    def _supervise(self) -> None:
+        while True:
+            with self._lock:
+                if self._closing and not self._workers:
+                    return
+                handles = {}
+                for worker_id, worker in self._workers.items():
+                    handles[worker.conn] = (worker_id, False)
+                    handles[worker.process.sentinel] = (worker_id, True)
+            for handle in connection.wait(list(handles), timeout=SUPERVISOR_POLL_SECONDS):
+                worker_id, exited = handles[handle]
+                if exited:
+                    self._reap(worker_id)
+                else:
+                    self._receive(worker_id)
+
+    def _receive(self, worker_id: int) -> None:
+        """Handle every message waiting from one worker."""
+        with self._lock:
+            worker = self._workers.get(worker_id)
+            if worker is None:
+                return
+            try:
+                while worker.conn.poll():
+                    self._handle(worker_id, worker, *worker.conn.recv())
+            except (EOFError, OSError):
+                pass  # The worker exited; its sentinel triggers the reaping
+
+    def _handle(self, worker_id: int, worker: _Worker, job_id: Optional[int], event: str,
+                data: Dict[str, Any]) -> None:
+        """Apply one worker message; the caller holds the lock."""
+        if event == "started":
+            worker.job_id = job_id
+        elif event == "stage":
+            self._notify(job_id, "on_stage", data["stage"])
+        elif event == "run_started":
+            if job_id in self._pending:
+                self._pending[job_id]["run_id"] = data["run_id"]
+            self._notify(job_id, "on_start", data["run_id"])
+        elif event in ("complete", "failed"):
+            worker.job_id = None
+            run_id = self._pending.get(job_id, {}).get("run_id")
+            self._finish(job_id, result=dict(data, worker=worker_id, run_id=run_id), error=data.get("error"))
+        elif event == "ready":
+            worker.ready = True
+        elif event == "warm_up_failed":
+            logger.warning(f"Worker {worker_id} warm-up failed: {data['error']}")
+        elif event == "exit":
+            worker.exited = True
+            worker.recycled = data.get("recycled", False)
+
+    def _notify(self, job_id: Optional[int], name: str, value: str) -> None:
+        """Call a job's ``on_stage`` or ``on_start`` callback; the caller holds the lock."""
+        callback = self._pending.get(job_id, {}).get(name)
+        if callback is not None:
+            try:
+                callback(value)
+            except Exception as e:
+                logger.warning(f"{name} callback failed: {str(e)}")
+
+    def _reap(self, worker_id: int) -> None:
+        """Remove a worker whose process ended, failing its job if it crashed, and replace it."""
+        self._receive(worker_id)
+        with self._lock:
+            worker = self._workers.pop(worker_id, None)
+            if worker is None:
+                return
+            worker.process.join()
+            worker.conn.close()
+            if self._closed or (worker.exited and not worker.recycled):
+                return  # Stopped by close()
+            if worker.exited:
+                self.stats["recycled"] += 1
+                logger.info(f"Recycled worker {worker_id} after {self.max_jobs_per_worker} jobs")
+            else:
+                self.stats["crashed"] += 1
+                logger.error(f"Worker {worker_id} exited unexpectedly with code {worker.process.exitcode}")
+                if worker.job_id is not None:
+                    self._finish(worker.job_id,
+                                 error=f"Worker process exited with code {worker.process.exitcode}")
+            # While closing, a replacement is only needed to drain jobs still queued
+            if not self._closing or self._pending:
+                self._spawn()
+
+    def _finish(self, job_id: Optional[int], result: Any = None, error: Optional[str] = None) -> None:
+        """Resolve a job's future; the caller holds the lock."""
+        pending = self._pending.pop(job_id, None)
+        if pending is None:
+            return
+        if error is not None:
+            self.stats["failed"] += 1
+            pending["future"].set_exception(RuntimeError(error))
+        else:
+            self.stats["completed"] += 1
+            pending["future"].set_result(result)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run research topics on a pool of worker processes")
+    parser.add_argument("topics", nargs="+", help="Topics to research")
+    parser.add_argument("--processes", type=int, default=WORKER_PROCESSES)
+    parser.add_argument("--max-jobs-per-worker", type=int, default=WORKER_MAX_JOBS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    start = time.perf_counter()
+    with WorkerPool(args.processes, args.max_jobs_per_worker) as pool:
+        results = pool.map(args.topics)
+    failed = 0
+    for topic, result in zip(args.topics, results):
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"FAILED    {topic}: {result}")
+        else:
+            print(f"complete  {topic} ({result['duration_s']}s on worker {result['worker']})")
+    print(f"{len(args.topics)} topics in {time.perf_counter() - start:.1f}s with {args.processes} workers")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
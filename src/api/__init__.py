@@ -0,0 +1,4 @@
+# API package initialization
+"""
+This package contains the headless HTTP API for submitting and tracking research jobs.
+"""
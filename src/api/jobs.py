@@ -0,0 +1,225 @@
+"""
+In-memory research job queue served by warm worker threads.
+
+Workers run in the API process and share its agent runtime, so the LLM
+selection, search tool and crews are initialized once and reused by every
+job. Job state lives in memory; status reads are dictionary lookups and never
+touch the disk. Progress events are published to asyncio waiters on the
+server's event loop, so streaming clients wake up only when something changes.
+"""
+
+import asyncio
+import collections
+import itertools
+import logging
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config.settings import API_JOB_RETENTION, API_MAX_PENDING_JOBS, API_WORKERS
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETE = "complete"
+FAILED = "failed"
+FINISHED_STATES = (COMPLETE, FAILED)
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the pending queue is full."""
+
+
+@dataclass
+class Job:
+    id: str
+    topic: str
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    cached: bool = False
+    # Run whose artifacts answer the job; set as soon as the run starts
+    run_id: Optional[str] = None
+    # Monotonic change counter, used for ETags and by streaming clients
+    version: int = 0
+    events: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "topic": self.topic,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "cached": self.cached,
+            "run_id": self.run_id,
+            "version": self.version,
+        }
+
+
+def default_run_fn(topic: str, on_stage: Callable[[str], None], on_start: Callable[[str], None]) -> None:
+    """Run a crew in this process through the shared runtime, reporting its run ID when it starts."""
+    from src.agents.agent import run_crew
+
+    run_crew(topic, on_stage=on_stage, on_start=on_start)
+
+
+class JobManager:
+    """Queue of research jobs processed by a fixed pool of worker threads."""
+
+    def __init__(self, run_fn: Callable[[str, Callable[[str], None], Callable[[str], None]], Any] = default_run_fn,
+                 workers: int = API_WORKERS, max_pending: int = API_MAX_PENDING_JOBS,
+                 retention: int = API_JOB_RETENTION):
+        self._run_fn = run_fn
+        self.workers = max(1, workers)
+        self.retention = retention
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max_pending)
+        self._jobs: Dict[str, Job] = {}
+        self._finished_order: "collections.deque[str]" = collections.deque()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiters: Dict[str, List[asyncio.Future]] = collections.defaultdict(list)
+        self._counter = itertools.count(1)
+
+    # Lifecycle
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Start the workers; ``loop`` is the event loop streaming clients wait on."""
+        self._loop = loop
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {self.workers} job workers")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Ask workers to exit after their current job."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    # Submission and queries
+
+    def submit(self, topic: str) -> Job:
+        """Queue a research job for a topic."""
+        job = Job(id=f"{next(self._counter):06d}-{uuid.uuid4().hex[:8]}", topic=topic)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._publish(job, "queued")
+        try:
+            self._queue.put_nowait(job.id)
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job.id]
+            raise QueueFullError("Too many pending jobs")
+        return job
+
+    def add_cached(self, topic: str, run_id: Optional[str] = None) -> Job:
+        """Record a job answered from an existing result (of run ``run_id``) without running the crew."""
+        now = time.time()
+        job = Job(id=f"{next(self._counter):06d}-{uuid.uuid4().hex[:8]}", topic=topic, status=COMPLETE,
+                  started_at=now, finished_at=now, cached=True, run_id=run_id)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._publish(job, "complete")
+        self._retire(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[Job]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        if status:
+            jobs = [job for job in jobs if job.status == status]
+        return jobs[-limit:]
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    # Progress notification
+
+    def _publish(self, job: Job, event: str, **data: Any) -> None:
+        with self._lock:
+            job.version += 1
+            job.events.append({"event": event, "version": job.version, "time": time.time(), **data})
+        if self._loop is not None and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self._wake, job.id)
+            except RuntimeError:
+                pass  # The loop closed between the check and the call
+
+    def _wake(self, job_id: str) -> None:
+        for waiter in self._waiters.pop(job_id, []):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def wait_for_change(self, job_id: str, version: int, timeout: float) -> None:
+        """Wait (on the event loop) until a job's version passes ``version`` or the timeout expires."""
+        job = self.get(job_id)
+        if job is None or job.version > version:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[job_id].append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiters = self._waiters.get(job_id)
+            if waiters and waiter in waiters:
+                waiters.remove(waiter)
+
+    # Workers
+
+    def _worker(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            job = self.get(job_id)
+            if job is None:
+                continue
+            job.status = RUNNING
+            job.started_at = time.time()
+            self._publish(job, "running")
+            try:
+                self._run_fn(job.topic, lambda stage, job=job: self._publish(job, stage),
+                             lambda run_id, job=job: self._run_started(job, run_id))
+                job.status = COMPLETE
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {str(e)}")
+                job.status = FAILED
+                job.error = str(e)
+            job.finished_at = time.time()
+            self._publish(job, job.status, error=job.error)
+            self._retire(job)
+
+    def _run_started(self, job: Job, run_id: str) -> None:
+        """Tie the job to its run before the run writes anything, so its artifacts can be told apart."""
+        job.run_id = run_id
+        self._publish(job, "run_started", run_id=run_id)
+
+    def _retire(self, job: Job) -> None:
+        """Forget the oldest finished jobs beyond the retention limit."""
+        with self._lock:
+            self._finished_order.append(job.id)
+            while len(self._finished_order) > self.retention:
+                self._jobs.pop(self._finished_order.popleft(), None)
@@ -0,0 +1,247 @@
+"""
+Headless HTTP API for research jobs.
+
+    python scripts/run_api.py --port 8600
+
+    POST /jobs                     {"topic": "..."} or {"topics": [...]}; add "reuse": false to force a run
+    GET  /jobs?status=running      recent jobs
+    GET  /jobs/{id}                job status (ETag; send If-None-Match to get a cheap 304)
+    GET  /jobs/{id}/events         progress as server-sent events until the job finishes
+    GET  /jobs/{id}/artifacts      research and keynote text as JSON
+    GET  /jobs/{id}/artifacts/{kind}
+    GET  /health
+
+Jobs run on warm worker threads inside the server process (see
+``src.api.jobs``), so every job reuses the model selection, search tool and
+crews initialized at startup. With ``--processes N`` the threads hand jobs to
+a pool of warm worker processes instead (see ``src.agents.worker_pool``), so
+runs use every CPU core. Status requests are answered from memory.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import sys
+import threading
+from contextlib import ExitStack
+from typing import Any, AsyncIterator, Dict, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from src.api.jobs import FAILED, FINISHED_STATES, RUNNING, Job, JobManager, QueueFullError
+from src.config.settings import API_HOST, API_PORT, API_WORKERS, APP_NAME, APP_VERSION
+from src.utils.output_store import ARTIFACT_FILES, OutputStore
+from src.utils.result_cache import FRESH, ResultCache
+
+logger = logging.getLogger(__name__)
+
+# Most topics accepted in one batch request
+MAX_BATCH_TOPICS = 100
+
+# Idle streams send a comment this often so proxies keep the connection open
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+def warm_up(workers: int) -> None:
+    """Initialize the shared runtime and build one crew per worker before serving jobs."""
+    from src.agents.runtime import get_runtime
+
+    runtime = get_runtime()
+    logger.info(f"Warming up {runtime.model_name} with {workers} crews")
+    runtime.search
+    with ExitStack() as stack:
+        for _ in range(workers):
+            stack.enter_context(runtime.crew_pool.acquire())
+
+
+def job_etag(job: Job) -> str:
+    return f'W/"{job.id}-{job.version}"'
+
+
+def create_app(manager: Optional[JobManager] = None, store: Optional[OutputStore] = None,
+               warm: bool = True) -> Starlette:
+    """Build the API app; tests inject a manager with a fake ``run_fn`` and a temporary store."""
+    manager = manager or JobManager()
+    store = store or OutputStore()
+    result_cache = ResultCache(store)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        manager.start(asyncio.get_running_loop())
+        if warm:
+            # Warm in the background so the server accepts requests immediately
+            threading.Thread(target=warm_up, args=(manager.workers,), name="api-warm-up", daemon=True).start()
+        yield
+        manager.stop()
+
+    def submit(topic: str, reuse: bool) -> Job:
+        if reuse and result_cache.lookup(topic).state == FRESH:
+            return manager.add_cached(topic, (store.read_metadata(topic) or {}).get("run_id"))
+        return manager.submit(topic)
+
+    async def create_jobs(request: Request) -> Response:
+        try:
+            body = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "Request body must be JSON"}, status_code=400)
+        if not isinstance(body, dict):
+            return JSONResponse({"error": "Request body must be an object"}, status_code=400)
+
+        batch = "topics" in body
+        requested = body.get("topics") if batch else [body.get("topic")]
+        if not isinstance(requested, list) or not requested or len(requested) > MAX_BATCH_TOPICS:
+            return JSONResponse({"error": f"Provide a topic or 1-{MAX_BATCH_TOPICS} topics"}, status_code=400)
+        topics = [topic.strip() for topic in requested if isinstance(topic, str) and topic.strip()]
+        if len(topics) != len(requested):
+            return JSONResponse({"error": "Topics must be non-empty strings"}, status_code=400)
+
+        jobs = []
+        for topic in topics:
+            try:
+                jobs.append(submit(topic, bool(body.get("reuse", True))))
+            except QueueFullError as e:
+                # Jobs already accepted from this batch keep running
+                return JSONResponse({"error": str(e), "jobs": [job.as_dict() for job in jobs]},
+                                    status_code=429, headers={"Retry-After": "30"})
+        if batch:
+            return JSONResponse({"jobs": [job.as_dict() for job in jobs]}, status_code=202)
+        return JSONResponse(jobs[0].as_dict(), status_code=202,
+                            headers={"Location": f"/jobs/{jobs[0].id}", "ETag": job_etag(jobs[0])})
+
+    async def list_jobs(request: Request) -> Response:
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 100)), 1000))
+        except ValueError:
+            return JSONResponse({"error": "limit must be an integer"}, status_code=400)
+        jobs = manager.list(request.query_params.get("status"), limit)
+        return JSONResponse({"jobs": [job.as_dict() for job in jobs], "pending": manager.pending})
+
+    def find_job(request: Request) -> Optional[Job]:
+        return manager.get(request.path_params["job_id"])
+
+    async def get_job(request: Request) -> Response:
+        job = find_job(request)
+        if job is None:
+            return JSONResponse({"error": "Unknown job"}, status_code=404)
+        etag = job_etag(job)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return JSONResponse(job.as_dict(), headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    async def job_events(request: Request) -> Response:
+        job = find_job(request)
+        if job is None:
+            return JSONResponse({"error": "Unknown job"}, status_code=404)
+        try:
+            last_seen = int(request.headers.get("last-event-id", 0))
+        except ValueError:
+            last_seen = 0
+
+        async def stream() -> AsyncIterator[str]:
+            sent = last_seen
+            while True:
+                for event in [e for e in list(job.events) if e["version"] > sent]:
+                    yield f"id: {event['version']}\nevent: {event['event']}\ndata: {json.dumps(event)}\n\n"
+                    sent = event["version"]
+                if job.status in FINISHED_STATES and sent >= job.version:
+                    return
+                if await request.is_disconnected():
+                    return
+                version = sent
+                await manager.wait_for_change(job.id, version, SSE_KEEPALIVE_SECONDS)
+                if job.version <= version:
+                    yield ": keep-alive\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    def job_result(job: Job) -> Optional[Response]:
+        """Error response for jobs whose artifacts cannot be served yet."""
+        if job.status == FAILED:
+            return JSONResponse({"error": job.error, "status": job.status}, status_code=409)
+        if job.status not in FINISHED_STATES:
+            return JSONResponse({"error": "Job has not finished", "status": job.status}, status_code=409)
+        return None
+
+    def stored_run_error(job: Job, meta: Dict[str, Any]) -> Optional[Response]:
+        """Error response when the topic's stored artifacts belong to a run other than the job's."""
+        if job.run_id is None or meta.get("run_id") == job.run_id:
+            return None
+        body = {"error": "The topic was run again after this job", "run_id": job.run_id,
+                "stored_run_id": meta.get("run_id"), "status": meta.get("status")}
+        # A newer run in progress may still be replacing the artifacts; a finished one has replaced them
+        return JSONResponse(body, status_code=409 if meta.get("status") == RUNNING else 410)
+
+    async def get_artifacts(request: Request) -> Response:
+        job = find_job(request)
+        if job is None:
+            return JSONResponse({"error": "Unknown job"}, status_code=404)
+        error = job_result(job)
+        if error is not None:
+            return error
+        meta = store.read_metadata(job.topic) or {}
+        error = stored_run_error(job, meta)
+        if error is not None:
+            return error
+        artifacts = {kind: store.read_artifact(job.topic, kind) for kind in ARTIFACT_FILES}
+        return JSONResponse({"id": job.id, "topic": job.topic, "artifacts": artifacts, "meta": meta})
+
+    async def get_artifact(request: Request) -> Response:
+        job = find_job(request)
+        kind = request.path_params["kind"]
+        if job is None or kind not in ARTIFACT_FILES:
+            return JSONResponse({"error": "Unknown job or artifact"}, status_code=404)
+        error = job_result(job) or stored_run_error(job, store.read_metadata(job.topic) or {})
+        if error is not None:
+            return error
+        # Streamed in chunks, so serving a long keynote never loads it whole
+        return StreamingResponse(store.iter_artifact(job.topic, kind), media_type="text/plain; charset=utf-8")
+
+    async def health(request: Request) -> Response:
+        return JSONResponse({"app": APP_NAME, "version": APP_VERSION, "workers": manager.workers,
+                             "pending": manager.pending})
+
+    return Starlette(routes=[
+        Route("/health", health),
+        Route("/jobs", create_jobs, methods=["POST"]),
+        Route("/jobs", list_jobs, methods=["GET"]),
+        Route("/jobs/{job_id}", get_job),
+        Route("/jobs/{job_id}/events", job_events),
+        Route("/jobs/{job_id}/artifacts", get_artifacts),
+        Route("/jobs/{job_id}/artifacts/{kind}", get_artifact),
+    ], lifespan=lifespan)
+
+
+def main(argv: Optional[Any] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the KeynoteGenie research API")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="Concurrent research jobs")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="Run jobs on this many worker processes instead of threads (use all cores)")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    if args.processes <= 0:
+        # A single server process, so all workers share one runtime and one job table
+        uvicorn.run(create_app(JobManager(workers=args.workers)), host=args.host, port=args.port, log_level="info")
+        return 0
+
+    from src.agents.worker_pool import WorkerPool
+
+    # Each worker process warms its own runtime; the server only tracks jobs
+    with WorkerPool(processes=args.processes) as pool:
+        manager = JobManager(run_fn=pool.run, workers=pool.processes)
+        uvicorn.run(create_app(manager, warm=False), host=args.host, port=args.port, log_level="info")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import itertools
+import tempfile
+import threading
+import time
+import unittest
+
+from starlette.testclient import TestClient
+
+from src.api.jobs import JobManager
+from src.api.server import create_app
+from src.utils.output_store import OutputStore
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        """Serve jobs from a fake crew that writes to a temporary store"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = OutputStore(self.tmp_dir.name)
+        self.release = threading.Event()
+        self.release.set()
+        runs = itertools.count(1)
+
+        def run_fn(topic, on_stage, on_start):
+            run_id = f"run-{next(runs)}"
+            on_start(run_id)
+            self.store.write_metadata(topic, run_id=run_id, status="running", started_at=time.time())
+            self.release.wait(5)
+            if topic == "boom":
+                raise RuntimeError("crew failed")
+            on_stage("research_complete")
+            self.store.write_artifact(topic, "research", f"Research on {topic} ({run_id})")
+            self.store.write_artifact(topic, "keynote", f"Keynote on {topic} ({run_id})")
+            self.store.write_metadata(topic, status="complete", timings={"finished_at": time.time()})
+
+        self.manager = JobManager(run_fn=run_fn, workers=2)
+        self.client = TestClient(create_app(self.manager, self.store, warm=False))
+        self.client.__enter__()
+
+    def tearDown(self):
+        self.release.set()
+        self.client.__exit__(None, None, None)
+        self.tmp_dir.cleanup()
+
+    def wait_for(self, job_id, status, timeout=5.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = self.client.get(f"/jobs/{job_id}").json()
+            if job["status"] == status:
+                return job
+            time.sleep(0.01)
+        self.fail(f"Job {job_id} did not reach {status}")
+
+    def wait_for_run(self, job_id, timeout=5.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = self.client.get(f"/jobs/{job_id}").json()
+            if job["run_id"] is not None:
+                return job
+            time.sleep(0.01)
+        self.fail(f"Job {job_id} did not start a run")
+
+    def test_submit_poll_and_fetch_artifacts(self):
+        """A submitted job runs to completion and its artifacts can be fetched"""
+        self.release.clear()
+        response = self.client.post("/jobs", json={"topic": "Edge AI"})
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["id"]
+        self.assertEqual(self.client.get(f"/jobs/{job_id}/artifacts").status_code, 409)
+
+        self.release.set()
+        self.wait_for(job_id, "complete")
+        artifacts = self.client.get(f"/jobs/{job_id}/artifacts").json()["artifacts"]
+        self.assertEqual(artifacts["keynote"], "Keynote on Edge AI (run-1)")
+        self.assertEqual(self.client.get(f"/jobs/{job_id}/artifacts/research").text, "Research on Edge AI (run-1)")
+
+    def test_status_etag(self):
+        """Polling with the last ETag returns 304 until the job changes"""
+        self.release.clear()
+        job_id = self.client.post("/jobs", json={"topic": "Edge AI"}).json()["id"]
+        self.wait_for(job_id, "running")
+        etag = self.client.get(f"/jobs/{job_id}").headers["etag"]
+        self.assertEqual(self.client.get(f"/jobs/{job_id}", headers={"If-None-Match": etag}).status_code, 304)
+
+        self.release.set()
+        self.wait_for(job_id, "complete")
+        self.assertEqual(self.client.get(f"/jobs/{job_id}", headers={"If-None-Match": etag}).status_code, 200)
+
+    def test_event_stream(self):
+        """The event stream replays progress and ends when the job finishes"""
+        job_id = self.client.post("/jobs", json={"topic": "Edge AI"}).json()["id"]
+        with self.client.stream("GET", f"/jobs/{job_id}/events") as response:
+            events = [line[len("event: "):] for line in response.iter_lines() if line.startswith("event: ")]
+        self.assertEqual(events, ["queued", "running", "run_started", "research_complete", "complete"])
+
+    def test_batch_failures_and_cache_reuse(self):
+        """Batches create one job per topic; fresh results are reused unless asked not to"""
+        jobs = self.client.post("/jobs", json={"topics": ["Edge AI", "boom"]}).json()["jobs"]
+        self.assertEqual(len(jobs), 2)
+        self.wait_for(jobs[0]["id"], "complete")
+        failed = self.wait_for(jobs[1]["id"], "failed")
+        self.assertEqual(failed["error"], "crew failed")
+
+        cached = self.client.post("/jobs", json={"topic": "Edge AI"}).json()
+        self.assertTrue(cached["cached"])
+        self.assertEqual(cached["status"], "complete")
+        self.assertFalse(self.client.post("/jobs", json={"topic": "Edge AI", "reuse": False}).json()["cached"])
+        self.assertEqual(self.client.post("/jobs", json={"topics": []}).status_code, 400)
+
+    def test_artifacts_belong_to_the_jobs_run(self):
+        """Once the topic is run again, an earlier job's artifacts are refused instead of served from the new run"""
+        first = self.client.post("/jobs", json={"topic": "Edge AI"}).json()["id"]
+        self.assertEqual(self.wait_for(first, "complete")["run_id"], "run-1")
+
+        self.release.clear()
+        second = self.client.post("/jobs", json={"topic": "Edge AI", "reuse": False}).json()["id"]
+        # The run ID is known while the job is still running
+        self.assertEqual(self.wait_for_run(second)["status"], "running")
+        self.assertEqual(self.client.get(f"/jobs/{first}/artifacts").status_code, 409)
+        self.assertEqual(self.client.get(f"/jobs/{first}/artifacts/keynote").status_code, 409)
+
+        self.release.set()
+        self.wait_for(second, "complete")
+        replaced = self.client.get(f"/jobs/{first}/artifacts")
+        self.assertEqual(replaced.status_code, 410)
+        self.assertEqual(replaced.json()["stored_run_id"], "run-2")
+        self.assertEqual(self.client.get(f"/jobs/{first}/artifacts/keynote").status_code, 410)
+        self.assertEqual(self.client.get(f"/jobs/{second}/artifacts/keynote").text, "Keynote on Edge AI (run-2)")
+
+        # Jobs answered from the stored result are tied to the run that produced it
+        cached = self.client.post("/jobs", json={"topic": "Edge AI"}).json()
+        self.assertEqual((cached["cached"], cached["run_id"]), (True, "run-2"))
+        self.assertEqual(self.client.get(f"/jobs/{cached['id']}/artifacts").json()["meta"]["run_id"], "run-2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,9 +7,37 @@ from pathlib import Path
 # Base directories
 ROOT_DIR = Path(__file__).parent.parent.parent
 SRC_DIR = ROOT_DIR / "src"
-OUTPUTS_DIR = ROOT_DIR / "outputs"
+
+# Locations searched for a .env file, in priority order
+DOTENV_PATHS = [
+    ROOT_DIR / ".env",
+    ROOT_DIR / ".env.local",
+    SRC_DIR / ".env",
+    Path.cwd() / ".env",
+]
+
+# Snapshot of the resolved configuration (.env values, selected provider and models,
+# provider health) shared by every process until the .env file changes. It is read
+# before the .env values are applied, so these two come from the process environment only
+CONFIG_SNAPSHOT = os.getenv("KEYNOTEGENIE_CONFIG_SNAPSHOT", "1") == "1"
+CONFIG_SNAPSHOT_FILE = Path(os.getenv(
+    "KEYNOTEGENIE_CONFIG_SNAPSHOT_FILE",
+    Path(os.getenv("KEYNOTEGENIE_CACHE_DIR", ROOT_DIR / ".cache")) / "config_snapshot.json",
+))
+
+# Apply the .env values before any other setting reads the environment
+from src.config.snapshot import load_environment  # noqa: E402
+
+load_environment()
+
+OUTPUTS_DIR = Path(os.getenv("KEYNOTEGENIE_OUTPUTS_DIR", ROOT_DIR / "outputs"))
 LOGS_DIR = ROOT_DIR / "logs"
 
+CACHE_DIR = Path(os.getenv("KEYNOTEGENIE_CACHE_DIR", ROOT_DIR / ".cache"))
+SEARCH_CACHE_DIR = CACHE_DIR / "search"
+PAGE_CACHE_DIR = CACHE_DIR / "pages"
+LLM_CACHE_DIR = CACHE_DIR / "llm"
+
 # Ensure directories exist
 OUTPUTS_DIR.mkdir(exist_ok=True)
 LOGS_DIR.mkdir(exist_ok=True)
@@ -17,8 +45,136 @@ LOGS_DIR.mkdir(exist_ok=True)
 # File paths
 RESEARCH_SUMMARY_FILE = OUTPUTS_DIR / "research_summary.txt"
 KEYNOTE_SPEECH_FILE = OUTPUTS_DIR / "keynote_speech.txt"
+HISTORY_DB_FILE = OUTPUTS_DIR / "history.db"
+PINNED_TOPICS_FILE = OUTPUTS_DIR / "pinned_topics.json"
 
 # Application settings
 APP_NAME = "KeynoteGenie"
 APP_VERSION = "0.1.0"
-DEFAULT_RESEARCH_TOPIC = "Research and analyze recent AI breakthroughs and their business applications" 
\ No newline at end of file
+DEFAULT_RESEARCH_TOPIC = "Research and analyze recent AI breakthroughs and their business applications"
+# Research task description template; also used to predict the researcher's first search
+RESEARCH_TASK_DESCRIPTION = "Research and analyze: {topic}"
+# Keynote writing mode: "single" (one writer call) or "sectioned" (outline, parallel sections, stitch)
+WRITING_MODE = os.getenv("KEYNOTEGENIE_WRITING_MODE", "single")
+KEYNOTE_SECTIONS = int(os.getenv("KEYNOTEGENIE_KEYNOTE_SECTIONS", 4))
+SECTION_PARALLELISM = int(os.getenv("KEYNOTEGENIE_SECTION_PARALLELISM", 4))
+# Approximate token budget for the research handed to the writer (0 passes it through in full)
+COMPACTION_TOKEN_BUDGET = int(os.getenv("KEYNOTEGENIE_COMPACTION_BUDGET", 1200))
+
+# Provider selection: "mistral" (with fallbacks), "openrouter", "openai", "local" (in-process
+# Hugging Face model on CPU) or "fake" for offline testing
+LLM_PROVIDER = os.getenv("KEYNOTEGENIE_LLM_PROVIDER", "mistral")
+# Model tiers: which tier each agent uses, and optional litellm model names overriding a tier
+AGENT_TIERS = {
+    "researcher": os.getenv("KEYNOTEGENIE_RESEARCHER_TIER", "fast"),
+    "outliner": os.getenv("KEYNOTEGENIE_OUTLINER_TIER", "fast"),
+    "writer": os.getenv("KEYNOTEGENIE_WRITER_TIER", "large"),
+}
+TIER_MODEL_OVERRIDES = {
+    tier: model
+    for tier, model in (("fast", os.getenv("KEYNOTEGENIE_FAST_MODEL")), ("large", os.getenv("KEYNOTEGENIE_LARGE_MODEL")))
+    if model
+}
+# Disk cache of LLM completions shared by all processes, keyed by the full prompt (opt-in)
+LLM_CACHE = os.getenv("KEYNOTEGENIE_LLM_CACHE", "0") == "1"
+# Hedged completions (opt-in): if an agent's call has not finished after the delay
+# (default: the model's recent p90 latency), the prompt is also sent to a secondary
+# provider's model and the first response wins
+HEDGING = os.getenv("KEYNOTEGENIE_HEDGING", "0") == "1"
+HEDGE_AGENTS = tuple(a.strip() for a in os.getenv("KEYNOTEGENIE_HEDGE_AGENTS", "writer,outliner").split(",") if a.strip())
+HEDGE_MODEL = os.getenv("KEYNOTEGENIE_HEDGE_MODEL")
+HEDGE_DELAY_SECONDS = float(os.environ["KEYNOTEGENIE_HEDGE_DELAY"]) if os.getenv("KEYNOTEGENIE_HEDGE_DELAY") else None
+HEDGE_PERCENTILE = float(os.getenv("KEYNOTEGENIE_HEDGE_PERCENTILE", 90))
+# Until a model has this many recorded calls, hedge after a fixed initial delay
+HEDGE_MIN_SAMPLES = int(os.getenv("KEYNOTEGENIE_HEDGE_MIN_SAMPLES", 10))
+HEDGE_INITIAL_DELAY_SECONDS = float(os.getenv("KEYNOTEGENIE_HEDGE_INITIAL_DELAY", 20))
+# Search provider: "serper" or "fake" for offline testing
+SEARCH_PROVIDER = os.getenv("KEYNOTEGENIE_SEARCH_PROVIDER", "serper")
+
+# Search results cache shared by the UI (prefetching) and agent processes
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("KEYNOTEGENIE_SEARCH_CACHE_TTL", 6 * 3600))
+# Enrichment of search results with the text of the top result pages (0 disables it)
+PAGE_FETCH_TOP_N = int(os.getenv("KEYNOTEGENIE_PAGE_FETCH_TOP_N", 3))
+PAGE_FETCH_CONCURRENCY = int(os.getenv("KEYNOTEGENIE_PAGE_FETCH_CONCURRENCY", 4))
+PAGE_FETCH_TIMEOUT_SECONDS = float(os.getenv("KEYNOTEGENIE_PAGE_FETCH_TIMEOUT", 8))
+# Approximate tokens of condensed page text added to each enriched result
+PAGE_CONTENT_TOKENS = int(os.getenv("KEYNOTEGENIE_PAGE_CONTENT_TOKENS", 300))
+# Pages younger than this are served from disk without revalidating their ETag
+PAGE_CACHE_TTL_SECONDS = float(os.getenv("KEYNOTEGENIE_PAGE_CACHE_TTL", 24 * 3600))
+# Speculative prefetch of searches while the topic is being typed (opt-in)
+SPECULATIVE_PREFETCH = os.getenv("KEYNOTEGENIE_SPECULATIVE_PREFETCH", "0") == "1"
+PREFETCH_DEBOUNCE_SECONDS = float(os.getenv("KEYNOTEGENIE_PREFETCH_DEBOUNCE", 1.5))
+
+# Topic result cache: results younger than the TTL are served as-is; older ones are
+# served while a background refresh runs, until the stale window also runs out
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("KEYNOTEGENIE_RESULT_CACHE_TTL", 24 * 3600))
+RESULT_CACHE_STALE_SECONDS = float(os.getenv("KEYNOTEGENIE_RESULT_CACHE_STALE", 7 * 24 * 3600))
+
+# Headless HTTP API
+API_HOST = os.getenv("KEYNOTEGENIE_API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("KEYNOTEGENIE_API_PORT", 8600))
+# Warm worker threads running jobs in the API process, sharing one agent runtime
+API_WORKERS = int(os.getenv("KEYNOTEGENIE_API_WORKERS", 2))
+# Jobs waiting beyond this are rejected with 429; finished jobs kept in memory for status queries
+API_MAX_PENDING_JOBS = int(os.getenv("KEYNOTEGENIE_API_MAX_PENDING", 1000))
+API_JOB_RETENTION = int(os.getenv("KEYNOTEGENIE_API_JOB_RETENTION", 1000))
+
+# Worker processes running crews in parallel (defaults to one per CPU core); each
+# worker is replaced by a fresh process after this many jobs to cap memory growth
+WORKER_PROCESSES = int(os.getenv("KEYNOTEGENIE_WORKER_PROCESSES", os.cpu_count() or 1))
+WORKER_MAX_JOBS = int(os.getenv("KEYNOTEGENIE_WORKER_MAX_JOBS", 20))
+
+# Distributed mode: nodes claim jobs from a shared broker ("sqlite:///path" on a
+# shared volume or "redis://host:port/db"), holding a lease renewed by heartbeats
+BROKER_URL = os.getenv("KEYNOTEGENIE_BROKER_URL", f"sqlite:///{OUTPUTS_DIR / 'jobs.db'}")
+BROKER_LEASE_SECONDS = float(os.getenv("KEYNOTEGENIE_BROKER_LEASE", 120))
+BROKER_HEARTBEAT_SECONDS = float(os.getenv("KEYNOTEGENIE_BROKER_HEARTBEAT", 30))
+BROKER_POLL_SECONDS = float(os.getenv("KEYNOTEGENIE_BROKER_POLL", 2))
+# Attempts per job before a job whose workers keep dying is marked failed
+BROKER_MAX_ATTEMPTS = int(os.getenv("KEYNOTEGENIE_BROKER_MAX_ATTEMPTS", 3))
+# Output store every node publishes finished artifacts to (unset: nodes write there directly)
+SHARED_OUTPUTS_DIR = os.getenv("KEYNOTEGENIE_SHARED_OUTPUTS_DIR")
+
+# Checkpoints of finished tasks and tool calls, kept so interrupted runs can resume
+CHECKPOINTS_DIR = Path(os.getenv("KEYNOTEGENIE_CHECKPOINTS_DIR", OUTPUTS_DIR / "checkpoints"))
+# Opt-in: a new run of a topic resumes its last failed or abandoned run instead of starting over
+RESUME_INTERRUPTED_RUNS = os.getenv("KEYNOTEGENIE_RESUME_RUNS", "0") == "1"
+# A "running" run whose checkpoints have not changed for this long is treated as abandoned
+CHECKPOINT_STALE_SECONDS = float(os.getenv("KEYNOTEGENIE_CHECKPOINT_STALE", 1800))
+# Checkpoints of runs that were never resumed are deleted after this long
+CHECKPOINT_MAX_AGE_SECONDS = float(os.getenv("KEYNOTEGENIE_CHECKPOINT_MAX_AGE", 7 * 24 * 3600))
+
+# Long outputs are shown in the UI one page of about this many bytes at a time
+OUTPUT_PAGE_BYTES = int(os.getenv("KEYNOTEGENIE_OUTPUT_PAGE_BYTES", 50_000))
+# Characters of each artifact indexed for history search
+HISTORY_INDEX_MAX_CHARS = int(os.getenv("KEYNOTEGENIE_HISTORY_INDEX_MAX_CHARS", 1_000_000))
+
+# Opt-in per-run profiling: the fraction of runs profiled (0 = off, 1 = every run).
+# Stacks are sampled every PROFILE_INTERVAL seconds; profiles are written to PROFILES_DIR
+PROFILE_RATE = float(os.getenv("KEYNOTEGENIE_PROFILE", 0))
+PROFILE_INTERVAL = float(os.getenv("KEYNOTEGENIE_PROFILE_INTERVAL", 0.02))
+PROFILES_DIR = Path(os.getenv("KEYNOTEGENIE_PROFILES_DIR", LOGS_DIR / "profiles"))
+# Allocation tracking and cProfile add real overhead, so they are separately opt-in
+PROFILE_TRACEMALLOC = os.getenv("KEYNOTEGENIE_PROFILE_TRACEMALLOC", "0") == "1"
+PROFILE_CPROFILE = os.getenv("KEYNOTEGENIE_PROFILE_CPROFILE", "0") == "1"
+# Sample every thread instead of only the thread running the crew
+PROFILE_ALL_THREADS = os.getenv("KEYNOTEGENIE_PROFILE_ALL_THREADS", "0") == "1"
+# Most recent profiles kept
+PROFILE_KEEP = int(os.getenv("KEYNOTEGENIE_PROFILE_KEEP", 500))
+
+# A provider that passed its connection test is trusted for this long before being probed again
+PROVIDER_HEALTH_TTL_SECONDS = float(os.getenv("KEYNOTEGENIE_PROVIDER_HEALTH_TTL", 6 * 3600))
+
+# Local provider: small Hugging Face models run in-process on CPU (shorthands from
+# huggingface.RECOMMENDED_MODELS or model IDs). The large model is the one get_model selects
+LOCAL_LLM_MODEL = os.getenv("KEYNOTEGENIE_LOCAL_MODEL", "tiny-llama")
+LOCAL_LLM_FAST_MODEL = os.getenv("KEYNOTEGENIE_LOCAL_FAST_MODEL", "flan-t5-base")
+# Concurrent requests are generated in batches of up to LOCAL_LLM_MAX_BATCH prompts, collected
+# for at most LOCAL_LLM_BATCH_WAIT_MS while the model is idle
+LOCAL_LLM_MAX_BATCH = int(os.getenv("KEYNOTEGENIE_LOCAL_MAX_BATCH", 8))
+LOCAL_LLM_BATCH_WAIT_MS = float(os.getenv("KEYNOTEGENIE_LOCAL_BATCH_WAIT_MS", 5))
+LOCAL_LLM_MAX_NEW_TOKENS = int(os.getenv("KEYNOTEGENIE_LOCAL_MAX_NEW_TOKENS", 512))
+# Torch CPU threads for local inference (0 keeps torch's default)
+LOCAL_LLM_THREADS = int(os.getenv("KEYNOTEGENIE_LOCAL_THREADS", 0))
+# Use the local model as the last resort when every API provider fails (opt-in)
+LOCAL_LLM_FALLBACK = os.getenv("KEYNOTEGENIE_LOCAL_FALLBACK", "0") == "1"
@@ -0,0 +1,271 @@
+"""
+Warm-start snapshot of the resolved configuration.
+
+Resolving the configuration at startup used to mean locating and parsing the
+.env file, resolving model IDs and running a live connection test against the
+LLM provider chain, in every process. The result of all that is saved once to
+``CONFIG_SNAPSHOT_FILE`` and every later process (CLI runs, UI runner children,
+API and pool workers, nodes) loads it with a single read:
+
+- ``env``: the values of the .env file, applied to ``os.environ`` without
+  overriding variables already set, like ``load_dotenv``
+- ``selections``: per requested provider, the model the fallback chain chose,
+  its provider and tier models, and when its connection test last passed
+
+The snapshot is tied to the .env file it was built from. A changed mtime or size
+leads to the file being hashed, and only a changed hash (or a different .env
+file taking priority) discards the snapshot. A selection is reused only while
+the variables it depends on are unchanged and its health check is younger than
+``PROVIDER_HEALTH_TTL_SECONDS``. The file holds the .env values, so it is
+readable by its owner only.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from src.utils.atomic_files import atomic_writer
+
+logger = logging.getLogger(__name__)
+
+# Bumped when cached selections change shape; v2 prefixes OpenRouter model names with openrouter/
+SNAPSHOT_VERSION = 2
+
+# Variables that change which provider and models the fallback chain selects
+SELECTION_VARS = (
+    "MISTRAL_API_KEY",
+    "OPENROUTER_API_KEY",
+    "OPENROUTER_MODEL_ID",
+    "OPENAI_API_KEY",
+    "OPENAI_MODEL_ID",
+    "FAKE_LLM_URL",
+    "KEYNOTEGENIE_FAST_MODEL",
+    "KEYNOTEGENIE_LARGE_MODEL",
+    "KEYNOTEGENIE_LOCAL_MODEL",
+    "KEYNOTEGENIE_LOCAL_FAST_MODEL",
+    "KEYNOTEGENIE_LOCAL_FALLBACK",
+)
+
+
+def _sha256(data: bytes) -> str:
+    # Only needed when the snapshot is rebuilt or checked, so hashlib stays out of the settings import
+    import hashlib
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def dotenv_fingerprint(paths: Sequence[Path]) -> Dict[str, Any]:
+    """Which .env file is in effect, with its mtime and size (the hash is added when needed)."""
+    path = next((p for p in paths if p.exists()), None)
+    if path is None:
+        return {"path": None}
+    stat = path.stat()
+    return {"path": str(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def selection_inputs() -> str:
+    """Digest of the variables a provider selection depends on; no secret is stored."""
+    values = {name: os.getenv(name) for name in SELECTION_VARS}
+    return _sha256(json.dumps(values, sort_keys=True).encode("utf-8"))
+
+
+class ConfigSnapshot:
+    """Resolved configuration cached on disk and shared by every process."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, dotenv_paths: Optional[Sequence[Path]] = None,
+                 health_ttl: Optional[float] = None, enabled: Optional[bool] = None):
+        # The settings load the snapshot while they are being evaluated, so only the
+        # names defined before that point are read here (see src.config.settings)
+        from src.config import settings
+
+        self.path = Path(path or settings.CONFIG_SNAPSHOT_FILE)
+        self.dotenv_paths = list(settings.DOTENV_PATHS if dotenv_paths is None else dotenv_paths)
+        # None: the configured TTL, looked up once the settings are loaded
+        self._health_ttl = health_ttl
+        self.enabled = settings.CONFIG_SNAPSHOT if enabled is None else enabled
+        self._lock = threading.RLock()
+        self._data: Optional[Dict[str, Any]] = None
+        self.dotenv_path: Optional[Path] = None
+        # Whether this process reused the snapshot or had to rebuild it
+        self.warm = False
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) and data.get("version") == SNAPSHOT_VERSION else None
+
+    @property
+    def health_ttl(self) -> float:
+        if self._health_ttl is None:
+            from src.config.settings import PROVIDER_HEALTH_TTL_SECONDS
+
+            return PROVIDER_HEALTH_TTL_SECONDS
+        return self._health_ttl
+
+    def _write(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            # Holds the provider keys, so only the owner may read it
+            with atomic_writer(self.path, mode=0o600) as tmp_file:
+                json.dump(self._data, tmp_file, indent=2, sort_keys=True)
+        except OSError as e:
+            logger.warning(f"Could not save the configuration snapshot: {e}")
+
+    def _matches(self, saved: Dict[str, Any], current: Dict[str, Any]) -> bool:
+        """Whether the saved fingerprint describes the current .env file, hashing it only if it was touched."""
+        saved = saved or {}
+        if saved.get("path") != current["path"]:
+            return False
+        if current["path"] is None:
+            return True
+        if all(saved.get(key) == current[key] for key in ("mtime_ns", "size")):
+            current["sha256"] = saved.get("sha256")
+            return True
+        current["sha256"] = _sha256(Path(current["path"]).read_bytes())
+        return saved.get("sha256") == current["sha256"]
+
+    def load_environment(self) -> Optional[Path]:
+        """Apply the .env values, from the snapshot if it is current; returns the .env file used."""
+        with self._lock:
+            if self._data is not None:
+                return self.dotenv_path
+            fingerprint = dotenv_fingerprint(self.dotenv_paths)
+            data = self._read()
+            if data is not None and self._matches(data.get("dotenv"), fingerprint):
+                self.warm = True
+                self._data = data
+                if data["dotenv"] != fingerprint:
+                    # Touched but unchanged; refresh the stat fields so the next start skips the hash
+                    data["dotenv"] = fingerprint
+                    self._write()
+            else:
+                env: Dict[str, str] = {}
+                if fingerprint["path"]:
+                    from dotenv import dotenv_values
+
+                    fingerprint.setdefault("sha256", _sha256(Path(fingerprint["path"]).read_bytes()))
+                    env = {k: v for k, v in dotenv_values(fingerprint["path"]).items() if v is not None}
+                data = {"version": SNAPSHOT_VERSION, "created_at": time.time(), "dotenv": fingerprint,
+                        "env": env, "selections": {}}
+                self._data = data
+                self._write()
+            for name, value in data["env"].items():
+                os.environ.setdefault(name, value)
+            self.dotenv_path = Path(fingerprint["path"]) if fingerprint["path"] else None
+            return self.dotenv_path
+
+    def selection(self, model_type: str) -> Optional[Dict[str, Any]]:
+        """The cached provider selection for ``model_type``, if still valid for this environment."""
+        with self._lock:
+            self.load_environment()
+            selection = self._data["selections"].get(model_type)
+            if not selection or selection.get("inputs") != selection_inputs():
+                return None
+            if time.time() - selection.get("checked_at", 0) > self.health_ttl:
+                return None
+            return selection
+
+    def record_selection(self, model_type: str, model_name: str, provider: str,
+                         tier_models: Dict[str, str], inputs: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Save the outcome of a provider selection whose connection test passed.
+
+        ``inputs`` should be taken with ``selection_inputs()`` before the selection
+        ran, since providers may set variables of their own while being tested.
+        """
+        with self._lock:
+            self.load_environment()
+            selection = {
+                "model_name": model_name,
+                "provider": provider,
+                "tier_models": tier_models,
+                "healthy": True,
+                "checked_at": time.time(),
+                "inputs": inputs or selection_inputs(),
+            }
+            # Another process may have saved selections for other providers meanwhile
+            latest = self._read()
+            if latest is not None and latest.get("dotenv", {}).get("sha256") == self._data["dotenv"].get("sha256"):
+                self._data["selections"] = {**latest.get("selections", {}), **self._data["selections"]}
+            self._data["selections"][model_type] = selection
+            self._write()
+            return selection
+
+    def forget_selection(self, model_type: str) -> None:
+        """Drop a cached selection, so the next process tests the provider chain again."""
+        with self._lock:
+            self.load_environment()
+            if self._data["selections"].pop(model_type, None) is not None:
+                self._write()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data = None
+            self.warm = False
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def describe(self) -> Dict[str, Any]:
+        """The snapshot without the .env values, for display."""
+        data = self._read() or {}
+        return {
+            "path": str(self.path),
+            "created_at": data.get("created_at"),
+            "dotenv": data.get("dotenv"),
+            "env_vars": sorted(data.get("env", {})),
+            "selections": {
+                model_type: {k: v for k, v in selection.items() if k != "inputs"}
+                for model_type, selection in data.get("selections", {}).items()
+            },
+        }
+
+
+_snapshot: Optional[ConfigSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot() -> ConfigSnapshot:
+    """The process-wide configuration snapshot."""
+    global _snapshot
+    # Importing the settings loads the snapshot through this function, so do it before taking the lock
+    import src.config.settings  # noqa: F401
+
+    with _snapshot_lock:
+        if _snapshot is None:
+            _snapshot = ConfigSnapshot()
+        return _snapshot
+
+
+def load_environment() -> Optional[Path]:
+    """Load the .env values once per process, through the snapshot."""
+    return get_snapshot().load_environment()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show or clear the resolved configuration snapshot")
+    parser.add_argument("--clear", action="store_true", help="Delete the snapshot so the next start resolves everything again")
+    args = parser.parse_args(argv)
+
+    snapshot = get_snapshot()
+    if args.clear:
+        snapshot.clear()
+        print(f"Cleared {snapshot.path}")
+        return
+    print(json.dumps(snapshot.describe(), indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
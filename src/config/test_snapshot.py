@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.config.snapshot import ConfigSnapshot
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+class TestConfigSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp_dir.name)
+        self.dotenv = self.dir / ".env"
+        self.dotenv.write_text("SNAPSHOT_TEST_KEY=from-dotenv\nSNAPSHOT_TEST_OTHER=1\n")
+        self.env = mock.patch.dict(os.environ, {"SNAPSHOT_TEST_OTHER": "from-process"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.tmp_dir.cleanup()
+
+    def snapshot(self, **kwargs):
+        return ConfigSnapshot(self.dir / "snapshot.json", dotenv_paths=[self.dotenv], enabled=True, **kwargs)
+
+    def test_env_is_reused_until_the_dotenv_file_changes(self):
+        """The .env values are loaded from the snapshot; only a content change rebuilds it"""
+        first = self.snapshot()
+        self.assertEqual(first.load_environment(), self.dotenv)
+        self.assertFalse(first.warm)
+        self.assertEqual(os.environ["SNAPSHOT_TEST_KEY"], "from-dotenv")
+        # Like load_dotenv, variables already set in the process win
+        self.assertEqual(os.environ["SNAPSHOT_TEST_OTHER"], "from-process")
+        self.assertEqual(oct(os.stat(first.path).st_mode & 0o777), oct(0o600))
+        first.record_selection("fake", "openai/fake", "fake", {"fast": "openai/fake-fast", "large": "openai/fake"})
+
+        del os.environ["SNAPSHOT_TEST_KEY"]
+        warm = self.snapshot()
+        warm.load_environment()
+        self.assertTrue(warm.warm)
+        self.assertEqual(os.environ["SNAPSHOT_TEST_KEY"], "from-dotenv")
+        self.assertEqual(warm.selection("fake")["model_name"], "openai/fake")
+
+        # Touched without changes: still warm, selections kept
+        stat = self.dotenv.stat()
+        os.utime(self.dotenv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        touched = self.snapshot()
+        touched.load_environment()
+        self.assertTrue(touched.warm)
+        self.assertIsNotNone(touched.selection("fake"))
+
+        self.dotenv.write_text("SNAPSHOT_TEST_KEY=changed\n")
+        changed = self.snapshot()
+        changed.load_environment()
+        self.assertFalse(changed.warm)
+        self.assertIsNone(changed.selection("fake"))
+
+    def test_selection_requires_same_inputs_and_fresh_health(self):
+        """A provider selection is re-tested when its variables change or its health check expires"""
+        models = {"fast": "mistral/mistral-small-latest", "large": "mistral/mistral-large-latest"}
+        with mock.patch.dict(os.environ, {"MISTRAL_API_KEY": "key-1"}):
+            self.snapshot().record_selection("mistral", models["large"], "mistral", models)
+            self.assertEqual(self.snapshot().selection("mistral")["tier_models"], models)
+            self.assertIsNone(self.snapshot(health_ttl=-1).selection("mistral"))
+            self.assertIsNone(self.snapshot().selection("openai"))
+            self.assertNotIn("key-1", (self.dir / "snapshot.json").read_text())
+        with mock.patch.dict(os.environ, {"MISTRAL_API_KEY": "key-2"}):
+            self.assertIsNone(self.snapshot().selection("mistral"))
+
+        snapshot = self.snapshot()
+        snapshot.forget_selection("mistral")
+        self.assertEqual(self.snapshot().describe()["selections"], {})
+
+    def test_settings_see_the_dotenv_values(self):
+        """KEYNOTEGENIE_* variables from .env reach the settings, whichever module is imported first"""
+        self.dotenv.write_text("KEYNOTEGENIE_WRITING_MODE=sectioned\n")
+        env = {k: v for k, v in os.environ.items() if not k.startswith("KEYNOTEGENIE_")}
+        env.update(PYTHONPATH=str(ROOT_DIR), KEYNOTEGENIE_CACHE_DIR=str(self.dir / "cache"))
+        for first in ("src.config.settings", "src.config.snapshot"):
+            with self.subTest(first=first):
+                code = f"import {first}; from src.config.settings import WRITING_MODE; print(WRITING_MODE)"
+                result = subprocess.run([sys.executable, "-c", code], cwd=self.dir, env=env, capture_output=True,
+                                        text=True, timeout=60)
+                self.assertEqual(result.stdout.strip(), "sectioned", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
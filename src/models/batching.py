@@ -0,0 +1,143 @@
+"""
+Micro-batching of concurrent requests to a backend that serves many in one call.
+
+Every agent sends its prompts one at a time, but a local model generates a batch
+of prompts in little more time than a single one: decoding is bound by reading
+the weights, once per token whatever the batch size. A ``MicroBatcher`` sits
+between the callers and such a backend. It collects requests until
+``max_batch`` of them are waiting or the first has waited ``max_wait``
+seconds. It then dispatches them as one call and routes each result back to its
+caller's future.
+
+While a batch is running, new requests queue up and go out together as soon as
+the backend is free, so batches grow with the load on their own. ``max_wait``
+only matters when the backend is idle, where it trades a few milliseconds of
+latency for fuller batches. Requests that cannot share a call, such as those
+with different generation settings, are batched separately by key.
+"""
+
+import collections
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Batch:
+    """Requests collected for one key, and when the oldest of them stops waiting."""
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.items: List[Any] = []
+        self.futures: List[Future] = []
+
+
+class MicroBatcher:
+    """Collects concurrent requests into batches for ``handler``, which runs on a worker thread."""
+
+    def __init__(self, handler: Callable[[List[Any]], List[Any]], max_batch: int = 8, max_wait: float = 0.005,
+                 name: str = "micro-batcher"):
+        self.handler = handler
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait)
+        self._cond = threading.Condition()
+        self._pending: Dict[Hashable, _Batch] = {}
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._batch_sizes: "collections.Counter[int]" = collections.Counter()
+        self._busy_s = 0.0
+        self._worker = threading.Thread(target=self._run, daemon=True, name=name)
+        self._worker.start()
+
+    def submit(self, item: Any, key: Hashable = None) -> Future:
+        """Queue a request; the future resolves to the handler's result for it."""
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _Batch(time.monotonic() + self.max_wait)
+            batch.items.append(item)
+            batch.futures.append(future)
+            self._cond.notify()
+        return future
+
+    def call(self, item: Any, key: Hashable = None, timeout: Optional[float] = None) -> Any:
+        """Submit a request and wait for its result."""
+        return self.submit(item, key).result(timeout)
+
+    def close(self) -> None:
+        """Dispatch the requests already queued, then stop the worker."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._worker.join()
+
+    def _next_batch(self) -> Optional[_Batch]:
+        """Wait for a batch that is full or done waiting; None once closed and drained."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                earliest = None
+                # Keys are checked oldest first, so a busy key cannot starve the others
+                for key, batch in self._pending.items():
+                    if self._closed or len(batch.items) >= self.max_batch or batch.deadline <= now:
+                        del self._pending[key]
+                        if len(batch.items) > self.max_batch:
+                            # The overflow has waited as long, so it goes out next without a new wait
+                            rest = self._pending[key] = _Batch(batch.deadline)
+                            rest.items, rest.futures = batch.items[self.max_batch:], batch.futures[self.max_batch:]
+                            batch.items, batch.futures = batch.items[:self.max_batch], batch.futures[:self.max_batch]
+                        return batch
+                    earliest = batch.deadline if earliest is None else min(earliest, batch.deadline)
+                if self._closed:
+                    return None
+                self._cond.wait(None if earliest is None else earliest - now)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            # Requests whose callers gave up are dropped from the batch
+            live = [(item, future) for item, future in zip(batch.items, batch.futures)
+                    if future.set_running_or_notify_cancel()]
+            if live:
+                self._dispatch([item for item, _ in live], [future for _, future in live])
+
+    def _dispatch(self, items: List[Any], futures: List[Future]) -> None:
+        start = time.perf_counter()
+        try:
+            results = self.handler(items)
+            if len(results) != len(items):
+                raise ValueError(f"Batch handler returned {len(results)} results for {len(items)} requests")
+        except Exception as e:
+            logger.warning(f"Batch of {len(items)} requests failed: {e}")
+            for future in futures:
+                future.set_exception(e)
+        else:
+            for future, result in zip(futures, results):
+                future.set_result(result)
+        with self._stats_lock:
+            self._batch_sizes[len(items)] += 1
+            self._busy_s += time.perf_counter() - start
+
+    def stats(self) -> Dict[str, Any]:
+        """Batches dispatched, requests served, batch size distribution and time spent in the handler."""
+        with self._stats_lock:
+            sizes = dict(self._batch_sizes)
+            busy_s = self._busy_s
+        batches = sum(sizes.values())
+        requests = sum(size * count for size, count in sizes.items())
+        return {
+            "batches": batches,
+            "requests": requests,
+            "mean_batch_size": round(requests / batches, 2) if batches else 0.0,
+            "max_batch_size": max(sizes, default=0),
+            "batch_sizes": {size: sizes[size] for size in sorted(sizes)},
+            "busy_s": round(busy_s, 3),
+        }
@@ -0,0 +1,278 @@
+"""
+Offline, deterministic stand-in for an OpenAI-compatible chat completions API.
+
+Used to drive the full pipeline (logging, CrewAI orchestration, file I/O, UI) for
+load and benchmark testing without Mistral, OpenRouter or OpenAI. Responses are
+derived from a hash of the prompt, so the same input always yields the same text.
+
+Latency and error behaviour are configurable through environment variables:
+- FAKE_LLM_LATENCY_MS: mean response latency (default 0)
+- FAKE_LLM_JITTER_MS: uniform +/- jitter around the mean (default 0)
+- FAKE_LLM_SLOW_RATE: probability of a slow response, to emulate tail latency (default 0)
+- FAKE_LLM_SLOW_MS: extra latency of a slow response (default 0)
+- FAKE_LLM_ERROR_RATE: probability of an HTTP 500/429 error (default 0)
+- FAKE_LLM_SEED: seed for the latency/error random generator (default 0)
+- FAKE_LLM_RESPONSE_WORDS: length of generated answers (default 200)
+- FAKE_LLM_URL: use an already running server instead of starting one in-process
+
+Run a standalone server with: python -m src.models.config.fake --port 8765
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Model name reported by the stub server; litellm routes "openai/..." to OPENAI_API_BASE
+FAKE_MODEL_ID = "keynotegenie-fake"
+
+# Both tiers are served by the same stub; distinct names keep their statistics apart
+TIER_MODELS = {
+    "fast": f"openai/{FAKE_MODEL_ID}-fast",
+    "large": f"openai/{FAKE_MODEL_ID}",
+}
+
+WORDS = (
+    "innovation adoption market enterprise model research breakthrough efficiency "
+    "automation insight customer platform strategy growth data scale impact trust "
+    "productivity pipeline partnership capability investment regulation talent "
+    "infrastructure analytics outcome opportunity risk deployment ecosystem"
+).split()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class FakeLLMConfig:
+    """Latency and error distribution for the stub server."""
+
+    def __init__(self, latency_ms: Optional[float] = None, jitter_ms: Optional[float] = None,
+                 error_rate: Optional[float] = None, seed: Optional[int] = None,
+                 response_words: Optional[int] = None, slow_rate: Optional[float] = None,
+                 slow_ms: Optional[float] = None):
+        self.latency_ms = latency_ms if latency_ms is not None else _env_float("FAKE_LLM_LATENCY_MS", 0)
+        self.jitter_ms = jitter_ms if jitter_ms is not None else _env_float("FAKE_LLM_JITTER_MS", 0)
+        self.error_rate = error_rate if error_rate is not None else _env_float("FAKE_LLM_ERROR_RATE", 0)
+        self.slow_rate = slow_rate if slow_rate is not None else _env_float("FAKE_LLM_SLOW_RATE", 0)
+        self.slow_ms = slow_ms if slow_ms is not None else _env_float("FAKE_LLM_SLOW_MS", 0)
+        self.response_words = response_words or int(_env_float("FAKE_LLM_RESPONSE_WORDS", 200))
+        self._random = random.Random(seed if seed is not None else int(_env_float("FAKE_LLM_SEED", 0)))
+        self._lock = threading.Lock()
+
+    def sample(self) -> Tuple[float, Optional[int]]:
+        """Return (delay in seconds, HTTP error status or None) for one request."""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+            if self.slow_rate and self._random.random() < self.slow_rate:
+                jitter += self.slow_ms
+            error_status = self._random.choice((429, 500)) if self._random.random() < self.error_rate else None
+        return max(0.0, self.latency_ms + jitter) / 1000, error_status
+
+
+def deterministic_text(seed_text: str, words: int) -> str:
+    """Generate stable pseudo-prose from a seed string."""
+    digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+    rng = random.Random(digest)
+    sentences = []
+    remaining = words
+    while remaining > 0:
+        length = min(remaining, rng.randint(8, 16))
+        sentence = " ".join(rng.choice(WORDS) for _ in range(length))
+        sentences.append(f"- {sentence.capitalize()}.")
+        remaining -= length
+    return "\n".join(sentences)
+
+
+def build_reply(messages: List[Dict[str, str]], response_words: int) -> str:
+    """
+    Produce a CrewAI-compatible ReAct reply.
+
+    If the prompt offers tools and no tool has been used yet, the reply calls the
+    first tool once so the search path is exercised; otherwise it gives a final answer.
+    """
+    prompt = "\n".join(str(m.get("content", "")) for m in messages)
+    # The system prompt's format instructions mention "Observation:" too, so only
+    # look for tool results in the conversation itself
+    conversation = "\n".join(str(m.get("content", "")) for m in messages if m.get("role") != "system")
+    tool_match = re.search(r"Tool Name: (.+)", prompt)
+    if tool_match and "Observation:" not in conversation:
+        task_match = re.search(r"Current Task: (.+)", prompt)
+        query = task_match.group(1).strip() if task_match else "latest research"
+        return (
+            "Thought: I should search for recent information first.\n"
+            f"Action: {tool_match.group(1).strip()}\n"
+            f"Action Input: {json.dumps({'search_query': query[:120]})}"
+        )
+    answer = deterministic_text(prompt, response_words)
+    return f"Thought: I now can give a great answer\nFinal Answer: {answer}"
+
+
+class _FakeLLMHandler(BaseHTTPRequestHandler):
+    server_version = "KeynoteGenieFakeLLM/1.0"
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output quiet
+
+    def _send_json(self, status: int, payload: Dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": FAKE_MODEL_ID, "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "Invalid JSON"}})
+            return
+
+        config: FakeLLMConfig = self.server.config
+        delay, error_status = config.sample()
+        if delay:
+            time.sleep(delay)
+        if error_status:
+            self._send_json(error_status, {"error": {"message": "Injected fake error", "type": "server_error"}})
+            return
+
+        messages = request.get("messages", [])
+        content = build_reply(messages, config.response_words)
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+        completion_tokens = len(content) // 4
+        created = int(time.time())
+        completion_id = "chatcmpl-" + hashlib.sha1(content.encode("utf-8")).hexdigest()[:12]
+        model = request.get("model", FAKE_MODEL_ID)
+
+        if request.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                     "choices": [{"index": 0, "delta": {"role": "assistant", "content": content}, "finish_reason": None}]}
+            done = dict(chunk, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            for event in (chunk, done):
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            return
+
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        })
+
+
+class FakeLLMServer:
+    """In-process OpenAI-compatible HTTP server running on a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[FakeLLMConfig] = None):
+        self.httpd = ThreadingHTTPServer((host, port), _FakeLLMHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.config = config or FakeLLMConfig()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True, name="fake-llm-server")
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+_server: Optional[FakeLLMServer] = None
+_server_lock = threading.Lock()
+
+
+def ensure_fake_llm_server() -> str:
+    """Start the in-process stub (unless FAKE_LLM_URL points elsewhere) and return its base URL."""
+    global _server
+    base_url = os.getenv("FAKE_LLM_URL")
+    if not base_url:
+        with _server_lock:
+            if _server is None:
+                _server = FakeLLMServer().start()
+            base_url = _server.base_url
+
+    # Route litellm's OpenAI provider to the stub
+    os.environ["OPENAI_API_BASE"] = base_url
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+    return base_url
+
+
+def test_fake_connection():
+    """Checks that the stub server answers a chat completion request."""
+    import requests
+
+    try:
+        base_url = ensure_fake_llm_server()
+        response = requests.post(
+            f"{base_url}/chat/completions",
+            json={"model": FAKE_MODEL_ID, "messages": [{"role": "user", "content": "Hello, fake!"}]},
+            timeout=10,
+        )
+        if response.status_code == 200:
+            print("Fake LLM server is working!")
+            return True
+        print(f"Error from fake LLM server: {response.status_code} - {response.text}")
+        return False
+    except Exception as e:
+        print(f"Error reaching fake LLM server: {e}")
+        return False
+
+
+def get_fake_model():
+    """Returns the litellm model name for the stub server and its base URL."""
+    base_url = ensure_fake_llm_server()
+    return f"openai/{FAKE_MODEL_ID}", base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the fake OpenAI-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(args.host, args.port)
+    print(f"Fake LLM server listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
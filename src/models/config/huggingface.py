@@ -1,9 +1,5 @@
 import os
 import requests
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # List of recommended open-source models
 RECOMMENDED_MODELS = {
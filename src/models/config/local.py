@@ -0,0 +1,258 @@
+"""
+In-process CPU inference with small Hugging Face models.
+
+Serves the small models of ``huggingface.RECOMMENDED_MODELS`` (TinyLlama,
+flan-t5, distilgpt2, ...) without any network round trip, for offline hosts and
+cheap subtasks. The models are exposed to litellm as a custom provider, so
+CrewAI agents, model tiers and hedging use them like any other provider through
+model names such as ``local-hf/google/flan-t5-base`` or ``local-hf/flan-t5-base``.
+
+- Each model is loaded once per process and shared by every agent and thread.
+  Checkpoints in safetensors format are memory-mapped while loading, so the
+  weights go straight into the model without a second copy in memory, and the
+  files stay in the Hugging Face cache for the next process.
+- Concurrent requests to the same model are micro-batched (see
+  ``src.models.batching``). Up to ``LOCAL_LLM_MAX_BATCH`` prompts, collected for
+  at most ``LOCAL_LLM_BATCH_WAIT_MS``, are generated together in one forward
+  pass per token.
+- Usage is reported in tokens like a remote provider, at zero cost.
+
+Requires the optional packages transformers, torch and safetensors:
+``pip install transformers torch safetensors``.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.config.settings import (
+    LOCAL_LLM_BATCH_WAIT_MS,
+    LOCAL_LLM_FAST_MODEL,
+    LOCAL_LLM_MAX_BATCH,
+    LOCAL_LLM_MAX_NEW_TOKENS,
+    LOCAL_LLM_MODEL,
+    LOCAL_LLM_THREADS,
+)
+from src.models.config.huggingface import RECOMMENDED_MODELS
+
+# litellm provider name; models are addressed as "local-hf/<model id or shorthand>"
+PROVIDER = "local-hf"
+
+# Context size assumed when neither the tokenizer nor the model config declares one
+DEFAULT_CONTEXT_TOKENS = 2048
+
+# (text, prompt tokens, completion tokens)
+Generation = Tuple[str, int, int]
+
+
+def resolve_model_id(name: str) -> str:
+    """Hugging Face model ID for a shorthand from RECOMMENDED_MODELS or a model ID."""
+    return RECOMMENDED_MODELS.get(name, name)
+
+
+def model_name(name: str) -> str:
+    """litellm model name for a local model."""
+    return f"{PROVIDER}/{resolve_model_id(name)}"
+
+
+def is_local_model(model: Optional[str]) -> bool:
+    return bool(model) and model.startswith(f"{PROVIDER}/")
+
+
+# The large tier is the selected local model; cheap subtasks get the smaller one
+TIER_MODELS = {
+    "fast": model_name(LOCAL_LLM_FAST_MODEL),
+    "large": model_name(LOCAL_LLM_MODEL),
+}
+
+
+class TransformersBackend:
+    """Tokenizer and weights of one Hugging Face model, generating on CPU."""
+
+    def __init__(self, model_id: str, threads: int = LOCAL_LLM_THREADS):
+        try:
+            import torch
+            from transformers import AutoConfig, AutoModelForCausalLM, AutoModelForSeq2SeqLM, AutoTokenizer
+        except ImportError as e:
+            raise RuntimeError(
+                "The local provider requires transformers, torch and safetensors "
+                "(pip install transformers torch safetensors)"
+            ) from e
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.torch = torch
+        config = AutoConfig.from_pretrained(model_id)
+        # flan-t5 and friends are encoder-decoder models; the rest continue the prompt
+        self.seq2seq = bool(getattr(config, "is_encoder_decoder", False))
+        self.tokenizer = AutoTokenizer.from_pretrained(model_id)
+        # Keep the end of over-long prompts, where the task instructions are
+        self.tokenizer.truncation_side = "left"
+        if not self.seq2seq:
+            self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        model_class = AutoModelForSeq2SeqLM if self.seq2seq else AutoModelForCausalLM
+        self.model = model_class.from_pretrained(model_id, low_cpu_mem_usage=True, torch_dtype=torch.float32)
+        self.model.eval()
+
+        limits = [getattr(config, name, None) for name in ("max_position_embeddings", "n_positions")]
+        limits.append(self.tokenizer.model_max_length if self.tokenizer.model_max_length < 10 ** 6 else None)
+        self.context_tokens = min([limit for limit in limits if limit] or [DEFAULT_CONTEXT_TOKENS])
+
+    def format_prompt(self, messages: Sequence[Dict[str, Any]]) -> str:
+        """Render chat messages with the model's chat template, or as plain text if it has none."""
+        messages = [{"role": m.get("role", "user"), "content": str(m.get("content") or "")} for m in messages]
+        if getattr(self.tokenizer, "chat_template", None):
+            return self.tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+        text = "\n\n".join(m["content"] for m in messages)
+        return text if self.seq2seq else f"{text}\n\n"
+
+    def generate(self, prompts: List[str], max_new_tokens: int, temperature: float) -> List[Generation]:
+        """Generate completions for a batch of prompts in one pass."""
+        max_input = self.context_tokens if self.seq2seq else max(1, self.context_tokens - max_new_tokens)
+        inputs = self.tokenizer(prompts, return_tensors="pt", padding=True, truncation=True, max_length=max_input)
+        sampling = {"do_sample": True, "temperature": temperature} if temperature > 0 else {"do_sample": False}
+        with self.torch.inference_mode():
+            output = self.model.generate(**inputs, max_new_tokens=max_new_tokens,
+                                         pad_token_id=self.tokenizer.pad_token_id, **sampling)
+        if not self.seq2seq:
+            # Causal models return the prompt followed by the completion
+            output = output[:, inputs["input_ids"].shape[1]:]
+        texts = self.tokenizer.batch_decode(output, skip_special_tokens=True)
+        prompt_tokens = inputs["attention_mask"].sum(dim=1).tolist()
+        completion_tokens = (output != self.tokenizer.pad_token_id).sum(dim=1).tolist()
+        return [(text.strip(), int(p), int(c)) for text, p, c in zip(texts, prompt_tokens, completion_tokens)]
+
+
+def truncate_at_stop(text: str, stop: Optional[Sequence[str]]) -> str:
+    """Cut generated text at the first stop sequence, as API providers do."""
+    cut = min((text.find(s) for s in stop or () if s and s in text), default=-1)
+    return text[:cut] if cut >= 0 else text
+
+
+class LocalModel:
+    """A loaded model whose concurrent requests are generated in micro-batches."""
+
+    def __init__(self, model_id: str, backend: Any = None, max_batch: int = LOCAL_LLM_MAX_BATCH,
+                 max_wait: float = LOCAL_LLM_BATCH_WAIT_MS / 1000):
+        from src.models.batching import MicroBatcher
+
+        self.model_id = model_id
+        self.backend = backend if backend is not None else TransformersBackend(model_id)
+        self.batcher = MicroBatcher(self._generate, max_batch=max_batch, max_wait=max_wait,
+                                    name=f"local-llm-{model_id}")
+
+    def complete(self, messages: Sequence[Dict[str, Any]], max_tokens: Optional[int] = None,
+                 temperature: Optional[float] = None, stop: Optional[Sequence[str]] = None) -> Generation:
+        """Generate a reply to chat messages; blocks until the batch it joined is done."""
+        settings = (max_tokens or LOCAL_LLM_MAX_NEW_TOKENS, temperature or 0.0)
+        # Requests can only share a generate() call if they use the same settings
+        text, prompt_tokens, completion_tokens = self.batcher.call(
+            (self.backend.format_prompt(messages),) + settings, key=settings)
+        return truncate_at_stop(text, stop), prompt_tokens, completion_tokens
+
+    def _generate(self, requests: List[Tuple[str, int, float]]) -> List[Generation]:
+        _, max_new_tokens, temperature = requests[0]
+        return self.backend.generate([prompt for prompt, _, _ in requests], max_new_tokens, temperature)
+
+
+_models: Dict[str, LocalModel] = {}
+_models_lock = threading.Lock()
+
+
+def load_local_model(name: str, backend: Any = None, max_batch: int = LOCAL_LLM_MAX_BATCH,
+                     max_wait: float = LOCAL_LLM_BATCH_WAIT_MS / 1000) -> LocalModel:
+    """The process-wide instance of a local model, loading it on first use."""
+    model_id = resolve_model_id(name)
+    with _models_lock:
+        if model_id not in _models:
+            _models[model_id] = LocalModel(model_id, backend=backend, max_batch=max_batch, max_wait=max_wait)
+        return _models[model_id]
+
+
+_handler = None
+_handler_lock = threading.Lock()
+
+
+def register_local_provider() -> None:
+    """Register the local provider with litellm (idempotent)."""
+    global _handler
+    with _handler_lock:
+        if _handler is None:
+            _handler = _build_handler()
+
+
+def _build_handler() -> Any:
+    import litellm
+    from litellm import CustomLLM
+
+    class LocalHFHandler(CustomLLM):
+        """litellm custom provider generating with in-process models."""
+
+        def _generate(self, model: str, messages: list, optional_params: Optional[dict]) -> Generation:
+            params = optional_params or {}
+            stop = params.get("stop")
+            return load_local_model(model).complete(
+                messages, max_tokens=params.get("max_tokens"), temperature=params.get("temperature"),
+                stop=[stop] if isinstance(stop, str) else stop,
+            )
+
+        def completion(self, model: str, messages: list, *args, optional_params=None, model_response=None,
+                       **kwargs):
+            text, prompt_tokens, completion_tokens = self._generate(model, messages, optional_params)
+            response = model_response if model_response is not None else litellm.ModelResponse()
+            response.model = f"{PROVIDER}/{model}"
+            response.choices[0].message.content = text
+            response.choices[0].finish_reason = "stop"
+            response.usage = litellm.Usage(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                           total_tokens=prompt_tokens + completion_tokens)
+            return response
+
+        async def acompletion(self, model: str, messages: list, *args, **kwargs):
+            return await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self.completion(model, messages, *args, **kwargs))
+
+        def _chunk(self, generation: Generation) -> Dict[str, Any]:
+            text, prompt_tokens, completion_tokens = generation
+            return {"text": text, "is_finished": True, "finish_reason": "stop", "index": 0, "tool_use": None,
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                              "total_tokens": prompt_tokens + completion_tokens}}
+
+        # Generation is not incremental, so a streamed reply arrives as a single chunk
+        def streaming(self, model: str, messages: list, *args, optional_params=None, **kwargs) -> Iterator[dict]:
+            yield self._chunk(self._generate(model, messages, optional_params))
+
+        async def astreaming(self, model: str, messages: list, *args, optional_params=None, **kwargs):
+            generation = await asyncio.get_running_loop().run_in_executor(
+                None, self._generate, model, messages, optional_params)
+            yield self._chunk(generation)
+
+    handler = LocalHFHandler()
+    litellm.custom_provider_map = [
+        entry for entry in litellm.custom_provider_map if entry.get("provider") != PROVIDER
+    ] + [{"provider": PROVIDER, "custom_handler": handler}]
+    # Adds the provider to litellm's provider list, which model name parsing relies on
+    litellm.utils.custom_llm_setup()
+    return handler
+
+
+def test_local_connection():
+    """Loads the selected local model and checks that it generates text."""
+    try:
+        model_id = resolve_model_id(LOCAL_LLM_MODEL)
+        print(f"Loading local model {model_id}...")
+        text, _, completion_tokens = load_local_model(model_id).complete(
+            [{"role": "user", "content": "Say hello."}], max_tokens=8)
+        print(f"Local model is working! Response: {text}")
+        return completion_tokens > 0
+    except Exception as e:
+        print(f"Error loading local model: {e}")
+        return False
+
+
+def get_local_model():
+    """Returns the litellm model name of the selected local model, registering the provider."""
+    register_local_provider()
+    return model_name(LOCAL_LLM_MODEL), None
@@ -1,9 +1,10 @@
 import os
-from dotenv import load_dotenv
-import litellm
 
-# Load environment variables
-load_dotenv()
+# Models for each tier: "fast" for cheap subtasks, "large" for the writing
+TIER_MODELS = {
+    "fast": "mistral/mistral-small-latest",
+    "large": "mistral/mistral-large-latest",
+}
 
 def test_mistral_connection():
     """Tests the Mistral API connection and returns the result."""
@@ -12,8 +13,10 @@ def test_mistral_connection():
         print("MISTRAL_API_KEY is missing.")
         return False
 
-    # Initialize litellm for testing
+    # Initialize litellm for testing (imported here as it is slow to load)
     try:
+        import litellm
+
         print("Testing Mistral API connection...")
         response = litellm.completion(
             model="mistral/mistral-large-latest",
@@ -37,6 +40,6 @@ def get_mistral_model():
         
     # Configure litellm to use Mistral
     # Actual model name to use
-    model_name = "mistral/mistral-large-latest"
+    model_name = TIER_MODELS["large"]
     
     return model_name, None
\ No newline at end of file
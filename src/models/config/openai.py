@@ -1,14 +1,11 @@
 import os
 import requests
 import json
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # OpenAI model options
 RECOMMENDED_MODELS = {
     "gpt-3.5-turbo": "gpt-3.5-turbo",           # Good balance of capability and cost
+    "gpt-4o-mini": "gpt-4o-mini",               # Small, fast and cheap
     "gpt-3.5-turbo-16k": "gpt-3.5-turbo-16k",   # Extended context version
     "gpt-4": "gpt-4",                           # Most capable model
     "gpt-4-turbo": "gpt-4-turbo-preview",       # Newest version of GPT-4
@@ -19,6 +16,11 @@ RECOMMENDED_MODELS = {
 # Default model if none specified
 DEFAULT_MODEL = "gpt-3.5-turbo"
 
+# Smaller model for cheap subtasks (litellm name); the large tier is the selected model
+TIER_MODELS = {
+    "fast": f"openai/{RECOMMENDED_MODELS['gpt-4o-mini']}",
+}
+
 def get_model_id():
     """
     Get the OpenAI model ID from environment variables or use default.
@@ -1,22 +1,27 @@
 import os
 import requests
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # OpenRouter model options
 RECOMMENDED_MODELS = {
     "dolphin3.0-r1": "cognitivecomputations/dolphin3.0-r1-mistral-24b:free",
     "deepseek-r1": "deepseek/deepseek-r1:free",
     "qwen2.5-coder": "qwen/qwen-2.5-coder-32b-instruct:free",
-    "gemini-2.0":"google/gemini-2.0-pro-exp-02-05:free"
+    "gemini-2.0":"google/gemini-2.0-pro-exp-02-05:free",
+    "mistral-7b": "mistralai/mistral-7b-instruct:free"
     # Add more free models here as needed
 }
 
 # Default model if none specified
 DEFAULT_MODEL = "cognitivecomputations/dolphin3.0-r1-mistral-24b:free"
 
+# litellm routes a model to OpenRouter only when its name carries this prefix
+LITELLM_PREFIX = "openrouter/"
+
+# Smaller model for cheap subtasks; the large tier is the selected model
+TIER_MODELS = {
+    "fast": LITELLM_PREFIX + RECOMMENDED_MODELS["mistral-7b"],
+}
+
 def get_model_id():
     """
     Get the OpenRouter model ID from environment variables or use default.
@@ -95,8 +100,8 @@ def get_openrouter_model():
     # Get the model ID to use
     model_id = get_model_id()
     
-    # For litellm, we don't need the openrouter/ prefix
-    litellm_model = model_id
+    # For litellm, prefix the model ID so it is sent to OpenRouter; the API itself takes the bare ID
+    litellm_model = LITELLM_PREFIX + model_id
     
     return litellm_model, model_id
 
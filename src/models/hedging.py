@@ -0,0 +1,187 @@
+"""
+Hedged completions: race a second provider against a slow primary.
+
+A hedged call sends the prompt to the primary model. If no answer has arrived
+after the hedge delay, the same prompt also goes to a secondary provider's
+model. Whichever response completes first is returned and the other request is
+cancelled, which closes its connection so the provider stops generating.
+
+The delay is either fixed or, by default, the recent p90 latency of the
+primary model. Only the slowest ~10% of calls are duplicated, and those are the
+calls that dominate tail latency. Both requests stream, so a cancelled one
+stops mid-generation instead of running to the end.
+"""
+
+import asyncio
+import collections
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.settings import (
+    HEDGE_DELAY_SECONDS,
+    HEDGE_INITIAL_DELAY_SECONDS,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_MODEL,
+    HEDGE_PERCENTILE,
+)
+from src.models.config import fake, mistral, openai
+
+logger = logging.getLogger(__name__)
+
+# Latencies kept per model for the adaptive delay
+LATENCY_WINDOW = 200
+
+# Secondary providers in order of preference: (provider, required API key, model)
+SECONDARY_PROVIDERS = (
+    ("openai", "OPENAI_API_KEY", f"openai/{openai.DEFAULT_MODEL}"),
+    ("mistral", "MISTRAL_API_KEY", mistral.TIER_MODELS["large"]),
+)
+
+PRIMARY = "primary"
+SECONDARY = "secondary"
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies per model."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._window = window
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, "collections.deque[float]"] = {}
+
+    def record(self, model: str, latency_s: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(model, collections.deque(maxlen=self._window)).append(latency_s)
+
+    def count(self, model: str) -> int:
+        with self._lock:
+            return len(self._latencies.get(model, ()))
+
+    def percentile(self, model: str, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of the recorded latencies, or None without samples."""
+        with self._lock:
+            values = sorted(self._latencies.get(model, ()))
+        if not values:
+            return None
+        return values[min(len(values), max(1, math.ceil(len(values) * pct / 100))) - 1]
+
+
+# Shared by every LLM in the process, so all agents using a model learn its latency together
+latencies = LatencyTracker()
+
+
+def hedge_delay(model: str, tracker: LatencyTracker = latencies) -> float:
+    """Seconds to wait for the primary before sending the secondary request."""
+    if HEDGE_DELAY_SECONDS is not None:
+        return HEDGE_DELAY_SECONDS
+    if tracker.count(model) < HEDGE_MIN_SAMPLES:
+        return HEDGE_INITIAL_DELAY_SECONDS
+    return tracker.percentile(model, HEDGE_PERCENTILE)
+
+
+def resolve_hedge_model(primary_model: str) -> Optional[str]:
+    """Secondary model for a primary: the configured one, or another provider with an API key."""
+    if HEDGE_MODEL:
+        return HEDGE_MODEL
+    if primary_model in fake.TIER_MODELS.values():
+        # Offline runs hedge against the stub itself, which draws an independent latency
+        return primary_model
+    from src.models.tiers import provider_for_model
+
+    primary_provider = provider_for_model(primary_model)
+    for provider, key, model in SECONDARY_PROVIDERS:
+        if provider != primary_provider and os.getenv(key):
+            return model
+    return None
+
+
+@dataclass
+class HedgeResult:
+    text: str
+    usage: Any
+    winner: str
+    hedged: bool
+    model: str
+
+
+async def _stream_completion(params: Dict[str, Any]) -> Tuple[str, Any]:
+    """Stream one completion and return its text and token usage."""
+    import litellm
+
+    response = await litellm.acompletion(**dict(params, stream=True, stream_options={"include_usage": True}))
+    parts: List[str] = []
+    usage = None
+    async for chunk in response:
+        choices = getattr(chunk, "choices", None)
+        if choices and getattr(choices[0], "delta", None) is not None:
+            parts.append(choices[0].delta.content or "")
+        usage = getattr(chunk, "usage", None) or usage
+    text = "".join(parts)
+    if not text:
+        raise ValueError("Empty response")
+    return text, usage
+
+
+async def _race(primary: Dict[str, Any], secondary: Dict[str, Any], delay: float) -> HedgeResult:
+    tasks = {asyncio.ensure_future(_stream_completion(primary)): PRIMARY}
+    done, _ = await asyncio.wait(tasks, timeout=delay)
+    # A primary that fails early is hedged at once rather than after the delay
+    if not done or next(iter(done)).exception() is not None:
+        tasks[asyncio.ensure_future(_stream_completion(secondary))] = SECONDARY
+
+    pending = set(tasks)
+    errors: List[BaseException] = []
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    errors.append(task.exception())
+                    continue
+                text, usage = task.result()
+                winner = tasks[task]
+                params = primary if winner == PRIMARY else secondary
+                return HedgeResult(text, usage, winner, len(tasks) > 1, params["model"])
+        raise errors[0]
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def hedged_completion(primary: Dict[str, Any], secondary: Dict[str, Any], delay: float) -> HedgeResult:
+    """Run a hedged completion from synchronous code; raises if both requests fail."""
+    start = time.perf_counter()
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        result = asyncio.run(_race(primary, secondary, delay))
+    else:
+        # Called from inside an event loop; race on a loop of our own in a helper thread
+        outcome: Dict[str, Any] = {}
+
+        def race_in_thread():
+            try:
+                outcome["result"] = asyncio.run(_race(primary, secondary, delay))
+            except BaseException as e:
+                outcome["error"] = e
+
+        worker = threading.Thread(target=race_in_thread)
+        worker.start()
+        worker.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        result = outcome["result"]
+    elapsed = time.perf_counter() - start
+    # When the secondary won, the primary's own latency is unknown but at least this
+    # long; recording the lower bound keeps the slow calls in the adaptive window
+    latencies.record(primary["model"], elapsed)
+    if result.hedged:
+        logger.info(f"Hedged call after {delay:.2f}s; {result.winner} ({result.model}) won in {elapsed:.2f}s")
+    return result
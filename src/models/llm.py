@@ -1,5 +1,3 @@
-import os
-from dotenv import load_dotenv
 import logging
 
 # Configure basic logging
@@ -10,17 +8,17 @@ logger = logging.getLogger(__name__)
 from src.models.config.mistral import get_mistral_model, test_mistral_connection
 from src.models.config.openrouterai import get_openrouter_model, test_openrouter_connection
 from src.models.config.openai import get_openai_model, test_openai_connection
-
-# Load environment variables
-load_dotenv()
+from src.models.config.fake import get_fake_model, test_fake_connection
+from src.models.config.local import get_local_model, test_local_connection
+from src.config.settings import LOCAL_LLM_FALLBACK
 
 def get_model(model_type="mistral", test=False):
     """
     Returns the configured LLM model based on user selection with fallback logic:
-    Mistral -> OpenRouter -> OpenAI
+    Mistral -> OpenRouter -> OpenAI (-> local model, if KEYNOTEGENIE_LOCAL_FALLBACK=1)
     
     Parameters:
-    - model_type: Type of model to use (mistral, openai, openrouter)
+    - model_type: Type of model to use (mistral, openai, openrouter, local, or fake for offline testing)
     - test: If True, run a connection test before returning the model
     
     Returns:
@@ -70,13 +68,41 @@ def get_model(model_type="mistral", test=False):
                     logger.info("LLM: OpenAI connection test passed")
                 else:
                     logger.error("LLM: All API connection tests failed.")
-                    return None, None
+                    return _local_fallback(test)
             return get_openai_model()
         except Exception as e:
             logger.error(f"LLM: Error initializing OpenAI: {str(e)}")
             logger.error("LLM: All fallback options failed.")
+            return _local_fallback(test)
+    
+    # In-process Hugging Face model on CPU; needs no network once the weights are cached
+    if model_type == "local":
+        logger.info("LLM: Attempting to use a local Hugging Face model")
+        try:
+            if test and not test_local_connection():
+                logger.error("LLM: Local model test failed.")
+                return None, None
+            return get_local_model()
+        except Exception as e:
+            logger.error(f"LLM: Error initializing local model: {str(e)}")
             return None, None
     
+    # Offline stand-in for load and benchmark testing; never falls back to real providers
+    if model_type == "fake":
+        logger.info("LLM: Using offline fake LLM server")
+        if test and not test_fake_connection():
+            logger.error("LLM: Fake LLM server connection test failed.")
+            return None, None
+        return get_fake_model()
+    
     # Unknown model type
     logger.error(f"LLM: Unknown model type: {model_type}")
-    return None, None
\ No newline at end of file
+    return None, None
+
+
+def _local_fallback(test=False):
+    """Last resort once every API provider failed: the local model, if enabled."""
+    if not LOCAL_LLM_FALLBACK:
+        return None, None
+    logger.warning("LLM: Falling back to the local model...")
+    return get_model("local", test)
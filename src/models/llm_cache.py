@@ -0,0 +1,39 @@
+"""
+Disk cache of LLM completions shared by every process on the host.
+
+litellm looks up each completion in the cache before calling the provider.
+The disk backend is a SQLite database in WAL mode (via ``diskcache``), so
+several worker processes can read and write it at the same time. Identical
+prompts, for example the same research subtask for a repeated topic, are then
+answered without an API call.
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Union
+
+from src.config.settings import LLM_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+
+
+def enable_llm_cache(cache_dir: Union[str, Path] = LLM_CACHE_DIR) -> bool:
+    """Route litellm completions through the shared disk cache; returns whether it is active."""
+    with _lock:
+        import litellm
+
+        if litellm.cache is not None:
+            return True
+        try:
+            import diskcache  # noqa: F401  (litellm's disk backend)
+            from litellm.caching.caching import Cache
+        except ImportError:
+            logger.warning("LLM cache requested but the diskcache package is not installed")
+            return False
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        litellm.cache = Cache(type="disk", disk_cache_dir=str(cache_dir))
+        logger.info(f"Caching LLM completions in {cache_dir}")
+        return True
@@ -0,0 +1,77 @@
+import threading
+import time
+import unittest
+
+from src.models.batching import MicroBatcher
+
+
+class RecordingHandler:
+    """Batch handler that upper-cases items and records the batches it was given"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, items):
+        with self.lock:
+            self.batches.append(list(items))
+        time.sleep(self.delay)
+        if "boom" in items:
+            raise RuntimeError("backend failed")
+        return [item.upper() for item in items]
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_full_batches_go_out_without_waiting(self):
+        """A batch is dispatched once max_batch requests are waiting, before max_wait runs out"""
+        handler = RecordingHandler()
+        batcher = MicroBatcher(handler, max_batch=4, max_wait=5.0)
+        start = time.monotonic()
+        futures = [batcher.submit(f"p{i}") for i in range(8)]
+        self.assertEqual([f.result(timeout=2) for f in futures], [f"P{i}" for i in range(8)])
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual([len(b) for b in handler.batches], [4, 4])
+
+        # A lone request waits out max_wait for company, then goes alone; close() flushes the rest
+        lone = MicroBatcher(handler, max_batch=4, max_wait=0.05)
+        start = time.monotonic()
+        self.assertEqual(lone.call("solo", timeout=2), "SOLO")
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        pending = batcher.submit("late")
+        batcher.close()
+        self.assertEqual(pending.result(timeout=1), "LATE")
+        self.assertEqual(batcher.stats()["requests"], 9)
+        with self.assertRaises(RuntimeError):
+            batcher.submit("closed")
+
+    def test_requests_queue_up_behind_a_running_batch(self):
+        """Requests arriving while the handler runs are served together in the next batch"""
+        handler = RecordingHandler(delay=0.1)
+        batcher = MicroBatcher(handler, max_batch=16, max_wait=0)
+        first = batcher.submit("first")
+        time.sleep(0.03)
+        rest = [batcher.submit(f"q{i}") for i in range(6)]
+        self.assertEqual(first.result(timeout=2), "FIRST")
+        self.assertEqual([f.result(timeout=2) for f in rest], [f"Q{i}" for i in range(6)])
+        self.assertEqual([len(b) for b in handler.batches], [1, 6])
+        self.assertEqual(batcher.stats()["mean_batch_size"], 3.5)
+
+    def test_keys_errors_and_cancellation(self):
+        """Keys never share a batch, failures reach only their batch and cancelled requests are dropped"""
+        handler = RecordingHandler()
+        batcher = MicroBatcher(handler, max_batch=8, max_wait=0.05)
+        short, long = batcher.submit("a", key=64), batcher.submit("b", key=512)
+        failing = [batcher.submit("boom", key="bad"), batcher.submit("c", key="bad")]
+        cancelled = batcher.submit("skipped", key=64)
+        self.assertTrue(cancelled.cancel())
+
+        self.assertEqual((short.result(timeout=2), long.result(timeout=2)), ("A", "B"))
+        for future in failing:
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=2)
+        self.assertEqual(sorted(map(sorted, handler.batches)), [["a"], ["b"], ["boom", "c"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
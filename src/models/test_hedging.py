@@ -0,0 +1,71 @@
+import time
+import unittest
+
+from src.models.config.fake import FAKE_MODEL_ID, FakeLLMConfig, FakeLLMServer
+from src.models.hedging import PRIMARY, SECONDARY, LatencyTracker, hedged_completion
+from src.models.tiers import TierStats
+
+
+class TestHedging(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """A slow, a fast and a failing stand-in provider"""
+        cls.servers = {
+            "slow": FakeLLMServer(config=FakeLLMConfig(latency_ms=3000, response_words=20)).start(),
+            "fast": FakeLLMServer(config=FakeLLMConfig(latency_ms=50, response_words=20)).start(),
+            "broken": FakeLLMServer(config=FakeLLMConfig(error_rate=1.0)).start(),
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in cls.servers.values():
+            server.stop()
+
+    def params(self, server):
+        return {"model": f"openai/{FAKE_MODEL_ID}", "api_base": self.servers[server].base_url, "api_key": "fake-key",
+                "messages": [{"role": "user", "content": "Write a keynote opening"}], "num_retries": 0}
+
+    def test_fast_primary_is_not_hedged(self):
+        """A primary that answers within the delay never sends the secondary request"""
+        result = hedged_completion(self.params("fast"), self.params("slow"), delay=2.0)
+        self.assertEqual((result.winner, result.hedged), (PRIMARY, False))
+        self.assertTrue(result.text)
+        self.assertGreater(result.usage.completion_tokens, 0)
+
+    def test_slow_primary_loses_to_secondary(self):
+        """After the delay the secondary is raced and its answer returned without waiting for the primary"""
+        start = time.perf_counter()
+        result = hedged_completion(self.params("slow"), self.params("fast"), delay=0.2)
+        self.assertEqual((result.winner, result.hedged), (SECONDARY, True))
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+    def test_failed_primary_is_hedged_immediately(self):
+        """A primary error sends the secondary at once instead of after the delay"""
+        start = time.perf_counter()
+        result = hedged_completion(self.params("broken"), self.params("fast"), delay=10.0)
+        self.assertEqual(result.winner, SECONDARY)
+        self.assertLess(time.perf_counter() - start, 5.0)
+
+    def test_adaptive_delay_and_accounting(self):
+        """The tracker reports percentiles and the tier stats report the hedge rate"""
+        tracker = LatencyTracker()
+        for latency in range(1, 11):
+            tracker.record("model", float(latency))
+        self.assertEqual(tracker.percentile("model", 90), 9.0)
+        self.assertEqual(tracker.percentile("model", 50), 5.0)
+        self.assertEqual(tracker.percentile("model", 100), 10.0)
+        self.assertEqual(tracker.percentile("model", 0), 1.0)
+        self.assertIsNone(tracker.percentile("other", 90))
+
+        stats = TierStats()
+        stats.record("large", "openai/gpt-4", 1.0, 100, 50)
+        stats.record("large", "openai/gpt-4", 2.0, 100, 50, hedged=True)
+        stats.record("large", "openai/gpt-4", 2.5, 100, 50, hedged=True, hedge_model="mistral/mistral-large-latest")
+        summary = stats.as_dict()["large"]
+        self.assertEqual((summary["calls"], summary["hedged_calls"], summary["hedge_wins"]), (3, 2, 1))
+        self.assertEqual(summary["hedge_rate"], 0.667)
+        self.assertEqual(summary["prompt_tokens"], 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+
+from src.models.config.local import (
+    get_local_model,
+    load_local_model,
+    register_local_provider,
+    resolve_model_id,
+    truncate_at_stop,
+)
+from src.models.tiers import TierStats, build_llm, provider_for_model, resolve_tier_models
+
+
+class StubBackend:
+    """Stands in for a transformers model: echoes prompts, slowly enough for requests to queue up"""
+
+    def __init__(self, delay=0.05, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def format_prompt(self, messages):
+        return messages[-1]["content"]
+
+    def generate(self, prompts, max_new_tokens, temperature):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("out of memory")
+        return [(f"echo {prompt}\nObservation: ignored", len(prompt.split()), 3) for prompt in prompts]
+
+
+class TestLocalProvider(unittest.TestCase):
+    def test_concurrent_requests_are_batched(self):
+        """Requests arriving while a batch generates share the next generate() call"""
+        import litellm
+
+        backend = StubBackend()
+        model = load_local_model("stub-batched", backend=backend, max_batch=8)
+        register_local_provider()
+        replies = {}
+
+        def ask(i):
+            response = litellm.completion(model="local-hf/stub-batched", stop=["\nObservation:"],
+                                          messages=[{"role": "user", "content": f"topic {i}"}])
+            replies[i] = (response.choices[0].message.content, response.usage.prompt_tokens)
+
+        threads = [threading.Thread(target=ask, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(replies[5], ("echo topic 5", 2))
+        stats = model.batcher.stats()
+        self.assertEqual(stats["requests"], 8)
+        self.assertLess(backend.calls, 8)
+        self.assertGreater(stats["max_batch_size"], 1)
+
+    def test_errors_reach_every_caller_in_the_batch(self):
+        """A failed generation fails its requests without stopping the worker"""
+        model = load_local_model("stub-failing", backend=StubBackend(delay=0, fail=True))
+        with self.assertRaises(RuntimeError):
+            model.complete([{"role": "user", "content": "hello"}])
+        model.backend.fail = False
+        self.assertEqual(model.complete([{"role": "user", "content": "hello"}], stop=["\n"])[0], "echo hello")
+
+    def test_local_models_in_tiers(self):
+        """Local models map to the local provider, resolve shorthands and cost nothing"""
+        self.assertEqual(resolve_model_id("flan-t5-small"), "google/flan-t5-small")
+        self.assertEqual(truncate_at_stop("a STOP b", ["x", "STOP"]), "a ")
+        model_name, _ = get_local_model()
+        self.assertEqual(provider_for_model(model_name), "local")
+        models = resolve_tier_models(model_name, overrides={})
+        self.assertEqual(models["large"], model_name)
+        self.assertTrue(models["fast"].startswith("local-hf/"))
+
+        stats = TierStats()
+        stats.record("fast", models["fast"], 0.2, 120, 30)
+        self.assertEqual(stats.as_dict()["fast"]["cost_usd"], 0.0)
+
+    def test_tool_users_stay_off_the_fast_local_model(self):
+        """A researcher with a search tool runs on the large tier; tool-free subtasks keep the fast local model"""
+        stats = TierStats()
+        for large in (get_local_model()[0], "mistral/mistral-large-latest"):
+            models = {"fast": "local-hf/google/flan-t5-base", "large": large}
+            researcher = build_llm(models, "researcher", stats, uses_tools=True)
+            self.assertEqual((researcher.model, researcher.tier), (large, "large"))
+            self.assertEqual(build_llm(models, "researcher", stats).model, models["fast"])
+            self.assertEqual(build_llm(models, "outliner", stats).model, models["fast"])
+
+        # Fast API models can drive tools, so their tier is kept
+        api_models = {"fast": "mistral/mistral-small-latest", "large": "mistral/mistral-large-latest"}
+        self.assertEqual(build_llm(api_models, "researcher", stats, uses_tools=True).tier, "fast")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from src.models.config import fake, local, mistral, openai, openrouterai
+from src.models.tiers import PROVIDER_TIER_MODELS, TierStats, provider_for_model, resolve_tier_models
+
+
+class TestModelTiers(unittest.TestCase):
+    def test_fast_tier_comes_from_selected_provider(self):
+        """The large tier keeps the selected model; the fast tier is that provider's small model"""
+        models = resolve_tier_models("mistral/mistral-large-latest", overrides={})
+        self.assertEqual(models, {"fast": "mistral/mistral-small-latest", "large": "mistral/mistral-large-latest"})
+        self.assertEqual(provider_for_model("openai/gpt-4"), "openai")
+        self.assertEqual(provider_for_model("openrouter/deepseek/deepseek-r1:free"), "openrouter")
+
+    def test_fast_tier_differs_from_default_model(self):
+        """For every provider, the fast tier is a smaller model than the one selected by default"""
+        defaults = {
+            "mistral": mistral.TIER_MODELS["large"],
+            "openai": f"openai/{openai.DEFAULT_MODEL}",
+            "openrouter": openrouterai.LITELLM_PREFIX + openrouterai.DEFAULT_MODEL,
+            "fake": fake.TIER_MODELS["large"],
+            "local": local.TIER_MODELS["large"],
+        }
+        self.assertEqual(set(defaults), set(PROVIDER_TIER_MODELS))
+        for provider, model_name in defaults.items():
+            with self.subTest(provider=provider):
+                self.assertEqual(provider_for_model(model_name), provider)
+                models = resolve_tier_models(model_name, overrides={})
+                self.assertNotEqual(models["fast"], models["large"])
+
+    def test_litellm_routes_every_tier_model(self):
+        """litellm knows the provider of every tier model, so no call fails with an unknown provider"""
+        import litellm
+
+        # build_llm registers the local provider before handing a local model to CrewAI
+        local.register_local_provider()
+        expected = {"mistral": "mistral", "openai": "openai", "openrouter": "openrouter", "fake": "openai",
+                    "local": local.PROVIDER}
+        self.assertEqual(set(expected), set(PROVIDER_TIER_MODELS))
+        for provider, models in PROVIDER_TIER_MODELS.items():
+            for tier, model_name in models.items():
+                with self.subTest(provider=provider, tier=tier):
+                    _, llm_provider, _, _ = litellm.get_llm_provider(model_name)
+                    self.assertEqual(llm_provider, expected[provider])
+
+    def test_overrides_replace_tier_models(self):
+        """Environment overrides win over the provider defaults"""
+        models = resolve_tier_models("openai/gpt-4", overrides={"fast": "openai/gpt-4o-mini"})
+        self.assertEqual(models, {"fast": "openai/gpt-4o-mini", "large": "openai/gpt-4"})
+
+    def test_stats_summarize_each_tier(self):
+        """Calls, latency and tokens are summed per tier"""
+        stats = TierStats()
+        stats.record("fast", "mistral/mistral-small-latest", 0.5, 100, 20)
+        stats.record("fast", "mistral/mistral-small-latest", 1.5, 300, 40)
+        stats.record("large", "unlisted/model", 4.0, 1000, 500)
+        summary = stats.as_dict()
+
+        self.assertEqual(summary["fast"]["calls"], 2)
+        self.assertEqual(summary["fast"]["latency_s"], 2.0)
+        self.assertEqual(summary["fast"]["prompt_tokens"], 400)
+        self.assertIsNone(summary["large"]["cost_usd"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+"""
+Model tiers: route cheap subtasks to a small fast model and keep the large model
+for writing.
+
+Each provider module lists its tier models in ``TIER_MODELS``. The large tier is
+the model the provider fallback chain selected, so the keynote quality does not
+change; the fast tier is the provider's small model. Which agent uses which tier
+is configured in ``AGENT_TIERS`` and either tier's model can be overridden from
+the environment. Agents that use tools are never given a local fast-tier model,
+since small local models cannot follow the tool-calling format; they run on the
+large tier instead, and only tool-free subtasks reach the fast local model.
+
+LLMs are wrapped so every call records its tier, latency and token usage, and
+the cost of each tier is estimated from litellm's price table. Agents listed in
+``HEDGE_AGENTS`` can hedge their calls against a second provider (see
+``src.models.hedging``); the share of hedged calls is reported per tier.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import AGENT_TIERS, HEDGE_AGENTS, HEDGING, TIER_MODEL_OVERRIDES
+from src.models.config import fake, local, mistral, openai, openrouterai
+
+logger = logging.getLogger(__name__)
+
+TIERS = ("fast", "large")
+DEFAULT_TIER = "large"
+
+PROVIDER_TIER_MODELS = {
+    "mistral": mistral.TIER_MODELS,
+    "openai": openai.TIER_MODELS,
+    "openrouter": openrouterai.TIER_MODELS,
+    "fake": fake.TIER_MODELS,
+    "local": local.TIER_MODELS,
+}
+
+
+def provider_for_model(model_name: str) -> str:
+    """Guess which provider a litellm model name returned by get_model belongs to."""
+    for provider, models in PROVIDER_TIER_MODELS.items():
+        if model_name in models.values():
+            return provider
+    if local.is_local_model(model_name):
+        return "local"
+    if model_name.startswith("mistral/"):
+        return "mistral"
+    if model_name.startswith("openai/"):
+        return "openai"
+    if model_name.startswith(openrouterai.LITELLM_PREFIX):
+        return "openrouter"
+    # Bare model IDs are OpenRouter models, as in OPENROUTER_MODEL_ID
+    return "openrouter"
+
+
+def resolve_tier_models(model_name: str, overrides: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Map each tier to a model, given the model selected by the provider chain."""
+    overrides = TIER_MODEL_OVERRIDES if overrides is None else overrides
+    provider_models = PROVIDER_TIER_MODELS[provider_for_model(model_name)]
+    models = {"fast": provider_models.get("fast", model_name), "large": model_name}
+    models.update({tier: model for tier, model in overrides.items() if tier in TIERS})
+    return models
+
+
+def agent_tier(agent: str) -> str:
+    """Tier configured for an agent ("researcher", "outliner" or "writer")."""
+    tier = AGENT_TIERS.get(agent, DEFAULT_TIER)
+    if tier not in TIERS:
+        logger.warning(f"Unknown tier '{tier}' for {agent}; using {DEFAULT_TIER}")
+        return DEFAULT_TIER
+    return tier
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Cost in USD from litellm's price table, or None for unlisted models."""
+    if (not prompt_tokens and not completion_tokens) or local.is_local_model(model):
+        return 0.0
+    try:
+        import litellm
+
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+        return prompt_cost + completion_cost
+    except Exception:
+        return None
+
+
+class TierStats:
+    """Thread-safe per-tier call counts, latency and token usage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, tier: str, model: str, latency_s: float, prompt_tokens: int = 0,
+               completion_tokens: int = 0, hedged: bool = False, hedge_model: Optional[str] = None) -> None:
+        """Record one call; ``hedge_model`` is set when the secondary of a hedged call answered it."""
+        with self._lock:
+            entry = self._tiers.setdefault(tier, {"model": model, "latencies": [], "prompt_tokens": 0,
+                                                  "completion_tokens": 0, "hedged": 0, "hedge_wins": 0,
+                                                  "hedge_usage": {}})
+            entry["latencies"].append(latency_s)
+            entry["hedged"] += int(hedged)
+            if hedge_model:
+                # Tokens of secondary answers are priced at the secondary model's rates
+                entry["hedge_wins"] += 1
+                usage = entry["hedge_usage"].setdefault(hedge_model, [0, 0])
+                usage[0] += prompt_tokens
+                usage[1] += completion_tokens
+            else:
+                entry["prompt_tokens"] += prompt_tokens
+                entry["completion_tokens"] += completion_tokens
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tiers = {}
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Summary per tier: model, calls, latency, tokens and estimated cost."""
+        with self._lock:
+            tiers = {tier: dict(entry, latencies=list(entry["latencies"]),
+                                hedge_usage={m: list(u) for m, u in entry["hedge_usage"].items()})
+                     for tier, entry in self._tiers.items()}
+        summary = {}
+        for tier, entry in tiers.items():
+            latencies: List[float] = sorted(entry["latencies"])
+            costs = [estimate_cost(entry["model"], entry["prompt_tokens"], entry["completion_tokens"])]
+            costs += [estimate_cost(model, *usage) for model, usage in entry["hedge_usage"].items()]
+            prompt_tokens = entry["prompt_tokens"] + sum(u[0] for u in entry["hedge_usage"].values())
+            completion_tokens = entry["completion_tokens"] + sum(u[1] for u in entry["hedge_usage"].values())
+            summary[tier] = {
+                "model": entry["model"],
+                "calls": len(latencies),
+                "latency_s": round(sum(latencies), 3),
+                "latency_p50_s": round(latencies[len(latencies) // 2], 3) if latencies else 0.0,
+                "latency_max_s": round(latencies[-1], 3) if latencies else 0.0,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "cost_usd": round(sum(costs), 6) if None not in costs else None,
+                "hedged_calls": entry["hedged"],
+                "hedge_rate": round(entry["hedged"] / len(latencies), 3) if latencies else 0.0,
+                "hedge_wins": entry["hedge_wins"],
+            }
+        return summary
+
+
+class _UsageRecorder:
+    """Per-call callback CrewAI invokes with the token usage of one completion."""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        # CrewAI passes {"usage": ...}; litellm's own logging passes full responses, already counted
+        if not isinstance(response_obj, dict):
+            return
+        usage = response_obj.get("usage")
+        self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+        self.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+
+
+_tiered_llm_class = None
+
+
+def _get_tiered_llm_class():
+    """Build the CrewAI LLM subclass on first use, keeping crewai out of module import."""
+    global _tiered_llm_class
+    if _tiered_llm_class is None:
+        from crewai import LLM
+
+        class TieredLLM(LLM):
+            """CrewAI LLM that records latency and token usage for its tier."""
+
+            def __init__(self, model: str, tier: str, stats: TierStats, hedge_model: Optional[str] = None,
+                         **kwargs):
+                super().__init__(model=model, **kwargs)
+                self.tier = tier
+                self.stats = stats
+                # Built once; only used to prepare the secondary request's parameters
+                self.hedge_llm = LLM(model=hedge_model) if hedge_model else None
+
+            def call(self, messages, tools=None, callbacks=None, *args, **kwargs):
+                if self.hedge_llm is not None and not tools:
+                    return self._hedged_call(messages, callbacks)
+                usage = _UsageRecorder()
+                start = time.perf_counter()
+                try:
+                    return super().call(messages, tools, list(callbacks or []) + [usage], *args, **kwargs)
+                finally:
+                    self.stats.record(self.tier, self.model, time.perf_counter() - start,
+                                      usage.prompt_tokens, usage.completion_tokens)
+
+            def _hedged_call(self, messages, callbacks=None):
+                """Race the primary against the hedge model; tool calls are never hedged."""
+                from src.models.hedging import SECONDARY, hedge_delay, hedged_completion
+
+                if isinstance(messages, str):
+                    messages = [{"role": "user", "content": messages}]
+                params = self._prepare_completion_params(messages)
+                start = time.perf_counter()
+                result = hedged_completion(params, self.hedge_llm._prepare_completion_params(messages),
+                                           hedge_delay(self.model))
+                prompt_tokens = getattr(result.usage, "prompt_tokens", 0) or 0
+                completion_tokens = getattr(result.usage, "completion_tokens", 0) or 0
+                self.stats.record(self.tier, self.model, time.perf_counter() - start, prompt_tokens,
+                                  completion_tokens, hedged=result.hedged,
+                                  hedge_model=result.model if result.winner == SECONDARY else None)
+                # Report usage the way CrewAI does, so crew-level token counts include hedged calls
+                for callback in callbacks or []:
+                    if hasattr(callback, "log_success_event"):
+                        callback.log_success_event(kwargs=params, response_obj={"usage": result.usage},
+                                                   start_time=0, end_time=0)
+                return result.text
+
+        _tiered_llm_class = TieredLLM
+    return _tiered_llm_class
+
+
+def build_llm(models: Dict[str, str], agent: str, stats: TierStats, uses_tools: bool = False) -> Any:
+    """CrewAI LLM for an agent, using the agent's configured tier."""
+    tier = agent_tier(agent)
+    if uses_tools and tier != "large" and local.is_local_model(models[tier]):
+        logger.info(f"{agent} uses tools, so it runs on the large tier ({models['large']}) "
+                    f"instead of the local {models[tier]}")
+        tier = "large"
+    hedge_model = None
+    if HEDGING and agent in HEDGE_AGENTS:
+        from src.models.hedging import resolve_hedge_model
+
+        hedge_model = resolve_hedge_model(models[tier])
+        if hedge_model is None:
+            logger.warning(f"Hedging enabled but no secondary provider is configured for {agent}")
+    if local.is_local_model(models[tier]) or local.is_local_model(hedge_model):
+        # Tier overrides and snapshot selections can name local models without get_model running
+        local.register_local_provider()
+    return _get_tiered_llm_class()(models[tier], tier, stats, hedge_model=hedge_model)
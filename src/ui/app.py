@@ -1,11 +1,11 @@
 import streamlit as st
-import subprocess
 import time
 from pathlib import Path
 import sys
 from os.path import dirname, abspath, join
 import warnings
 import os
+from typing import List, NamedTuple, Optional
 
 # Filter out specific deprecation warnings from dependencies
 warnings.filterwarnings("ignore", category=DeprecationWarning, module="pkg_resources")
@@ -21,8 +21,24 @@ from src.config.settings import (
     APP_NAME,
     APP_VERSION,
     DEFAULT_RESEARCH_TOPIC,
-    OUTPUTS_DIR
+    OUTPUT_PAGE_BYTES,
+    SPECULATIVE_PREFETCH,
 )
+from src.agents.prefetch import SpeculativePrefetcher
+from src.utils.output_store import OutputStore, page_offsets, read_json, read_text_range
+from src.utils.process_runner import ProcessRunner
+from src.utils.result_cache import FRESH, BackgroundRefresher, ResultCache
+from src.utils.run_history import RunHistory
+from src.utils.topic_index import TopicIndex
+
+# Number of agent output lines shown while running and on failure
+LIVE_TAIL_LINES = 15
+ERROR_TAIL_LINES = 40
+
+# Shared store the agent writes its outputs to, and the search index over it
+output_store = OutputStore()
+run_history = RunHistory()
+result_cache = ResultCache(output_store)
 
 # Set page configuration
 st.set_page_config(
@@ -267,12 +283,20 @@ if 'last_run_time' not in st.session_state:
 # Research Input Section
 st.markdown('<p class="subheader">🔍 Research Focus</p>', unsafe_allow_html=True)
 
+# One prefetcher per server process, shared by all sessions
+@st.cache_resource
+def get_prefetcher():
+    return SpeculativePrefetcher()
+
 # Handle input changes with a callback
 def on_text_change():
     if st.session_state.first_load:
         st.session_state.first_load = False
     # Save the current input value to session state
     st.session_state.input_value = st.session_state.research_topic
+    if st.session_state.get("speculative_prefetch"):
+        # Warm the search cache for the likely first searches; never calls the LLM
+        get_prefetcher().update(st.session_state.research_topic)
 
 # Display the text input with the value from session state
 research_topic = st.text_input(
@@ -282,32 +306,75 @@ research_topic = st.text_input(
     placeholder="Enter a research topic...",
     on_change=on_text_change
 )
+st.checkbox(
+    "⚡ Prefetch search results while typing",
+    value=SPECULATIVE_PREFETCH,
+    key="speculative_prefetch",
+    help="Start the researcher's first web searches in the background once the topic stops changing"
+)
+st.checkbox(
+    "📈 Profile this run",
+    value=False,
+    key="profile_run",
+    help="Record CPU time, memory and the hottest functions of the run to logs/profiles/"
+)
+st.checkbox(
+    "🔁 Force re-run",
+    value=False,
+    key="force_rerun",
+    help="Run the agent even if a cached or similar result could be served"
+)
 
-# Function to create the same output paths that the agent uses
-def create_output_paths(topic):
-    """Generate output file paths based on the topic - matches agent.py logic"""
-    # Create a safe filename from the topic
-    safe_topic = "".join(c if c.isalnum() or c in [' ', '_', '-'] else '_' for c in topic.lower())
-    safe_topic = safe_topic.replace(' ', '_')[:50]  # Limit length, replace spaces
-    
-    # Create the file paths
-    research_file = OUTPUTS_DIR / f"{safe_topic}_research_summary.txt"
-    keynote_file = OUTPUTS_DIR / f"{safe_topic}_keynote_speech.txt"
+# Cheap change detector: a single stat() per file per rerun
+class FileSignature(NamedTuple):
+    path: str
+    mtime_ns: int
+    size: int
     
-    return research_file, keynote_file
+    @property
+    def mtime(self) -> float:
+        return self.mtime_ns / 1e9
 
-# Function to read and format the output files
-def read_output_file(file_path: Path) -> str:
+def file_signature(file_path: Path) -> Optional[FileSignature]:
     try:
-        return file_path.read_text(encoding='utf-8')
-    except FileNotFoundError:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    return FileSignature(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+# Cached page boundaries and page reads - keyed on path, mtime and size so reruns only
+# hit the disk on change, and only the page on screen is ever held in memory
+@st.cache_data(max_entries=32, show_spinner=False)
+def load_page_offsets(path: str, mtime_ns: int, size: int) -> List[int]:
+    return page_offsets(Path(path), OUTPUT_PAGE_BYTES)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def load_output_page(path: str, mtime_ns: int, size: int, page: int) -> str:
+    offsets = load_page_offsets(path, mtime_ns, size)
+    if page >= len(offsets):
         return ""
+    try:
+        return read_text_range(Path(path), offsets[page], offsets[page + 1] if page + 1 < len(offsets) else None)
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
+# Render an output file one page at a time, with a page picker for long outputs
+def render_output_file(signature: FileSignature, name: str) -> None:
+    pages = len(load_page_offsets(*signature))
+    page = 0
+    if pages > 1:
+        # Keyed on the file version so a shorter new output never keeps an out-of-range page
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1,
+                               key=f"{name}_page_{signature.mtime_ns}") - 1
+    st.markdown(load_output_page(*signature, page))
+
+# Whether an output file exists and has content
+def has_output(signature: Optional[FileSignature]) -> bool:
+    return signature is not None and signature.size > 0
+
 # Function to check if files were modified after the last run
-def was_file_modified_after_last_run(file_path: Path) -> bool:
-    if not file_path.exists():
+def was_file_modified_after_last_run(signature: Optional[FileSignature]) -> bool:
+    if signature is None:
         return False
     
     # If we just ran the agent in this session, always show the content
@@ -315,14 +382,14 @@ def was_file_modified_after_last_run(file_path: Path) -> bool:
         return True
     
     # Otherwise, use modification time logic for previous sessions
-    mod_time = file_path.stat().st_mtime
-    if file_path not in st.session_state.files_mod_time:
-        st.session_state.files_mod_time[file_path] = mod_time
+    mod_time = signature.mtime
+    if signature.path not in st.session_state.files_mod_time:
+        st.session_state.files_mod_time[signature.path] = mod_time
         return False
     
     # Check if file was modified since we loaded the app
-    if mod_time > st.session_state.files_mod_time[file_path]:
-        st.session_state.files_mod_time[file_path] = mod_time
+    if mod_time > st.session_state.files_mod_time[signature.path]:
+        st.session_state.files_mod_time[signature.path] = mod_time
         return True
     
     return False
@@ -331,66 +398,223 @@ def was_file_modified_after_last_run(file_path: Path) -> bool:
 def run_research_agent(topic: str):
     try:
         agent_path = join(dirname(dirname(abspath(__file__))), "agents", "agent.py")
-        # Use the virtual environment's Python interpreter
+        # Use the virtual environment's Python interpreter, falling back to the current one
         venv_python = join(root_dir, "venv", "Scripts", "python.exe")
+        python_executable = venv_python if os.path.exists(venv_python) else sys.executable
         
         # Set environment variables to suppress warnings
         env = os.environ.copy()
         env["PYTHONWARNINGS"] = "ignore::DeprecationWarning:pkg_resources,ignore::DeprecationWarning:pydantic,ignore::UserWarning:pydantic,ignore::DeprecationWarning:crewai_tools"
+        env["PYTHONUNBUFFERED"] = "1"  # Stream output lines as they are produced
+        if st.session_state.get("profile_run"):
+            env["KEYNOTEGENIE_PROFILE"] = "1"
         
-        # Pass the topic as a command line argument
-        process = subprocess.Popen(
-            [venv_python, agent_path, topic],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        # Pass the topic as a command line argument; output is drained in the background
+        runner = ProcessRunner(
+            [python_executable, agent_path, topic],
             cwd=root_dir,  # Set working directory to project root
             env=env  # Pass the modified environment variables
         )
-        return process
+        return runner.start()
     except Exception as e:
         st.error(f"Error running research agent: {str(e)}")
         return None
 
+# Cached history search so reruns from other widgets don't re-query the index
+@st.cache_data(ttl=30, show_spinner=False)
+def search_run_history(query: str):
+    return run_history.search(query, limit=10)
+
+# Reuse a previous run instead of paying for a new one
+def load_previous_run(topic: str):
+    st.session_state.last_topic = topic
+    st.session_state.input_value = topic
+    st.session_state.pop("research_topic", None)  # Let the input pick up the new value
+    st.session_state.last_run_time = time.time()
+    st.session_state.pending_match = None
+
+# Queue a topic to be run on this rerun (used by the reuse prompt buttons)
+def queue_research(topic: str):
+    st.session_state.queued_topic = topic
+    st.session_state.pending_match = None
+
+# Find a previously researched topic close enough to reuse
+def find_reusable_topic(topic: str):
+    return TopicIndex.from_store(output_store).best_match(topic)
+
+# Background refreshes are shared by all sessions so each topic refreshes once
+@st.cache_resource
+def get_refresher():
+    return BackgroundRefresher(launch=run_research_agent)
+
+def format_age(seconds) -> str:
+    if seconds is None:
+        return "never run"
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds / size:.0f}{unit} old"
+    return "just now"
+
+# Serve a cached result if it is fresh or stale, refreshing stale ones in the background
+def serve_cached_result(topic: str) -> bool:
+    lookup = result_cache.lookup(topic)
+    if not lookup.servable:
+        return False
+    load_previous_run(topic)
+    if lookup.state == FRESH:
+        st.success(f'Served cached result for "{topic}" ({format_age(lookup.age_s)}).')
+    elif lookup.refreshing or get_refresher().refresh(topic):
+        st.info(f'Served cached result for "{topic}" ({format_age(lookup.age_s)}); '
+                'a refreshed version is being generated in the background.')
+    else:
+        st.info(f'Served cached result for "{topic}" ({format_age(lookup.age_s)}); '
+                'too many refreshes are running to start another one now.')
+    return True
+
+# Summarize the profile of a topic's last run, if it was profiled
+def show_run_profile(topic: str):
+    profile_path = (output_store.read_metadata(topic) or {}).get("profile")
+    profile = read_json(Path(profile_path)) if profile_path else None
+    if not profile:
+        return
+    with st.expander("📈 Run profile", expanded=True):
+        wall_col, cpu_col, rss_col = st.columns(3)
+        wall_col.metric("Wall time", f"{profile['wall_s']:.1f}s")
+        cpu_col.metric("CPU time", f"{profile['process_cpu_s']:.1f}s", f"{profile['cpu_utilization']:.0%} busy",
+                       delta_color="off")
+        rss_col.metric("Peak RSS", f"{(profile.get('rss_peak_bytes') or 0) / 2 ** 20:.0f} MiB")
+        st.caption("Time by component (wall / CPU seconds)")
+        st.table([{"component": name, "wall s": times["wall_s"], "cpu s": times["cpu_s"]}
+                  for name, times in list(profile["components"].items())[:8]])
+        st.caption(f"Hottest functions; full profile in {profile_path}")
+        st.table([{"function": f["name"], "self wall s": f["self_wall_s"], "self cpu s": f["self_cpu_s"]}
+                  for f in profile["functions"][:10]])
+
+# Run the research agent for a topic and report progress
+def execute_research(topic: str):
+    # Update both topic values in session state
+    st.session_state.last_topic = topic
+    st.session_state.input_value = topic
+    
+    # Initialize progress
+    progress_placeholder = st.empty()
+    progress_bar = progress_placeholder.progress(0)
+    
+    # Start the research process with the topic
+    runner = run_research_agent(topic)
+    if runner:
+        log_placeholder = st.empty()
+        with st.spinner(f'🔎 Researching "{topic}"...'):
+            # Poll the process, showing progress and a live tail of its output
+            while runner.poll() is None:
+                time.sleep(0.25)
+                # Approach but never reach 100% while the run is still going
+                progress_bar.progress(min(95, int(95 * (1 - 0.99 ** (runner.elapsed * 4)))))
+                log_placeholder.code("\n".join(runner.tail(LIVE_TAIL_LINES)) or "Starting agent...", language=None)
+            
+            if runner.returncode == 0:
+                # Record when the run completed
+                st.session_state.last_run_time = time.time()
+                search_run_history.clear()
+                st.markdown(f'<div class="success-container">Research on "{topic}" completed successfully!</div>', unsafe_allow_html=True)
+                show_run_profile(topic)
+            else:
+                st.error(f"Error during research (exit code {runner.returncode}). Full log: {runner.log_path}")
+                st.code("\n".join(runner.tail(ERROR_TAIL_LINES, stream="stderr")), language=None)
+        
+        # Clear progress bar and live output
+        progress_placeholder.empty()
+        log_placeholder.empty()
+
 # Run Research Button
+queued_topic = st.session_state.pop("queued_topic", None)
 if st.button("🚀 Run Research Agent", help="Click to start the research process"):
     # Validate the topic and save to session state
     if not research_topic or research_topic.strip() == "":
         st.error("Please enter a research topic.")
+    elif st.session_state.get("force_rerun"):
+        st.session_state.pending_match = None
+        queued_topic = research_topic
+    elif serve_cached_result(research_topic):
+        st.session_state.pending_match = None
     else:
-        # Update both topic values in session state
-        st.session_state.last_topic = research_topic
-        st.session_state.input_value = research_topic
-        
-        # Initialize progress
-        progress_placeholder = st.empty()
-        progress_bar = progress_placeholder.progress(0)
+        match = find_reusable_topic(research_topic)
+        if match:
+            # Offer the earlier result before paying for a new run
+            st.session_state.pending_match = {"topic": research_topic, "match": match.topic, "score": match.score}
+        else:
+            st.session_state.pending_match = None
+            queued_topic = research_topic
+
+# Reuse prompt for near-duplicate topics
+pending_match = st.session_state.get("pending_match")
+if pending_match and not queued_topic:
+    st.info(f'A similar topic was already researched: "{pending_match["match"]}" '
+            f'({pending_match["score"]:.0%} match).')
+    reuse_col, refresh_col, run_col = st.columns(3)
+    reuse_col.button("♻️ Reuse", help="Show the existing result", use_container_width=True,
+                     on_click=load_previous_run, args=(pending_match["match"],))
+    refresh_col.button("🔄 Refresh", help="Re-run the existing topic to update its result", use_container_width=True,
+                       on_click=queue_research, args=(pending_match["match"],))
+    run_col.button("▶️ Run anyway", help="Research the new topic separately", use_container_width=True,
+                   on_click=queue_research, args=(pending_match["topic"],))
+
+if queued_topic:
+    execute_research(queued_topic)
+
+# Result cache admin controls
+with st.sidebar:
+    st.markdown("### 🗂️ Result Cache")
+    st.caption(f"Results are served from cache for {result_cache.ttl_seconds / 3600:.0f}h, "
+               f"then refreshed in the background for {result_cache.stale_seconds / 86400:.0f} more days. "
+               "Pinned topics are always served from cache.")
+    refresher = get_refresher()
+    if research_topic and research_topic.strip():
+        if result_cache.is_pinned(research_topic):
+            st.button("📌 Unpin current topic", on_click=result_cache.unpin, args=(research_topic,),
+                      use_container_width=True)
+        else:
+            st.button("📌 Pin current topic", on_click=result_cache.pin, args=(research_topic,),
+                      use_container_width=True)
+    if st.button("🔥 Warm stale pinned topics", use_container_width=True):
+        started = refresher.warm(result_cache.topics_to_warm())
+        st.info(f"Started {len(started)} background refreshes." if started else "Nothing to warm right now.")
+    
+    for index, topic in enumerate(result_cache.pinned_topics()):
+        lookup = result_cache.lookup(topic)
+        status = "refreshing" if lookup.refreshing or refresher.is_refreshing(topic) else lookup.state
+        st.markdown(f'**{topic}**  \n<span class="timestamp">{status} · {format_age(lookup.age_s)}</span>',
+                    unsafe_allow_html=True)
+        warm_col, unpin_col = st.columns(2)
+        warm_col.button("Warm", key=f"warm_pin_{index}", on_click=refresher.refresh, args=(topic,),
+                        disabled=status == "refreshing", use_container_width=True)
+        unpin_col.button("Unpin", key=f"unpin_{index}", on_click=result_cache.unpin, args=(topic,),
+                         use_container_width=True)
+
+# Past Runs Section
+with st.expander("📚 Past Runs"):
+    history_query = st.text_input(
+        "Search past research and keynotes",
+        key="history_query",
+        placeholder="Search by topic or content..."
+    )
+    history_results = search_run_history(history_query)
+    if not history_results:
+        st.info("No matching runs found.")
+    
+    shown_keys = set()
+    for result in history_results:
+        # Research and keynote of the same run share a key; list each run once
+        if result["key"] in shown_keys:
+            continue
+        shown_keys.add(result["key"])
         
-        # Start the research process with the topic
-        process = run_research_agent(research_topic)
-        if process:
-            with st.spinner(f'🔎 Researching "{research_topic}"...'):
-                # Simulate progress while the process is running
-                for i in range(100):
-                    time.sleep(0.1)  # Adjust the sleep time based on your needs
-                    progress_bar.progress(i + 1)
-                    
-                    # Check if process has finished
-                    if process.poll() is not None:
-                        break
-                
-                # Wait for process to complete
-                stdout, stderr = process.communicate()
-                
-                if process.returncode == 0:
-                    # Record when the run completed
-                    st.session_state.last_run_time = time.time()
-                    st.markdown(f'<div class="success-container">Research on "{research_topic}" completed successfully!</div>', unsafe_allow_html=True)
-                else:
-                    st.error(f"Error during research: {stderr}")
-            
-            # Clear progress bar
-            progress_placeholder.empty()
+        created = time.strftime("%Y-%m-%d %H:%M", time.localtime(result["created_at"]))
+        st.markdown(f'**{result["topic"]}**  \n<span class="timestamp">{created} · {result["model"] or "unknown model"}</span>',
+                    unsafe_allow_html=True)
+        if result["snippet"]:
+            st.caption(result["snippet"])
+        st.button("Open", key=f"open_{result['key']}", on_click=load_previous_run, args=(result["topic"],))
 
 # Create two columns for the output
 col1, col2 = st.columns(2)
@@ -398,24 +622,25 @@ col1, col2 = st.columns(2)
 # Get the topic to use for file paths - either the last run topic or the current input
 display_topic = st.session_state.last_topic if st.session_state.last_topic else research_topic
 
-# Get the dynamic file paths based on the topic
-research_file, keynote_file = create_output_paths(display_topic)
+# Get the content-addressed file paths for the topic
+research_file = output_store.artifact_path(display_topic, "research")
+keynote_file = output_store.artifact_path(display_topic, "keynote")
 
 # Display outputs in columns
 with col1:
     st.markdown('<p class="subheader">📊 Research Summary</p>', unsafe_allow_html=True)
     with st.container():
         st.markdown('<div class="output-container">', unsafe_allow_html=True)
-        research_content = read_output_file(research_file)
+        research_signature = file_signature(research_file)
         
-        if research_content:
+        if has_output(research_signature):
             # Check if the file was modified after the last run
-            if st.session_state.last_run_time and was_file_modified_after_last_run(research_file):
+            if st.session_state.last_run_time and was_file_modified_after_last_run(research_signature):
                 timestamp = time.strftime("%Y-%m-%d %H:%M:%S", 
-                                         time.localtime(research_file.stat().st_mtime))
+                                         time.localtime(research_signature.mtime))
                 st.markdown(f'<p class="timestamp">Generated: {timestamp}</p>', 
                            unsafe_allow_html=True)
-                st.markdown(research_content)
+                render_output_file(research_signature, "research")
             else:
                 # Don't show previous content with info message
                 st.info("Run the research agent to generate the summary.")
@@ -427,16 +652,16 @@ with col2:
     st.markdown('<p class="subheader">🎤 Keynote Speech</p>', unsafe_allow_html=True)
     with st.container():
         st.markdown('<div class="output-container">', unsafe_allow_html=True)
-        keynote_content = read_output_file(keynote_file)
+        keynote_signature = file_signature(keynote_file)
         
-        if keynote_content:
+        if has_output(keynote_signature):
             # Check if the file was modified after the last run
-            if st.session_state.last_run_time and was_file_modified_after_last_run(keynote_file):
+            if st.session_state.last_run_time and was_file_modified_after_last_run(keynote_signature):
                 timestamp = time.strftime("%Y-%m-%d %H:%M:%S", 
-                                         time.localtime(keynote_file.stat().st_mtime))
+                                         time.localtime(keynote_signature.mtime))
                 st.markdown(f'<p class="timestamp">Generated: {timestamp}</p>', 
                            unsafe_allow_html=True)
-                st.markdown(keynote_content)
+                render_output_file(keynote_signature, "keynote")
             else:
                 # Don't show previous content with info message
                 st.info("Run the research agent to generate the keynote speech.")
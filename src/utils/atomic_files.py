@@ -0,0 +1,44 @@
+"""
+Atomic file writes: a temp file next to the target is renamed into place, so a
+reader sees either the previous version or the new one, never a partial write.
+
+This module depends on nothing else in the package, so the configuration
+snapshot can save itself while ``src.config.settings`` is still being loaded.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+# mkstemp creates files readable only by their owner; artifacts get the usual umask-based mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_writer(path: Path, mode: int = FILE_MODE) -> Iterator[IO[str]]:
+    """Open a temp file next to ``path``; it replaces ``path``, with ``mode``, when the block exits cleanly."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+            yield tmp_file
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text to a temp file next to ``path`` and rename it into place."""
+    with atomic_writer(path) as tmp_file:
+        tmp_file.write(text)
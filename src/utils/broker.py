@@ -0,0 +1,400 @@
+"""
+Shared job queue for running research jobs on several hosts.
+
+Workers on any number of nodes claim jobs from a broker. A claimed job is
+leased to its worker for a limited time and the worker renews the lease with
+heartbeats while the crew runs. When a worker dies, its lease runs out and the
+job goes back to the queue for another node, until it has been attempted
+``max_attempts`` times.
+
+Two backends share the same interface:
+
+- ``sqlite:////mnt/shared/keynotegenie/jobs.db``: a SQLite file on a volume
+  every node mounts. It uses a rollback journal rather than WAL, because WAL
+  needs shared memory that network filesystems do not provide.
+- ``redis://host:6379/0``: any Redis-compatible server (needs the optional
+  ``redis`` package).
+"""
+
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.config.settings import BROKER_MAX_ATTEMPTS, BROKER_URL
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETE = "complete"
+FAILED = "failed"
+STATES = (QUEUED, RUNNING, COMPLETE, FAILED)
+
+LEASE_EXPIRED_ERROR = "Lease expired"
+
+# Jobs whose status RedisBroker.counts fetches per round trip
+COUNTS_PAGE_SIZE = 1000
+
+_id_lock = threading.Lock()
+_last_id_ms = 0
+
+
+@dataclass
+class BrokerJob:
+    id: str
+    topic: str
+    status: str = QUEUED
+    attempts: int = 0
+    max_attempts: int = BROKER_MAX_ATTEMPTS
+    worker: Optional[str] = None
+    lease_expires: Optional[float] = None
+    stage: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def new_job_id() -> str:
+    # Time-ordered prefix keeps ids sortable by submission across nodes; it never repeats within
+    # a process, so jobs submitted in the same millisecond keep their order
+    global _last_id_ms
+    with _id_lock:
+        _last_id_ms = max(int(time.time() * 1000), _last_id_ms + 1)
+        return f"{_last_id_ms:013d}-{uuid.uuid4().hex[:8]}"
+
+
+class Broker:
+    """Interface shared by the broker backends."""
+
+    def enqueue(self, topic: str, max_attempts: int = BROKER_MAX_ATTEMPTS) -> BrokerJob:
+        """Add a job to the end of the queue."""
+        raise NotImplementedError
+
+    def claim(self, worker: str, lease_seconds: float) -> Optional[BrokerJob]:
+        """Lease the oldest queued job to ``worker``, or return None if the queue is empty."""
+        raise NotImplementedError
+
+    def heartbeat(self, job_id: str, worker: str, lease_seconds: float, stage: Optional[str] = None) -> bool:
+        """Extend a lease; False means the worker no longer holds the job."""
+        raise NotImplementedError
+
+    def complete(self, job_id: str, worker: str) -> bool:
+        """Mark a leased job complete; False if the lease had already been lost."""
+        raise NotImplementedError
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        """Mark a leased job failed; False if the lease had already been lost."""
+        raise NotImplementedError
+
+    def requeue_expired(self, now: Optional[float] = None) -> int:
+        """Return jobs with expired leases to the queue (or fail them after max attempts)."""
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[BrokerJob]:
+        raise NotImplementedError
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[BrokerJob]:
+        """Most recently submitted jobs, newest first."""
+        raise NotImplementedError
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs in each state."""
+        raise NotImplementedError
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    lease_expires REAL,
+    stage TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, id);
+"""
+
+
+class SQLiteBroker(Broker):
+    """Broker backed by a SQLite file on a volume shared by every node."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; writes that read first use BEGIN IMMEDIATE to take the write lock up front
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=DELETE")
+        return conn
+
+    @staticmethod
+    def _job(row: Optional[sqlite3.Row]) -> Optional[BrokerJob]:
+        return BrokerJob(**dict(row)) if row else None
+
+    def enqueue(self, topic: str, max_attempts: int = BROKER_MAX_ATTEMPTS) -> BrokerJob:
+        job = BrokerJob(id=new_job_id(), topic=topic, max_attempts=max_attempts, created_at=time.time())
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, topic, status, max_attempts, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job.id, job.topic, job.status, job.max_attempts, job.created_at),
+            )
+        return job
+
+    def claim(self, worker: str, lease_seconds: float) -> Optional[BrokerJob]:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._requeue_expired(conn, now)
+                row = conn.execute("SELECT id FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (QUEUED,)).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, "
+                    "started_at = ?, stage = NULL, error = NULL WHERE id = ?",
+                    (RUNNING, worker, now + lease_seconds, now, row["id"]),
+                )
+                job = self._job(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+                conn.execute("COMMIT")
+                return job
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _update_leased(self, job_id: str, worker: str, assignments: str, values: tuple) -> bool:
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND worker = ? AND status = ?",
+                values + (job_id, worker, RUNNING),
+            )
+            return cursor.rowcount == 1
+
+    def heartbeat(self, job_id: str, worker: str, lease_seconds: float, stage: Optional[str] = None) -> bool:
+        return self._update_leased(job_id, worker, "lease_expires = ?, stage = COALESCE(?, stage)",
+                                   (time.time() + lease_seconds, stage))
+
+    def complete(self, job_id: str, worker: str) -> bool:
+        return self._update_leased(job_id, worker, "status = ?, lease_expires = NULL, finished_at = ?",
+                                   (COMPLETE, time.time()))
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        return self._update_leased(job_id, worker, "status = ?, lease_expires = NULL, finished_at = ?, error = ?",
+                                   (FAILED, time.time(), error))
+
+    @staticmethod
+    def _requeue_expired(conn: sqlite3.Connection, now: float) -> int:
+        cursor = conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, "
+            "finished_at = CASE WHEN attempts >= max_attempts THEN ? END, "
+            "worker = NULL, lease_expires = NULL, error = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (FAILED, QUEUED, now, LEASE_EXPIRED_ERROR, RUNNING, now),
+        )
+        return cursor.rowcount
+
+    def requeue_expired(self, now: Optional[float] = None) -> int:
+        with closing(self._connect()) as conn:
+            return self._requeue_expired(conn, time.time() if now is None else now)
+
+    def get(self, job_id: str) -> Optional[BrokerJob]:
+        with closing(self._connect()) as conn:
+            return self._job(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[BrokerJob]:
+        with closing(self._connect()) as conn:
+            if status:
+                rows = conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?", (status, limit))
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+            return [self._job(row) for row in rows.fetchall()]
+
+    def counts(self) -> Dict[str, int]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = dict.fromkeys(STATES, 0)
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+
+# Server-side scripts keep each state change atomic without client-side locking
+_CLAIM_SCRIPT = """
+local id = redis.call('LPOP', KEYS[1])
+if not id then return nil end
+local key = ARGV[4] .. id
+redis.call('HINCRBY', key, 'attempts', 1)
+redis.call('HSET', key, 'status', 'running', 'worker', ARGV[1], 'lease_expires', ARGV[2], 'started_at', ARGV[3])
+redis.call('HDEL', key, 'stage', 'error')
+redis.call('ZADD', KEYS[2], ARGV[2], id)
+return id
+"""
+
+_LEASED_UPDATE_SCRIPT = """
+local key = ARGV[3] .. ARGV[1]
+if redis.call('HGET', key, 'worker') ~= ARGV[2] or redis.call('HGET', key, 'status') ~= 'running' then
+    return 0
+end
+for i = 4, #ARGV, 2 do
+    redis.call('HSET', key, ARGV[i], ARGV[i + 1])
+end
+local lease = redis.call('HGET', key, 'lease_expires')
+if redis.call('HGET', key, 'status') == 'running' then
+    redis.call('ZADD', KEYS[1], lease, ARGV[1])
+else
+    redis.call('ZREM', KEYS[1], ARGV[1])
+end
+return 1
+"""
+
+_REQUEUE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[1])
+for _, id in ipairs(ids) do
+    local key = ARGV[2] .. id
+    redis.call('ZREM', KEYS[1], id)
+    redis.call('HSET', key, 'worker', '', 'lease_expires', '', 'error', ARGV[3])
+    if tonumber(redis.call('HGET', key, 'attempts')) >= tonumber(redis.call('HGET', key, 'max_attempts')) then
+        redis.call('HSET', key, 'status', 'failed', 'finished_at', ARGV[1])
+    else
+        redis.call('HSET', key, 'status', 'queued')
+        redis.call('LPUSH', KEYS[2], id)
+    end
+end
+return #ids
+"""
+
+_INT_FIELDS = ("attempts", "max_attempts")
+_FLOAT_FIELDS = ("lease_expires", "created_at", "started_at", "finished_at")
+
+
+class RedisBroker(Broker):
+    """Broker backed by any Redis-compatible server."""
+
+    def __init__(self, url: str, prefix: str = "keynotegenie:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("The redis package is required for redis:// brokers (pip install redis)") from e
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.queue_key = f"{prefix}queue"
+        self.leases_key = f"{prefix}leases"
+        self.jobs_key = f"{prefix}jobs"
+        self.job_prefix = f"{prefix}job:"
+        self._claim = self.client.register_script(_CLAIM_SCRIPT)
+        self._leased_update = self.client.register_script(_LEASED_UPDATE_SCRIPT)
+        self._requeue = self.client.register_script(_REQUEUE_SCRIPT)
+
+    def _job(self, fields: Dict[str, str]) -> Optional[BrokerJob]:
+        if not fields:
+            return None
+        values: Dict[str, Any] = {k: (v or None) for k, v in fields.items() if k in BrokerJob.__dataclass_fields__}
+        for name in _INT_FIELDS:
+            values[name] = int(values.get(name) or 0)
+        for name in _FLOAT_FIELDS:
+            values[name] = float(values[name]) if values.get(name) else None
+        values["created_at"] = values["created_at"] or 0.0
+        return BrokerJob(**values)
+
+    def enqueue(self, topic: str, max_attempts: int = BROKER_MAX_ATTEMPTS) -> BrokerJob:
+        job = BrokerJob(id=new_job_id(), topic=topic, max_attempts=max_attempts, created_at=time.time())
+        fields = {k: v for k, v in job.as_dict().items() if v is not None}
+        with self.client.pipeline() as pipe:
+            pipe.hset(self.job_prefix + job.id, mapping=fields)
+            pipe.zadd(self.jobs_key, {job.id: job.created_at})
+            pipe.rpush(self.queue_key, job.id)
+            pipe.execute()
+        return job
+
+    def claim(self, worker: str, lease_seconds: float) -> Optional[BrokerJob]:
+        now = time.time()
+        self.requeue_expired(now)
+        job_id = self._claim(keys=[self.queue_key, self.leases_key],
+                             args=[worker, now + lease_seconds, now, self.job_prefix])
+        return self.get(job_id) if job_id else None
+
+    def _update_leased(self, job_id: str, worker: str, **fields: Any) -> bool:
+        args: List[Any] = [job_id, worker, self.job_prefix]
+        for name, value in fields.items():
+            args.extend([name, value])
+        return bool(self._leased_update(keys=[self.leases_key], args=args))
+
+    def heartbeat(self, job_id: str, worker: str, lease_seconds: float, stage: Optional[str] = None) -> bool:
+        fields: Dict[str, Any] = {"lease_expires": time.time() + lease_seconds}
+        if stage:
+            fields["stage"] = stage
+        return self._update_leased(job_id, worker, **fields)
+
+    def complete(self, job_id: str, worker: str) -> bool:
+        return self._update_leased(job_id, worker, status=COMPLETE, lease_expires="", finished_at=time.time())
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        return self._update_leased(job_id, worker, status=FAILED, lease_expires="", finished_at=time.time(),
+                                   error=error)
+
+    def requeue_expired(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        return int(self._requeue(keys=[self.leases_key, self.queue_key],
+                                 args=[now, self.job_prefix, LEASE_EXPIRED_ERROR]))
+
+    def get(self, job_id: str) -> Optional[BrokerJob]:
+        return self._job(self.client.hgetall(self.job_prefix + job_id))
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[BrokerJob]:
+        jobs = []
+        # Scan newest first in pages until enough jobs match the status filter
+        start = 0
+        while len(jobs) < limit:
+            ids = self.client.zrevrange(self.jobs_key, start, start + limit - 1)
+            if not ids:
+                break
+            start += len(ids)
+            with self.client.pipeline() as pipe:
+                for job_id in ids:
+                    pipe.hgetall(self.job_prefix + job_id)
+                for fields in pipe.execute():
+                    job = self._job(fields)
+                    if job and (status is None or job.status == status):
+                        jobs.append(job)
+        return jobs[:limit]
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(STATES, 0)
+        # One round trip per page of jobs rather than one per job
+        start = 0
+        while True:
+            ids = self.client.zrange(self.jobs_key, start, start + COUNTS_PAGE_SIZE - 1)
+            if not ids:
+                return counts
+            start += len(ids)
+            with self.client.pipeline() as pipe:
+                for job_id in ids:
+                    pipe.hget(self.job_prefix + job_id, "status")
+                for status in pipe.execute():
+                    if status in counts:
+                        counts[status] += 1
+
+
+def get_broker(url: str = BROKER_URL) -> Broker:
+    """Broker for a ``sqlite:///path`` or ``redis://`` URL."""
+    if url.startswith("sqlite:///"):
+        return SQLiteBroker(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBroker(url)
+    raise ValueError(f"Unsupported broker URL: {url}")
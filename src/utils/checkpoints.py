@@ -0,0 +1,188 @@
+"""
+Durable checkpoints for research runs, so an interrupted run can resume.
+
+Every run gets a run ID and a directory under ``CHECKPOINTS_DIR/<run_id>/``.
+Each finished step is saved there as soon as it completes: the research task,
+the keynote task, the sectioned writing passes and every search tool call.
+Steps use the output store's atomic writes, so a crash mid-write leaves the
+previous state intact. A resumed run loads the completed steps instead of
+executing them, so a retry after an OOM, a deploy or a provider error costs
+only the remaining work. Checkpoints of a run are deleted when it completes,
+since its results then live in the output store.
+
+The checkpoint of the run executing in the current thread is available through
+``active_checkpoint()``, which lets deeply nested code such as tool wrappers
+record their steps without the checkpoint being passed down to them.
+"""
+
+import contextvars
+import logging
+import os
+import re
+import shutil
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from src.config.settings import CHECKPOINT_MAX_AGE_SECONDS, CHECKPOINT_STALE_SECONDS, CHECKPOINTS_DIR
+from src.utils.output_store import atomic_write_json, normalize_topic, read_json
+
+logger = logging.getLogger(__name__)
+
+RUN_FILE = "run.json"
+STEPS_DIR = "steps"
+
+RUNNING = "running"
+FAILED = "failed"
+COMPLETE = "complete"
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+_active: "contextvars.ContextVar[Optional[RunCheckpoint]]" = contextvars.ContextVar("checkpoint", default=None)
+
+
+def active_checkpoint() -> Optional["RunCheckpoint"]:
+    """Checkpoint of the run executing in this context, if any."""
+    return _active.get()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class RunCheckpoint:
+    """The saved steps of one run."""
+
+    def __init__(self, directory: Path, meta: Dict[str, Any]):
+        self.dir = directory
+        self.meta = meta
+        self._lock = threading.Lock()
+
+    @property
+    def run_id(self) -> str:
+        return self.meta["run_id"]
+
+    @property
+    def topic(self) -> str:
+        return self.meta["topic"]
+
+    @property
+    def status(self) -> str:
+        return self.meta.get("status", RUNNING)
+
+    @property
+    def steps(self) -> List[str]:
+        """Names of the completed steps, in the order they finished."""
+        with self._lock:
+            return list(self.meta.get("steps", []))
+
+    def _step_path(self, step: str) -> Path:
+        return self.dir / STEPS_DIR / f"{_UNSAFE_CHARS.sub('_', step)}.json"
+
+    def get(self, step: str) -> Optional[Any]:
+        """Saved data of a completed step, or None if the step has not completed."""
+        saved = read_json(self._step_path(step))
+        return saved.get("data") if isinstance(saved, dict) else None
+
+    def save(self, step: str, data: Any) -> None:
+        """Record a step as complete; ``data`` must be JSON-serializable."""
+        atomic_write_json(self._step_path(step), {"step": step, "saved_at": time.time(), "data": data})
+        with self._lock:
+            if step not in self.meta.setdefault("steps", []):
+                self.meta["steps"].append(step)
+            self._write_meta()
+
+    def mark(self, status: str, **fields: Any) -> None:
+        """Update the run's status, recording this process as its owner while it runs."""
+        with self._lock:
+            self.meta.update(fields, status=status, host=socket.gethostname(), pid=os.getpid())
+            self._write_meta()
+
+    def _write_meta(self) -> None:
+        self.meta["updated_at"] = time.time()
+        atomic_write_json(self.dir / RUN_FILE, self.meta)
+
+    def is_resumable(self, stale_seconds: float = CHECKPOINT_STALE_SECONDS) -> bool:
+        """Whether the run failed or was abandoned by a process that is no longer working on it."""
+        if self.status == FAILED:
+            return True
+        if self.status != RUNNING:
+            return False
+        if self.meta.get("host") == socket.gethostname() and self.meta.get("pid"):
+            return self.meta["pid"] != os.getpid() and not _pid_alive(self.meta["pid"])
+        # Owned by another host; only its silence tells us it died
+        return time.time() - self.meta.get("updated_at", 0) > stale_seconds
+
+    @contextmanager
+    def activate(self) -> Iterator["RunCheckpoint"]:
+        """Make this the active checkpoint for code running in the current context."""
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+
+class CheckpointStore:
+    """Directory of run checkpoints."""
+
+    def __init__(self, root: Union[str, Path] = CHECKPOINTS_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def create(self, topic: str) -> RunCheckpoint:
+        """Start checkpoints for a new run of a topic."""
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        checkpoint = RunCheckpoint(self.root / run_id, {
+            "run_id": run_id,
+            "topic": topic,
+            "created_at": time.time(),
+            "steps": [],
+        })
+        checkpoint.mark(RUNNING)
+        return checkpoint
+
+    def open(self, run_id: str) -> Optional[RunCheckpoint]:
+        """Checkpoints of an existing run, or None if there are none."""
+        if not run_id or _UNSAFE_CHARS.search(run_id):
+            return None
+        directory = self.root / run_id
+        meta = read_json(directory / RUN_FILE)
+        return RunCheckpoint(directory, meta) if isinstance(meta, dict) and "run_id" in meta else None
+
+    def list_runs(self, topic: Optional[str] = None) -> List[RunCheckpoint]:
+        """Checkpointed runs, most recently updated first, optionally for one topic."""
+        runs = [run for run in (self.open(path.parent.name) for path in self.root.glob(f"*/{RUN_FILE}")) if run]
+        if topic is not None:
+            runs = [run for run in runs if normalize_topic(run.topic) == normalize_topic(topic)]
+        return sorted(runs, key=lambda run: run.meta.get("updated_at", 0), reverse=True)
+
+    def latest_resumable(self, topic: str) -> Optional[RunCheckpoint]:
+        """The most recent failed or abandoned run of a topic."""
+        return next((run for run in self.list_runs(topic) if run.is_resumable()), None)
+
+    def delete(self, run_id: str) -> None:
+        if self.open(run_id) is not None:
+            shutil.rmtree(self.root / run_id, ignore_errors=True)
+
+    def prune(self, max_age_seconds: float = CHECKPOINT_MAX_AGE_SECONDS) -> int:
+        """Delete checkpoints of runs not updated within ``max_age_seconds``; returns how many."""
+        cutoff = time.time() - max_age_seconds
+        pruned = 0
+        for run in self.list_runs():
+            if run.meta.get("updated_at", 0) < cutoff:
+                self.delete(run.run_id)
+                pruned += 1
+        if pruned:
+            logger.info(f"Pruned checkpoints of {pruned} old runs")
+        return pruned
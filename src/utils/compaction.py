@@ -0,0 +1,221 @@
+"""
+Local (non-LLM) compaction of research output before it reaches the writer.
+
+The research summary is split into units (bullets, lines or sentences),
+agent boilerplate is stripped, exact and near duplicates are dropped and, if
+the result is still over the token budget, the most central units are kept
+by an extractive TF score. Kept units stay in their original order, and
+section headings are kept with any of their units, so the writer still sees
+a coherent summary.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio for English text, used instead of a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Units whose word sets overlap at least this much are treated as duplicates
+NEAR_DUPLICATE_JACCARD = 0.8
+
+# Agent scaffolding and filler that carries no research content
+BOILERPLATE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r"^(thought|action|action input|observation|final answer)\s*:",
+    r"^i now (know|can give) the final answer",
+    r"^(here is|here's|below is) (a|the|my)\b.*(summary|overview|list|research)\b.*:?$",
+    r"^(let me know|feel free to|i hope this helps|please note that this)",
+    r"^(-{3,}|\*{3,}|_{3,}|={3,})$",
+)]
+
+HEADING_PATTERN = re.compile(r"^(#{1,6}\s+.+|\*\*[^*]+\*\*:?|[A-Z][^.!?]{0,80}:)$")
+BULLET_PATTERN = re.compile(r"^\s*([-*•]|\d+[.)])\s+")
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by can for from has have how in into is it its of on or
+such that the their them these they this to was were which will with within would
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _words(text: str) -> List[str]:
+    return [w for w in WORD_PATTERN.findall(text.lower()) if w not in STOPWORDS]
+
+
+@dataclass
+class Unit:
+    text: str
+    section: int
+    heading: bool = False
+    words: List[str] = field(default_factory=list)
+
+    @property
+    def tokens(self) -> int:
+        # One extra token for the line break joining units
+        return estimate_tokens(self.text) + 1
+
+
+@dataclass
+class CompactionResult:
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+    budget_tokens: int
+    boilerplate_removed: int = 0
+    duplicates_removed: int = 0
+    ranked_out: int = 0
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.compacted_tokens
+
+    @property
+    def savings_ratio(self) -> float:
+        return self.saved_tokens / self.original_tokens if self.original_tokens else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "budget_tokens": self.budget_tokens,
+            "original_tokens": self.original_tokens,
+            "compacted_tokens": self.compacted_tokens,
+            "saved_tokens": self.saved_tokens,
+            "savings_ratio": round(self.savings_ratio, 3),
+            "boilerplate_removed": self.boilerplate_removed,
+            "duplicates_removed": self.duplicates_removed,
+            "ranked_out": self.ranked_out,
+        }
+
+
+def split_units(text: str) -> List[Unit]:
+    """Split text into headings, bullets and sentences, tracking their section."""
+    units: List[Unit] = []
+    section = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if HEADING_PATTERN.match(line) and not BULLET_PATTERN.match(line):
+            section += 1
+            units.append(Unit(line, section, heading=True))
+        elif BULLET_PATTERN.match(line):
+            # A bullet is a self-contained point; keep it whole
+            units.append(Unit(line, section))
+        else:
+            units.extend(Unit(sentence, section) for sentence in SENTENCE_SPLIT_PATTERN.split(line) if sentence)
+    for unit in units:
+        unit.words = _words(unit.text)
+    return units
+
+
+def is_boilerplate(text: str) -> bool:
+    return any(pattern.search(text) for pattern in BOILERPLATE_PATTERNS)
+
+
+def _jaccard(first: Set[str], second: Set[str]) -> float:
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def _dedupe(units: List[Unit]) -> List[Unit]:
+    kept: List[Unit] = []
+    seen_exact: Set[str] = set()
+    kept_word_sets: List[Set[str]] = []
+    for unit in units:
+        if unit.heading:
+            kept.append(unit)
+            continue
+        exact = " ".join(unit.words)
+        word_set = set(unit.words)
+        if exact in seen_exact or any(_jaccard(word_set, other) >= NEAR_DUPLICATE_JACCARD for other in kept_word_sets):
+            continue
+        seen_exact.add(exact)
+        kept_word_sets.append(word_set)
+        kept.append(unit)
+    return kept
+
+
+def _rank(units: List[Unit], topic: str) -> List[int]:
+    """Indices of non-heading units, most central first."""
+    frequencies = Counter(word for unit in units if not unit.heading for word in set(unit.words))
+    topic_words = set(_words(topic))
+    scores = {}
+    for index, unit in enumerate(units):
+        if unit.heading or not unit.words:
+            continue
+        distinct = set(unit.words)
+        centrality = sum(frequencies[word] for word in distinct) / math.sqrt(len(unit.words))
+        topical = 1 + len(distinct & topic_words)
+        # Slight preference for earlier points, which tend to be the key findings
+        position = 1 + 0.5 / (1 + index)
+        scores[index] = centrality * topical * position
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def _join(units: List[Unit]) -> str:
+    return "\n".join(unit.text for unit in units)
+
+
+def compact(text: str, budget_tokens: int, topic: str = "") -> CompactionResult:
+    """Compact research text to roughly ``budget_tokens`` tokens."""
+    original_tokens = estimate_tokens(text)
+    units = split_units(text)
+    cleaned = [unit for unit in units if not is_boilerplate(unit.text)]
+    deduped = _dedupe(cleaned)
+    result = CompactionResult(
+        text="",
+        original_tokens=original_tokens,
+        compacted_tokens=0,
+        budget_tokens=budget_tokens,
+        boilerplate_removed=len(units) - len(cleaned),
+        duplicates_removed=len(cleaned) - len(deduped),
+    )
+
+    selected: List[Unit] = deduped
+    if budget_tokens > 0 and sum(unit.tokens for unit in deduped) > budget_tokens:
+        chosen: Set[int] = set()
+        sections: Set[int] = set()
+        used = 0
+        for index in _rank(deduped, topic):
+            unit = deduped[index]
+            # Reserve room for the section heading the first time a section is used
+            heading = next((u for u in deduped if u.heading and u.section == unit.section), None)
+            cost = unit.tokens + (heading.tokens if heading and unit.section not in sections else 0)
+            if used + cost > budget_tokens:
+                continue
+            chosen.add(index)
+            sections.add(unit.section)
+            used += cost
+        selected = [unit for index, unit in enumerate(deduped)
+                    if index in chosen or (unit.heading and unit.section in sections)]
+        result.ranked_out = sum(1 for unit in deduped if not unit.heading) - len(chosen)
+
+    result.text = _join(selected)
+    result.compacted_tokens = estimate_tokens(result.text)
+    return result
+
+
+def compact_research(text: str, budget_tokens: int, topic: str = "") -> Optional[CompactionResult]:
+    """Compact research for the writer, returning None when compaction is disabled or unhelpful."""
+    if budget_tokens <= 0 or not text.strip():
+        return None
+    result = compact(text, budget_tokens, topic)
+    if not result.text.strip():
+        # Never hand the writer nothing; fall back to the full research
+        return None
+    logger.info(
+        f"Compacted research from {result.original_tokens} to {result.compacted_tokens} tokens "
+        f"({result.savings_ratio:.0%} saved; budget {budget_tokens})"
+    )
+    return result
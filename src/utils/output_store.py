@@ -0,0 +1,255 @@
+"""
+Content-addressed storage for generated research summaries and keynote speeches.
+
+Every topic maps to a stable hash key, and all artifacts for that topic live in
+``OUTPUTS_DIR/<key>/``. Files are written atomically (temp file + rename), so a
+reader sees either the previous version or the new one, never a partial write.
+
+Artifacts can be written and read in chunks, and read back one page at a time,
+so very long generations never need to be held in memory as a whole to be
+copied, served or displayed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Union
+
+from src.config.settings import OUTPUTS_DIR
+from src.utils.atomic_files import atomic_write_text, atomic_writer
+
+logger = logging.getLogger(__name__)
+
+# Artifact kinds and the file names they are stored under
+ARTIFACT_FILES = {
+    "research": "research_summary.txt",
+    "keynote": "keynote_speech.txt",
+}
+
+META_FILE = "meta.json"
+INDEX_FILE = "index.json"
+INDEX_LOCK_FILE = ".index.lock"
+
+# Locks older than this are considered abandoned by a crashed writer
+STALE_LOCK_SECONDS = 30
+
+# Characters per chunk when streaming an artifact
+STREAM_CHUNK_CHARS = 64 * 1024
+
+
+def normalize_topic(topic: str) -> str:
+    """Normalize a topic so trivial case/whitespace differences share a key."""
+    return " ".join(topic.lower().split())
+
+
+def topic_key(topic: str) -> str:
+    """Return the content-addressed key for a topic."""
+    return hashlib.sha256(normalize_topic(topic).encode("utf-8")).hexdigest()[:24]
+
+
+def iter_text_file(path: Path, chunk_chars: int = STREAM_CHUNK_CHARS) -> Iterator[str]:
+    """Yield a text file in chunks; yields nothing if it does not exist."""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for chunk in iter(lambda: f.read(chunk_chars), ""):
+                yield chunk
+    except FileNotFoundError:
+        return
+
+
+def page_offsets(path: Path, page_bytes: int) -> List[int]:
+    """
+    Byte offsets at which the pages of a text file start.
+
+    Pages hold about ``page_bytes`` bytes and end at a line break, so markdown
+    lines are not split; a line longer than a page is split at a character
+    boundary instead.
+    """
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return []
+    offsets = [0]
+    with open(path, "rb") as f:
+        while offsets[-1] + page_bytes < size:
+            f.seek(offsets[-1] + page_bytes)
+            # Extend the page to the end of its last line, but by no more than another page
+            rest = f.readline(page_bytes)
+            end = f.tell()
+            if not rest.endswith(b"\n") and end < size:
+                # Back up from the middle of a multi-byte character
+                f.seek(end)
+                while f.read(1)[0] & 0xC0 == 0x80:
+                    end -= 1
+                    f.seek(end)
+            if end >= size:
+                break
+            offsets.append(end)
+    return offsets
+
+
+def read_text_range(path: Path, start: int, end: Optional[int] = None) -> str:
+    """Read the bytes ``start:end`` of a text file, decoded; pages from ``page_offsets`` decode cleanly."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read(-1 if end is None else max(0, end - start))
+    except FileNotFoundError:
+        return ""
+    return data.decode("utf-8", errors="replace")
+
+
+def atomic_write_json(path: Path, data: Any) -> None:
+    """Serialize data as JSON and write it atomically."""
+    atomic_write_text(path, json.dumps(data, indent=2, sort_keys=True))
+
+
+def read_json(path: Path, default: Any = None) -> Any:
+    """Read a JSON file, returning ``default`` if it is missing or unreadable."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+class OutputStore:
+    """Hash-keyed artifact store with per-topic metadata and a global index."""
+
+    def __init__(self, root: Union[str, Path] = OUTPUTS_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.root / INDEX_FILE
+        self._lock_file = self.root / INDEX_LOCK_FILE
+
+    def entry_dir(self, topic: str) -> Path:
+        """Directory holding all artifacts for a topic."""
+        return self.root / topic_key(topic)
+
+    def artifact_path(self, topic: str, kind: str) -> Path:
+        """Path of the given artifact kind ("research" or "keynote") for a topic."""
+        if kind not in ARTIFACT_FILES:
+            raise ValueError(f"Unknown artifact kind: {kind}")
+        return self.entry_dir(topic) / ARTIFACT_FILES[kind]
+
+    def metadata_path(self, topic: str) -> Path:
+        """Path of the metadata sidecar for a topic."""
+        return self.entry_dir(topic) / META_FILE
+
+    def write_artifact(self, topic: str, kind: str, text: str) -> Path:
+        """Atomically write an artifact and return its path."""
+        path = self.artifact_path(topic, kind)
+        atomic_write_text(path, text)
+        logger.info(f"Saved {kind} artifact for topic key {topic_key(topic)}: {path}")
+        return path
+
+    @contextmanager
+    def artifact_writer(self, topic: str, kind: str) -> Iterator[IO[str]]:
+        """Stream an artifact to disk; readers see it only once the block completes."""
+        path = self.artifact_path(topic, kind)
+        with atomic_writer(path) as f:
+            yield f
+        logger.info(f"Saved {kind} artifact for topic key {topic_key(topic)}: {path}")
+
+    def read_artifact(self, topic: str, kind: str, max_chars: Optional[int] = None) -> str:
+        """Return the artifact text (at most ``max_chars`` of it), or an empty string if it does not exist."""
+        try:
+            with open(self.artifact_path(topic, kind), encoding="utf-8") as f:
+                return f.read(-1 if max_chars is None else max_chars)
+        except FileNotFoundError:
+            return ""
+
+    def iter_artifact(self, topic: str, kind: str, chunk_chars: int = STREAM_CHUNK_CHARS) -> Iterator[str]:
+        """Yield the artifact text in chunks, so large artifacts are never loaded whole."""
+        return iter_text_file(self.artifact_path(topic, kind), chunk_chars)
+
+    def read_metadata(self, topic: str) -> Optional[Dict[str, Any]]:
+        """Return the metadata sidecar for a topic, or None if there is none."""
+        return read_json(self.metadata_path(topic))
+
+    def write_metadata(self, topic: str, **fields: Any) -> Dict[str, Any]:
+        """Merge fields into the topic's metadata sidecar and update the index."""
+        # Held across the sidecar's read-modify-write too, so concurrent writers never drop each other's fields
+        with self._index_lock():
+            meta = self.read_metadata(topic) or {}
+            meta.update(fields)
+            meta["topic"] = topic
+            meta["key"] = topic_key(topic)
+            meta["updated_at"] = time.time()
+
+            # Record artifact modification times so readers can detect changes cheaply
+            artifacts = {}
+            for kind in ARTIFACT_FILES:
+                path = self.artifact_path(topic, kind)
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                artifacts[kind] = {"file": path.name, "mtime": stat.st_mtime, "size": stat.st_size}
+            meta["artifacts"] = artifacts
+
+            atomic_write_json(self.metadata_path(topic), meta)
+            self._update_index(meta)
+        return meta
+
+    def list_entries(self) -> Dict[str, Dict[str, Any]]:
+        """Return the index, mapping topic keys to summary metadata."""
+        return read_json(self.index_file, default={}) or {}
+
+    def rebuild_index(self) -> Dict[str, Dict[str, Any]]:
+        """Rebuild the index from the metadata sidecars on disk."""
+        with self._index_lock():
+            index = {}
+            for meta_path in self.root.glob(f"*/{META_FILE}"):
+                meta = read_json(meta_path)
+                if meta and "key" in meta:
+                    index[meta["key"]] = self._index_record(meta)
+            atomic_write_json(self.index_file, index)
+        return index
+
+    @staticmethod
+    def _index_record(meta: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "topic": meta.get("topic"),
+            "model": meta.get("model"),
+            "status": meta.get("status"),
+            "updated_at": meta.get("updated_at"),
+            "artifacts": sorted(meta.get("artifacts", {})),
+        }
+
+    def _update_index(self, meta: Dict[str, Any]) -> None:
+        """Record one entry in the index; the caller holds the index lock."""
+        index = self.list_entries()
+        index[meta["key"]] = self._index_record(meta)
+        atomic_write_json(self.index_file, index)
+
+    @contextmanager
+    def _index_lock(self, timeout: float = 10.0):
+        """Cross-process lock around index read-modify-write cycles."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(str(self._lock_file), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - self._lock_file.stat().st_mtime > STALE_LOCK_SECONDS:
+                        logger.warning("Removing stale output index lock")
+                        self._lock_file.unlink()
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for index lock: {self._lock_file}")
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            try:
+                self._lock_file.unlink()
+            except FileNotFoundError:
+                pass
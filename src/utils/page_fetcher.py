@@ -0,0 +1,269 @@
+"""
+Concurrent download and main-text extraction of search result pages.
+
+Pages are fetched with a bounded asynchronous HTTP client, reduced to their
+main text (scripts, navigation, footers and other chrome removed) and then
+condensed to a token budget with the local compaction stage. Pages are
+cached on disk by URL together with their ETag/Last-Modified validators, so
+repeated searches reuse them and stale entries are revalidated with a cheap
+conditional request instead of a full download.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from src.config.settings import (
+    PAGE_CACHE_DIR,
+    PAGE_CACHE_TTL_SECONDS,
+    PAGE_CONTENT_TOKENS,
+    PAGE_FETCH_CONCURRENCY,
+    PAGE_FETCH_TIMEOUT_SECONDS,
+    PAGE_FETCH_TOP_N,
+)
+from src.utils.compaction import compact
+from src.utils.output_store import atomic_write_json, read_json
+
+logger = logging.getLogger(__name__)
+
+# Responses larger than this are truncated before extraction
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+# Text blocks shorter than this many words are usually menus, captions or buttons
+MIN_BLOCK_WORDS = 8
+
+USER_AGENT = "Mozilla/5.0 (compatible; KeynoteGenie/0.1; +https://github.com/sachdh-anand/StreamCrew)"
+
+# Elements whose content is never main text
+SKIPPED_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "nav", "header", "footer",
+    "aside", "form", "button", "select", "iframe",
+})
+
+# Elements that end a block of text
+BLOCK_TAGS = frozenset({
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "br", "tr", "td",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "figcaption",
+})
+
+# Key added to enriched search results
+CONTENT_KEY = "page_content"
+
+
+class _MainTextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[str] = []
+        self.title = ""
+        self._current: List[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "title":
+            self._in_title = False
+        elif tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth:
+            self._current.append(data)
+
+    def _flush(self):
+        block = " ".join("".join(self._current).split())
+        self._current = []
+        if block:
+            self.blocks.append(block)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def extract_main_text(html: str) -> str:
+    """Return the main text of an HTML page, one block per line."""
+    parser = _MainTextParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception as e:  # Malformed markup should not lose what was parsed
+        logger.debug(f"HTML parse error: {str(e)}")
+    blocks = [block for block in parser.blocks if len(block.split()) >= MIN_BLOCK_WORDS]
+    return "\n".join(blocks)
+
+
+@dataclass
+class Page:
+    url: str
+    text: str
+    status: int
+    from_cache: bool = False
+    error: Optional[str] = None
+
+
+class PageCache:
+    """On-disk cache of extracted page text with HTTP validators."""
+
+    def __init__(self, cache_dir: Union[str, Path] = PAGE_CACHE_DIR, ttl_seconds: float = PAGE_CACHE_TTL_SECONDS):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]}.json"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        return read_json(self._path(url))
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry.get("fetched_at", 0) <= self.ttl_seconds
+
+    def put(self, url: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        try:
+            atomic_write_json(self._path(url), {
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": time.time(),
+                "text": text,
+            })
+        except OSError as e:
+            logger.warning(f"Could not cache page {url}: {str(e)}")
+
+
+class PageFetcher:
+    """Downloads pages concurrently, at most ``concurrency`` at a time."""
+
+    def __init__(self, cache: Optional[PageCache] = None, concurrency: int = PAGE_FETCH_CONCURRENCY,
+                 timeout: float = PAGE_FETCH_TIMEOUT_SECONDS):
+        self.cache = cache or PageCache()
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+
+    async def _fetch(self, client: Any, semaphore: asyncio.Semaphore, url: str) -> Page:
+        cached = self.cache.get(url)
+        if cached and self.cache.is_fresh(cached):
+            return Page(url, cached["text"], 200, from_cache=True)
+
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        async with semaphore:
+            try:
+                status, content_type, etag, last_modified, body = await self._download(client, url, headers)
+            except Exception as e:
+                logger.info(f"Could not fetch {url}: {str(e)}")
+                return Page(url, cached["text"] if cached else "", 0, from_cache=bool(cached), error=str(e))
+
+        if status == 304 and cached:
+            # Unchanged; refresh the entry's age without downloading the page again
+            self.cache.put(url, cached["text"], cached.get("etag"), cached.get("last_modified"))
+            return Page(url, cached["text"], 304, from_cache=True)
+        if status != 200:
+            # An outdated copy is more useful to the researcher than nothing
+            return Page(url, cached["text"] if cached else "", status,
+                        from_cache=bool(cached), error=f"HTTP {status}")
+        if body is None:
+            return Page(url, "", status, error=f"Unsupported content type: {content_type}")
+
+        text = extract_main_text(body) if "html" in content_type else body
+        self.cache.put(url, text, etag, last_modified)
+        return Page(url, text, 200)
+
+    @staticmethod
+    async def _download(client: Any, url: str, headers: Dict[str, str]):
+        """Stream a page, reading at most MAX_PAGE_BYTES of text or HTML."""
+        async with client.stream("GET", url, headers=headers) as response:
+            content_type = response.headers.get("content-type", "")
+            etag = response.headers.get("etag")
+            last_modified = response.headers.get("last-modified")
+            if response.status_code != 200 or ("html" not in content_type and not content_type.startswith("text/")):
+                return response.status_code, content_type, etag, last_modified, None
+
+            chunks, size = [], 0
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= MAX_PAGE_BYTES:
+                    break
+            body = b"".join(chunks)[:MAX_PAGE_BYTES].decode(response.encoding or "utf-8", errors="replace")
+            return response.status_code, content_type, etag, last_modified, body
+
+    async def fetch_all(self, urls: Iterable[str]) -> Dict[str, Page]:
+        """Fetch distinct URLs concurrently, keyed by URL."""
+        import httpx
+
+        unique = list(dict.fromkeys(url for url in urls if url))
+        if not unique:
+            return {}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits, follow_redirects=True,
+                                     headers={"User-Agent": USER_AGENT}) as client:
+            pages = await asyncio.gather(*(self._fetch(client, semaphore, url) for url in unique))
+        return {page.url: page for page in pages}
+
+    def fetch(self, urls: Iterable[str]) -> Dict[str, Page]:
+        """Blocking wrapper around ``fetch_all``, safe to call from inside a running event loop."""
+        urls = list(urls)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.fetch_all(urls))
+
+        # Tools may be called from an async agent; run the fetch on its own loop
+        result: Dict[str, Page] = {}
+        worker = threading.Thread(target=lambda: result.update(asyncio.run(self.fetch_all(urls))))
+        worker.start()
+        worker.join()
+        return result
+
+
+def enrich_search_results(result: Any, fetcher: PageFetcher, query: str = "",
+                          top_n: int = PAGE_FETCH_TOP_N, content_tokens: int = PAGE_CONTENT_TOKENS) -> int:
+    """
+    Add condensed page text to the top organic results of a Serper-style response.
+
+    The response is updated in place and the number of results enriched is
+    returned. Results that already carry page content are left as they are, so
+    enriching a cached response again is cheap.
+    """
+    if top_n <= 0 or not isinstance(result, dict):
+        return 0
+    targets = [item for item in result.get("organic", [])[:top_n]
+               if isinstance(item, dict) and item.get("link") and CONTENT_KEY not in item]
+    if not targets:
+        return 0
+
+    start = time.perf_counter()
+    pages = fetcher.fetch(item["link"] for item in targets)
+    enriched = 0
+    for item in targets:
+        page = pages.get(item["link"])
+        if page and page.text:
+            item[CONTENT_KEY] = compact(page.text, content_tokens, topic=query).text
+            enriched += 1
+    cached = sum(1 for page in pages.values() if page.from_cache)
+    logger.info(f"Enriched {enriched}/{len(targets)} search results with page text "
+                f"({cached} from cache) in {time.perf_counter() - start:.2f}s")
+    return enriched
@@ -0,0 +1,130 @@
+"""
+Subprocess runner that drains stdout/stderr on background threads.
+
+The child's output is kept in a bounded ring buffer for live display and written
+in full to a log file, so a chatty child can never fill the OS pipe buffer and
+block, and the parent's memory use stays constant however long the run is.
+"""
+
+import collections
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import IO, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+from src.config.settings import LOGS_DIR
+
+# Number of recent output lines kept in memory for the live tail
+DEFAULT_TAIL_LINES = 200
+
+RUN_LOGS_DIR = LOGS_DIR / "runs"
+
+# Colored console output from the child is stripped before buffering
+ANSI_ESCAPE_PATTERN = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+
+class ProcessRunner:
+    """Run a command with both output pipes drained into a ring buffer and a log file."""
+
+    def __init__(self, args: Sequence[str], cwd: Optional[Union[str, Path]] = None,
+                 env: Optional[Dict[str, str]] = None, log_path: Optional[Union[str, Path]] = None,
+                 tail_lines: int = DEFAULT_TAIL_LINES):
+        self.args = list(args)
+        self.cwd = cwd
+        self.env = env
+        if log_path is None:
+            RUN_LOGS_DIR.mkdir(parents=True, exist_ok=True)
+            log_path = RUN_LOGS_DIR / f"agent_{time.strftime('%Y%m%d-%H%M%S')}_{id(self):x}.log"
+        self.log_path = Path(log_path)
+        self._tail: Deque[Tuple[str, str]] = collections.deque(maxlen=tail_lines)
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._log_file: Optional[IO[str]] = None
+        self.process: Optional[subprocess.Popen] = None
+        self.started_at: Optional[float] = None
+
+    def start(self) -> "ProcessRunner":
+        """Launch the child process and start draining its output."""
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._log_file = open(self.log_path, "w", encoding="utf-8")
+        self.started_at = time.time()
+        try:
+            self.process = subprocess.Popen(
+                self.args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+                cwd=self.cwd,
+                env=self.env,
+            )
+        except BaseException:
+            # Nothing will drain into the log, so don't leak its handle
+            self._log_file.close()
+            raise
+        for name, stream in (("stdout", self.process.stdout), ("stderr", self.process.stderr)):
+            thread = threading.Thread(target=self._drain, args=(name, stream), daemon=True,
+                                      name=f"runner-{name}-{self.process.pid}")
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def _drain(self, name: str, stream: IO[str]) -> None:
+        try:
+            for line in iter(stream.readline, ""):
+                line = ANSI_ESCAPE_PATTERN.sub("", line.rstrip("\n"))
+                with self._lock:
+                    self._tail.append((name, line))
+                    if self._log_file and not self._log_file.closed:
+                        self._log_file.write(f"[{name}] {line}\n")
+        finally:
+            stream.close()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self.process.returncode if self.process else None
+
+    def poll(self) -> Optional[int]:
+        """Return the exit code if the child has finished, otherwise None."""
+        if self.process is None:
+            return None
+        code = self.process.poll()
+        if code is not None:
+            self._finish()
+        return code
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Block until the child exits and all output has been drained."""
+        code = self.process.wait(timeout=timeout)
+        self._finish()
+        return code
+
+    def terminate(self) -> None:
+        """Stop the child process if it is still running."""
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+
+    def tail(self, lines: Optional[int] = None, stream: Optional[str] = None) -> List[str]:
+        """Return the most recent output lines, optionally for one stream only."""
+        with self._lock:
+            entries = [line for name, line in self._tail if stream is None or name == stream]
+        return entries[-lines:] if lines else entries
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self.started_at if self.started_at else 0.0
+
+    def _finish(self) -> None:
+        for thread in self._threads:
+            thread.join(timeout=5)
+        with self._lock:
+            if self._log_file and not self._log_file.closed:
+                self._log_file.close()
@@ -0,0 +1,456 @@
+"""
+Opt-in resource profiler for research runs.
+
+While a run is profiled, a background thread samples it every
+``PROFILE_INTERVAL`` seconds. Each sample records the run thread's Python
+stack, the CPU time the thread used since the previous sample, and the
+process RSS. Every stack is weighted by both wall time and CPU time. That
+separates busy code (prompt assembly, output parsing, logging) from waiting
+code (network calls to the LLM or search provider): a function with a lot of
+wall time but little CPU time is waiting. Samples are also attributed to a
+component: the innermost package or repo module on the stack that is not
+standard library, such as ``crewai``, ``litellm`` or ``src.utils.logger``.
+
+Each profile is written to ``PROFILES_DIR/<run id>.json`` and records:
+
+- wall, process and thread CPU time
+- start, end and peak RSS
+- the hottest functions and components
+- optionally, tracemalloc's top allocation sites
+
+Next to it, ``<run id>.folded`` holds collapsed stacks for flame graph tools
+(speedscope, flamegraph.pl), and optionally ``<run id>.pstats`` holds cProfile
+output.
+
+Sampling only reads frames and never traces calls, so it is cheap enough to
+leave on in production. ``KEYNOTEGENIE_PROFILE=0.05`` profiles 5% of runs.
+tracemalloc and cProfile slow every call down, so they are separate opt-ins.
+
+    KEYNOTEGENIE_PROFILE=1 python src/agents/agent.py "Edge AI"
+    python scripts/profiles.py summary --sort self_cpu_s
+    python scripts/profiles.py runs
+"""
+
+import argparse
+import collections
+import contextlib
+import cProfile
+import json
+import logging
+import os
+import random
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.config.settings import (
+    PROFILE_ALL_THREADS,
+    PROFILE_CPROFILE,
+    PROFILE_INTERVAL,
+    PROFILE_KEEP,
+    PROFILE_RATE,
+    PROFILE_TRACEMALLOC,
+    PROFILES_DIR,
+    ROOT_DIR,
+)
+from src.utils.output_store import atomic_write_json, atomic_write_text, read_json
+
+logger = logging.getLogger(__name__)
+
+# Deeper frames are dropped from sampled stacks
+MAX_STACK_DEPTH = 64
+# Distinct stacks kept for the flame graph; rarer ones beyond this are counted together
+MAX_STACKS = 5000
+# Functions saved per metric, and allocation sites saved, per profile
+TOP_FUNCTIONS = 100
+TOP_ALLOCATIONS = 25
+
+METRICS = ("self_wall_s", "self_cpu_s", "total_wall_s", "total_cpu_s")
+STDLIB_COMPONENT = "stdlib"
+
+_ROOT = str(ROOT_DIR.resolve()) + os.sep
+_STDLIB = sysconfig.get_paths()["stdlib"] + os.sep
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (Linux), or None where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Peak RSS of this process since it started."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def short_path(filename: str) -> Tuple[str, str]:
+    """Path of a source file relative to the repo, site-packages or stdlib, and its component."""
+    if filename.startswith(_ROOT):
+        short = filename[len(_ROOT):]
+        return short, os.path.splitext(short)[0].replace(os.sep, ".")
+    if "site-packages" in filename:
+        short = filename.split("site-packages" + os.sep, 1)[-1]
+        return short, short.split(os.sep, 1)[0].split(".", 1)[0]
+    if filename.startswith(_STDLIB):
+        return filename[len(_STDLIB):], STDLIB_COMPONENT
+    # Frozen and generated code ("<frozen importlib._bootstrap>") belongs to the interpreter
+    return filename, STDLIB_COMPONENT if filename.startswith("<") else "other"
+
+
+def describe_code(filename: str, qualname: str, line: int) -> Tuple[str, str]:
+    """Display name and component of a function, from its file and name."""
+    short, component = short_path(filename)
+    return f"{qualname} ({short}:{line})", component
+
+
+class RunProfiler:
+    """Samples one run's stacks, CPU time and memory, and writes its profile when stopped."""
+
+    def __init__(self, run_id: str, topic: str = "", interval: float = PROFILE_INTERVAL,
+                 output_dir: Path = PROFILES_DIR, all_threads: bool = PROFILE_ALL_THREADS,
+                 trace_allocations: bool = PROFILE_TRACEMALLOC, use_cprofile: bool = PROFILE_CPROFILE):
+        self.run_id = run_id
+        self.topic = topic
+        self.interval = max(0.001, interval)
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / f"{run_id}.json"
+        self.all_threads = all_threads
+        self.trace_allocations = trace_allocations
+        self.use_cprofile = use_cprofile
+        self.samples = 0
+        self._names: Dict[Any, Tuple[str, str]] = {}
+        self._functions: Dict[str, List[float]] = collections.defaultdict(lambda: [0.0] * len(METRICS))
+        self._components: Dict[str, List[float]] = collections.defaultdict(lambda: [0.0, 0.0])
+        self._stacks: Dict[str, float] = collections.Counter()
+        self._cpu_clocks: Dict[int, Optional[int]] = {}
+        self._last_cpu: Dict[int, float] = {}
+        self._cpu_available = True
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._started_tracing = False
+
+    def __enter__(self) -> "RunProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop(error=(str(exc) or exc_type.__name__) if exc is not None else None)
+
+    def start(self) -> None:
+        self._thread_id = threading.get_ident()
+        self._started_at = time.time()
+        self._wall_start = time.perf_counter()
+        self._process_cpu_start = time.process_time()
+        self._thread_cpu_start = time.thread_time()
+        self._rss_start = _rss_bytes()
+        self._rss_peak = self._rss_start or 0
+        if self.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+        if self.use_cprofile:
+            # cProfile traces only the thread that enables it, which is the run thread
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._sampler = threading.Thread(target=self._sample_loop, name=f"profiler-{self.run_id}", daemon=True)
+        self._sampler.start()
+
+    # Sampling
+
+    def _thread_cpu(self, thread_id: int) -> Optional[float]:
+        """CPU seconds a thread has used, where the platform can tell."""
+        if thread_id not in self._cpu_clocks:
+            try:
+                self._cpu_clocks[thread_id] = time.pthread_getcpuclockid(thread_id)
+            except (AttributeError, OSError):
+                self._cpu_clocks[thread_id] = None
+        clock = self._cpu_clocks[thread_id]
+        if clock is None:
+            return None
+        try:
+            return time.clock_gettime(clock)
+        except OSError:
+            return None
+
+    def _sample_loop(self) -> None:
+        last = time.perf_counter()
+        for thread_id in self._threads(sys._current_frames()):
+            cpu = self._thread_cpu(thread_id)
+            if cpu is not None:
+                self._last_cpu[thread_id] = cpu
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            try:
+                self._sample(now - last)
+            except Exception as e:
+                logger.debug(f"Profiler sample failed: {str(e)}")
+            last = now
+
+    def _threads(self, frames: Dict[int, Any]) -> List[int]:
+        if not self.all_threads:
+            return [self._thread_id] if self._thread_id in frames else []
+        own = threading.get_ident()
+        return [thread_id for thread_id in frames if thread_id != own]
+
+    def _sample(self, wall: float) -> None:
+        frames = sys._current_frames()
+        for thread_id in self._threads(frames):
+            cpu_now = self._thread_cpu(thread_id)
+            if cpu_now is None:
+                self._cpu_available = False
+                cpu = 0.0
+            else:
+                cpu = max(0.0, min(wall, cpu_now - self._last_cpu.get(thread_id, cpu_now)))
+                self._last_cpu[thread_id] = cpu_now
+            self._record(frames[thread_id], wall, cpu)
+        del frames
+        rss = _rss_bytes()
+        if rss is not None:
+            self._rss_peak = max(self._rss_peak, rss)
+        self.samples += 1
+
+    def _describe(self, code: Any) -> Tuple[str, str]:
+        names = self._names.get(code)
+        if names is None:
+            names = describe_code(code.co_filename, getattr(code, "co_qualname", code.co_name), code.co_firstlineno)
+            self._names[code] = names
+        return names
+
+    def _record(self, frame: Any, wall: float, cpu: float) -> None:
+        stack = []  # innermost frame first
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            stack.append(self._describe(frame.f_code))
+            frame = frame.f_back
+        if not stack:
+            return
+        leaf = self._functions[stack[0][0]]
+        leaf[0] += wall
+        leaf[1] += cpu
+        for name in {name for name, _ in stack}:
+            totals = self._functions[name]
+            totals[2] += wall
+            totals[3] += cpu
+        component = next((c for _, c in stack if c != STDLIB_COMPONENT), STDLIB_COMPONENT)
+        self._components[component][0] += wall
+        self._components[component][1] += cpu
+        folded = ";".join(name for name, _ in reversed(stack))
+        if folded in self._stacks or len(self._stacks) < MAX_STACKS:
+            self._stacks[folded] += wall
+        else:
+            self._stacks["[other stacks]"] += wall
+
+    # Results
+
+    def stop(self, error: Optional[str] = None) -> Optional[Path]:
+        """Stop sampling and write the profile; returns its path, or None if it could not be written."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        try:
+            return self._write(error)
+        except Exception as e:
+            logger.warning(f"Could not write profile for run {self.run_id}: {str(e)}")
+            return None
+        finally:
+            if self._started_tracing:
+                tracemalloc.stop()
+
+    def _top_functions(self) -> List[Dict[str, Any]]:
+        keep = set()
+        for index in range(len(METRICS)):
+            ranked = sorted(self._functions.items(), key=lambda item: item[1][index], reverse=True)
+            keep.update(name for name, values in ranked[:TOP_FUNCTIONS] if values[index] > 0)
+        functions = [
+            dict({"name": name}, **{metric: round(value, 4) for metric, value in zip(METRICS, self._functions[name])})
+            for name in keep
+        ]
+        return sorted(functions, key=lambda f: f["self_wall_s"], reverse=True)
+
+    def _allocations(self) -> Optional[Dict[str, Any]]:
+        if not self.trace_allocations or not tracemalloc.is_tracing():
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:TOP_ALLOCATIONS]
+        return {
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "top": [{"location": f"{short_path(s.traceback[0].filename)[0]}:{s.traceback[0].lineno}",
+                     "size_bytes": s.size, "count": s.count} for s in stats],
+        }
+
+    def _write(self, error: Optional[str]) -> Path:
+        wall = time.perf_counter() - self._wall_start
+        process_cpu = time.process_time() - self._process_cpu_start
+        files = {"folded": f"{self.run_id}.folded", "pstats": None}
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            files["pstats"] = f"{self.run_id}.pstats"
+
+        profile = {
+            "run_id": self.run_id,
+            "topic": self.topic,
+            "status": "failed" if error else "complete",
+            "error": error,
+            "started_at": self._started_at,
+            "interval_s": self.interval,
+            "threads": "all" if self.all_threads else "run",
+            "samples": self.samples,
+            "wall_s": round(wall, 3),
+            "process_cpu_s": round(process_cpu, 3),
+            "thread_cpu_s": round(time.thread_time() - self._thread_cpu_start, 3),
+            "cpu_utilization": round(process_cpu / wall, 3) if wall else 0.0,
+            "cpu_time_available": self._cpu_available,
+            "rss_start_bytes": self._rss_start,
+            "rss_end_bytes": _rss_bytes(),
+            "rss_peak_bytes": self._rss_peak or None,
+            "process_peak_rss_bytes": _peak_rss_bytes(),
+            "components": {
+                name: {"wall_s": round(wall_s, 4), "cpu_s": round(cpu_s, 4)}
+                for name, (wall_s, cpu_s) in sorted(self._components.items(), key=lambda i: i[1][0], reverse=True)
+            },
+            "functions": self._top_functions(),
+            "allocations": self._allocations(),
+            "files": files,
+        }
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(str(self.output_dir / files["pstats"]))
+        # Collapsed stacks weighted in milliseconds of wall time
+        atomic_write_text(self.output_dir / files["folded"], "".join(
+            f"{stack} {max(1, round(weight * 1000))}\n" for stack, weight in self._stacks.items()
+        ))
+        atomic_write_json(self.path, profile)
+        logger.info(f"Profile for run {self.run_id}: {profile['wall_s']}s wall, {profile['process_cpu_s']}s CPU, "
+                    f"peak RSS {(self._rss_peak or 0) / 2 ** 20:.0f} MiB -> {self.path}")
+        prune_profiles(self.output_dir)
+        return self.path
+
+
+@contextlib.contextmanager
+def profile_run(run_id: str, topic: str = "", rate: float = PROFILE_RATE) -> Iterator[Optional[RunProfiler]]:
+    """Profile the enclosed run with probability ``rate``; yields the profiler, or None if not profiled."""
+    if rate <= 0 or random.random() >= rate:
+        yield None
+        return
+    profiler = RunProfiler(run_id, topic)
+    try:
+        profiler.start()
+    except Exception as e:
+        # Profiling must never stop a run
+        logger.warning(f"Could not start profiler: {str(e)}")
+        yield None
+        return
+    try:
+        yield profiler
+    except BaseException as e:
+        profiler.stop(error=str(e) or type(e).__name__)
+        raise
+    profiler.stop()
+
+
+def prune_profiles(directory: Path = PROFILES_DIR, keep: int = PROFILE_KEEP) -> int:
+    """Delete all but the ``keep`` most recent profiles and their side files."""
+    profiles = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in profiles[keep:]:
+        for suffix in (".json", ".folded", ".pstats"):
+            with contextlib.suppress(FileNotFoundError):
+                path.with_suffix(suffix).unlink()
+    return max(0, len(profiles) - keep)
+
+
+def load_profiles(directory: Path = PROFILES_DIR, last: Optional[int] = None,
+                  topic: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Saved profiles, oldest first, optionally only the ``last`` N or those of one topic."""
+    profiles = [p for p in (read_json(path) for path in directory.glob("*.json")) if isinstance(p, dict)]
+    if topic:
+        profiles = [p for p in profiles if topic.lower() in (p.get("topic") or "").lower()]
+    profiles.sort(key=lambda p: p.get("started_at", 0))
+    return profiles[-last:] if last else profiles
+
+
+def summarize(profiles: Sequence[Dict[str, Any]], sort: str = "self_wall_s") -> Dict[str, Any]:
+    """Aggregate function and component times across profiles, hottest first by ``sort``."""
+    functions: Dict[str, Dict[str, float]] = {}
+    components: Dict[str, Dict[str, float]] = {}
+    for profile in profiles:
+        for function in profile.get("functions", []):
+            totals = functions.setdefault(function["name"], dict.fromkeys(METRICS + ("runs",), 0))
+            for metric in METRICS:
+                totals[metric] += function.get(metric, 0)
+            totals["runs"] += 1
+        for name, times in profile.get("components", {}).items():
+            totals = components.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0})
+            totals["wall_s"] += times["wall_s"]
+            totals["cpu_s"] += times["cpu_s"]
+    return {
+        "runs": len(profiles),
+        "wall_s": sum(p.get("wall_s", 0) for p in profiles),
+        "process_cpu_s": sum(p.get("process_cpu_s", 0) for p in profiles),
+        "functions": sorted(({"name": k, **v} for k, v in functions.items()), key=lambda f: f[sort], reverse=True),
+        "components": sorted(({"name": k, **v} for k, v in components.items()), key=lambda c: c["wall_s"],
+                             reverse=True),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize KeynoteGenie run profiles")
+    parser.add_argument("--dir", type=Path, default=PROFILES_DIR, help="Profiles directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    summary = subparsers.add_parser("summary", help="Rank the hottest functions and components across runs")
+    summary.add_argument("--sort", choices=METRICS, default="self_wall_s")
+    summary.add_argument("--limit", type=int, default=25)
+    summary.add_argument("--last", type=int, help="Only the most recent N runs")
+    summary.add_argument("--topic", help="Only runs whose topic contains this text")
+    summary.add_argument("--json", action="store_true", help="Print the summary as JSON")
+
+    runs = subparsers.add_parser("runs", help="List profiled runs")
+    runs.add_argument("--last", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.command == "runs":
+        print(f"{'run':<26} {'wall s':>8} {'cpu s':>8} {'cpu %':>6} {'peak MiB':>9} {'samples':>8}  topic")
+        for p in load_profiles(args.dir, args.last):
+            print(f"{p['run_id']:<26} {p['wall_s']:>8.2f} {p['process_cpu_s']:>8.2f} "
+                  f"{p['cpu_utilization'] * 100:>6.0f} {(p.get('rss_peak_bytes') or 0) / 2 ** 20:>9.0f} "
+                  f"{p['samples']:>8}  {p.get('topic', '')}")
+        return 0
+
+    result = summarize(load_profiles(args.dir, args.last, args.topic), args.sort)
+    if args.json:
+        print(json.dumps(dict(result, functions=result["functions"][:args.limit]), indent=2))
+        return 0
+    if not result["runs"]:
+        print(f"No profiles in {args.dir}; run with KEYNOTEGENIE_PROFILE=1 to record some")
+        return 0
+
+    wall, cpu = result["wall_s"], result["process_cpu_s"]
+    print(f"{result['runs']} runs, {wall:.1f}s wall, {cpu:.1f}s CPU ({cpu / wall * 100 if wall else 0:.0f}% busy)\n")
+    print(f"{'component':<40} {'wall s':>9} {'cpu s':>9} {'wall %':>7}")
+    for c in result["components"][:10]:
+        print(f"{c['name'][:40]:<40} {c['wall_s']:>9.2f} {c['cpu_s']:>9.2f} "
+              f"{c['wall_s'] / wall * 100 if wall else 0:>7.1f}")
+    print(f"\n{'self wall':>9} {'self cpu':>9} {'tot wall':>9} {'tot cpu':>9} {'runs':>5}  function")
+    for f in result["functions"][:args.limit]:
+        print(f"{f['self_wall_s']:>9.2f} {f['self_cpu_s']:>9.2f} {f['total_wall_s']:>9.2f} "
+              f"{f['total_cpu_s']:>9.2f} {f['runs']:>5}  {f['name']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Topic-level result cache with TTL and stale-while-revalidate semantics.
+
+A completed run in the output store is the cache entry; its age is measured
+from when the run finished. Results younger than the TTL are fresh and served
+as-is. Older results are served immediately while a background run refreshes
+them, until the stale window also runs out and the topic must be re-run.
+Pinned topics never fall out of the stale window, so hot topics are always
+answered from disk.
+
+    python scripts/result_cache.py status
+    python scripts/result_cache.py pin "Quantum computing in finance"
+    python scripts/result_cache.py warm            # refresh pinned topics that are not fresh
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from src.config.settings import (
+    DEFAULT_RESEARCH_TOPIC,
+    PINNED_TOPICS_FILE,
+    RESULT_CACHE_STALE_SECONDS,
+    RESULT_CACHE_TTL_SECONDS,
+    ROOT_DIR,
+    SRC_DIR,
+)
+from src.utils.output_store import OutputStore, atomic_write_json, read_json, topic_key
+from src.utils.process_runner import ProcessRunner
+
+logger = logging.getLogger(__name__)
+
+# Cache states, from best to worst
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+MISS = "miss"
+
+# A "running" status older than this is assumed to belong to a crashed run
+REFRESH_TIMEOUT_SECONDS = 30 * 60
+
+# Background refreshes allowed at once, so warming many topics cannot swamp the APIs
+DEFAULT_MAX_CONCURRENT_REFRESHES = 2
+
+
+class CacheLookup(NamedTuple):
+    topic: str
+    state: str
+    age_s: Optional[float]
+    pinned: bool
+    refreshing: bool
+
+    @property
+    def servable(self) -> bool:
+        """Whether the stored result may be shown without running the crew first."""
+        return self.state in (FRESH, STALE)
+
+
+class ResultCache:
+    """Freshness policy and pin list over the completed runs in an output store."""
+
+    def __init__(self, store: OutputStore, ttl_seconds: float = RESULT_CACHE_TTL_SECONDS,
+                 stale_seconds: float = RESULT_CACHE_STALE_SECONDS, pins_file=PINNED_TOPICS_FILE):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.pins_file = pins_file
+        self._lock = threading.Lock()
+
+    def lookup(self, topic: str, now: Optional[float] = None) -> CacheLookup:
+        """Classify the stored result for a topic."""
+        now = time.time() if now is None else now
+        pinned = self.is_pinned(topic)
+        meta = self.store.read_metadata(topic) or {}
+        refreshing = self._is_running(meta, now)
+
+        # Timings are only written by a successful run and survive later failed or running ones
+        finished_at = meta.get("timings", {}).get("finished_at")
+        has_artifacts = all(kind in meta.get("artifacts", {}) for kind in ("research", "keynote"))
+        if not finished_at or not has_artifacts:
+            return CacheLookup(topic, MISS, None, pinned, refreshing)
+
+        age = max(0.0, now - finished_at)
+        if age <= self.ttl_seconds:
+            state = FRESH
+        elif pinned or age <= self.ttl_seconds + self.stale_seconds:
+            state = STALE
+        else:
+            state = EXPIRED
+        return CacheLookup(topic, state, age, pinned, refreshing)
+
+    @staticmethod
+    def _is_running(meta: Dict, now: float) -> bool:
+        return meta.get("status") == "running" and now - meta.get("started_at", 0) < REFRESH_TIMEOUT_SECONDS
+
+    def pinned_topics(self) -> List[str]:
+        """Pinned topics; the default topic is pinned until the list is edited."""
+        pins = read_json(self.pins_file)
+        return [DEFAULT_RESEARCH_TOPIC] if pins is None else list(pins)
+
+    def is_pinned(self, topic: str) -> bool:
+        key = topic_key(topic)
+        return any(topic_key(pinned) == key for pinned in self.pinned_topics())
+
+    def pin(self, topic: str) -> None:
+        """Keep a topic servable regardless of age and include it in warm-ups."""
+        with self._lock:
+            if not self.is_pinned(topic):
+                atomic_write_json(self.pins_file, self.pinned_topics() + [topic.strip()])
+
+    def unpin(self, topic: str) -> None:
+        with self._lock:
+            key = topic_key(topic)
+            atomic_write_json(self.pins_file, [p for p in self.pinned_topics() if topic_key(p) != key])
+
+    def topics_to_warm(self, now: Optional[float] = None) -> List[str]:
+        """Pinned topics that are not fresh and not already being refreshed."""
+        lookups = (self.lookup(topic, now) for topic in self.pinned_topics())
+        return [lookup.topic for lookup in lookups if lookup.state != FRESH and not lookup.refreshing]
+
+
+def launch_agent(topic: str) -> ProcessRunner:
+    """Start the agent for a topic in a subprocess."""
+    env = os.environ.copy()
+    env["PYTHONUNBUFFERED"] = "1"
+    agent_path = SRC_DIR / "agents" / "agent.py"
+    return ProcessRunner([sys.executable, str(agent_path), topic], cwd=ROOT_DIR, env=env).start()
+
+
+class BackgroundRefresher:
+    """Starts at most one background run per topic, with a cap on concurrent runs."""
+
+    def __init__(self, launch: Callable[[str], Optional[ProcessRunner]] = launch_agent,
+                 max_concurrent: int = DEFAULT_MAX_CONCURRENT_REFRESHES):
+        self._launch = launch
+        self.max_concurrent = max_concurrent
+        self._runners: Dict[str, ProcessRunner] = {}
+        self._lock = threading.Lock()
+
+    def _prune(self) -> None:
+        for key, runner in list(self._runners.items()):
+            if runner.poll() is not None:
+                del self._runners[key]
+                if runner.returncode != 0:
+                    logger.warning(f"Background refresh failed (exit code {runner.returncode}); log: {runner.log_path}")
+
+    def refresh(self, topic: str) -> bool:
+        """Start a refresh for a topic unless one is running or the cap is reached."""
+        key = topic_key(topic)
+        with self._lock:
+            self._prune()
+            if key in self._runners or len(self._runners) >= self.max_concurrent:
+                return False
+            runner = self._launch(topic)
+            if runner is None:
+                return False
+            self._runners[key] = runner
+        logger.info(f"Started background refresh for topic: {topic}")
+        return True
+
+    def warm(self, topics: Sequence[str]) -> List[str]:
+        """Refresh as many of the topics as the cap allows; returns those started."""
+        return [topic for topic in topics if self.refresh(topic)]
+
+    def is_refreshing(self, topic: str) -> bool:
+        with self._lock:
+            self._prune()
+            return topic_key(topic) in self._runners
+
+    def active(self) -> List[ProcessRunner]:
+        with self._lock:
+            self._prune()
+            return list(self._runners.values())
+
+
+def _format_age(age_s: Optional[float]) -> str:
+    if age_s is None:
+        return "never"
+    for unit, seconds in (("d", 86400), ("h", 3600), ("m", 60)):
+        if age_s >= seconds:
+            return f"{age_s / seconds:.1f}{unit} ago"
+    return f"{age_s:.0f}s ago"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line interface for inspecting, pinning and warming cached topics."""
+    parser = argparse.ArgumentParser(description="Manage the topic result cache")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("status", help="Show pinned topics and their cache state")
+    for name, help_text in (("pin", "Pin a topic"), ("unpin", "Unpin a topic")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("topic", nargs="+")
+    warm_parser = subparsers.add_parser("warm", help="Refresh pinned (or given) topics that are not fresh")
+    warm_parser.add_argument("topic", nargs="*", help="Topics to warm (default: pinned topics)")
+    warm_parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_MAX_CONCURRENT_REFRESHES,
+                             help="Runs to execute at once")
+
+    args = parser.parse_args(argv)
+    cache = ResultCache(OutputStore())
+
+    if args.command in ("pin", "unpin"):
+        topic = " ".join(args.topic)
+        getattr(cache, args.command)(topic)
+        print(f"{args.command.capitalize()}ned: {topic}")
+        return 0
+
+    if args.command == "status":
+        for topic in cache.pinned_topics():
+            lookup = cache.lookup(topic)
+            suffix = " (refreshing)" if lookup.refreshing else ""
+            print(f"{lookup.state:<8} {_format_age(lookup.age_s):<12} {topic}{suffix}")
+        return 0
+
+    topics = [" ".join(args.topic)] if args.topic else cache.topics_to_warm()
+    if not topics:
+        print("All pinned topics are fresh")
+        return 0
+    print(f"Warming {len(topics)} topics...")
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        return_codes = list(executor.map(lambda topic: launch_agent(topic).wait(), topics))
+    failures = sum(1 for code in return_codes if code != 0)
+    print("Warm-up finished" + (f" with {failures} failed runs" if failures else ""))
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Persistent full-text index of generated research summaries and keynote speeches.
+
+Backed by SQLite FTS5 so past runs can be searched instantly by topic or content
+and reused instead of paying for a new run. Only the first
+``HISTORY_INDEX_MAX_CHARS`` of each artifact are indexed, which bounds the
+memory indexing a very long generation takes.
+"""
+
+import argparse
+import logging
+import re
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.config.settings import HISTORY_DB_FILE, HISTORY_INDEX_MAX_CHARS, OUTPUTS_DIR
+from src.utils.output_store import ARTIFACT_FILES, OutputStore, iter_text_file, topic_key
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    model TEXT,
+    created_at REAL NOT NULL,
+    path TEXT,
+    UNIQUE (key, kind)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS artifacts_fts USING fts5(topic, content);
+"""
+
+# Legacy flat output files written before the content-addressed store
+LEGACY_SUFFIXES = {
+    "_research_summary.txt": "research",
+    "_keynote_speech.txt": "keynote",
+}
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text: str) -> str:
+    """Turn free text into a safe FTS5 query (all terms, prefix match on the last)."""
+    words = WORD_PATTERN.findall(text)
+    if not words:
+        return ""
+    terms = [f'"{w}"' for w in words[:-1]]
+    terms.append(f'"{words[-1]}"*')
+    return " ".join(terms)
+
+
+class RunHistory:
+    """Search index over every artifact the agent has produced."""
+
+    def __init__(self, db_path: Union[str, Path] = HISTORY_DB_FILE):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def record_artifact(self, topic: str, kind: str, content: str, model: Optional[str] = None,
+                        created_at: Optional[float] = None, path: Optional[Union[str, Path]] = None) -> None:
+        """Insert or replace a single artifact in the index."""
+        key = topic_key(topic)
+        created_at = created_at or time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT id FROM artifacts WHERE key = ? AND kind = ?", (key, kind)
+            ).fetchone()
+            if row:
+                conn.execute("DELETE FROM artifacts_fts WHERE rowid = ?", (row["id"],))
+                conn.execute(
+                    "UPDATE artifacts SET topic = ?, model = ?, created_at = ?, path = ? WHERE id = ?",
+                    (topic, model, created_at, str(path) if path else None, row["id"]),
+                )
+                row_id = row["id"]
+            else:
+                cursor = conn.execute(
+                    "INSERT INTO artifacts (key, kind, topic, model, created_at, path) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, kind, topic, model, created_at, str(path) if path else None),
+                )
+                row_id = cursor.lastrowid
+            conn.execute(
+                "INSERT INTO artifacts_fts (rowid, topic, content) VALUES (?, ?, ?)",
+                (row_id, topic, content),
+            )
+
+    def record_run(self, store: OutputStore, topic: str) -> int:
+        """Index all artifacts the store holds for a topic. Returns the number indexed."""
+        meta = store.read_metadata(topic) or {}
+        count = 0
+        for kind in ARTIFACT_FILES:
+            content = store.read_artifact(topic, kind, max_chars=HISTORY_INDEX_MAX_CHARS)
+            if not content:
+                continue
+            artifact = meta.get("artifacts", {}).get(kind, {})
+            self.record_artifact(
+                topic,
+                kind,
+                content,
+                model=meta.get("model"),
+                created_at=artifact.get("mtime"),
+                path=store.artifact_path(topic, kind),
+            )
+            count += 1
+        return count
+
+    def search(self, text: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Search topics and content, best matches first."""
+        query = build_match_query(text)
+        if not query:
+            return self.recent(limit)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                """
+                SELECT a.key, a.kind, a.topic, a.model, a.created_at, a.path,
+                       snippet(artifacts_fts, 1, '**', '**', '...', 16) AS snippet
+                FROM artifacts_fts
+                JOIN artifacts a ON a.id = artifacts_fts.rowid
+                WHERE artifacts_fts MATCH ?
+                ORDER BY bm25(artifacts_fts, 5.0, 1.0)
+                LIMIT ?
+                """,
+                (query, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recently generated artifacts."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                """
+                SELECT key, kind, topic, model, created_at, path, '' AS snippet
+                FROM artifacts ORDER BY created_at DESC LIMIT ?
+                """,
+                (limit,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def rebuild(self, store: OutputStore, legacy_dir: Union[str, Path, None] = None) -> int:
+        """Re-index everything in the store plus any legacy flat output files."""
+        count = 0
+        for entry in store.list_entries().values():
+            if entry.get("topic"):
+                count += self.record_run(store, entry["topic"])
+
+        legacy_dir = Path(legacy_dir) if legacy_dir else store.root
+        for path in legacy_dir.glob("*.txt"):
+            for suffix, kind in LEGACY_SUFFIXES.items():
+                if path.name.endswith(suffix):
+                    topic = path.name[: -len(suffix)].replace("_", " ")
+                    self.record_artifact(
+                        topic, kind, next(iter_text_file(path, HISTORY_INDEX_MAX_CHARS), ""),
+                        created_at=path.stat().st_mtime, path=path,
+                    )
+                    count += 1
+        logger.info(f"Indexed {count} artifacts into {self.db_path}")
+        return count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line interface for searching and rebuilding the run history."""
+    parser = argparse.ArgumentParser(description="Search past research and keynote runs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    search_parser = subparsers.add_parser("search", help="Search past runs")
+    search_parser.add_argument("query", nargs="*", help="Words to search for (empty lists recent runs)")
+    search_parser.add_argument("-n", "--limit", type=int, default=20, help="Maximum results to show")
+
+    subparsers.add_parser("rebuild", help="Re-index all outputs on disk")
+
+    args = parser.parse_args(argv)
+    history = RunHistory()
+
+    if args.command == "rebuild":
+        count = history.rebuild(OutputStore(), legacy_dir=OUTPUTS_DIR)
+        print(f"Indexed {count} artifacts")
+        return
+
+    results = history.search(" ".join(args.query), limit=args.limit)
+    if not results:
+        print("No matching runs found.")
+        return
+    for result in results:
+        created = time.strftime("%Y-%m-%d %H:%M", time.localtime(result["created_at"]))
+        print(f"[{created}] {result['kind']:<8} {result['topic']}  ({result['model'] or 'unknown model'})")
+        if result["snippet"]:
+            print(f"    {result['snippet']}")
+        print(f"    {result['path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from src.utils.broker import COMPLETE, FAILED, QUEUED, RUNNING, SQLiteBroker, get_broker
+
+
+class TestSQLiteBroker(unittest.TestCase):
+    def setUp(self):
+        """Use a broker database in a temporary directory, standing in for a shared volume"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.broker = get_broker(f"sqlite:///{Path(self.tmp_dir.name) / 'jobs.db'}")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_claims_in_order_and_completes(self):
+        """Jobs are claimed oldest first and only the lease holder can finish them"""
+        first = self.broker.enqueue("Edge AI")
+        self.broker.enqueue("Solid-state batteries")
+
+        job = self.broker.claim("node-a", lease_seconds=60)
+        self.assertEqual((job.id, job.status, job.attempts, job.worker), (first.id, RUNNING, 1, "node-a"))
+        self.assertFalse(self.broker.complete(job.id, "node-b"))
+        self.assertTrue(self.broker.heartbeat(job.id, "node-a", 60, stage="research_complete"))
+        self.assertTrue(self.broker.complete(job.id, "node-a"))
+        self.assertEqual(self.broker.get(job.id).stage, "research_complete")
+        self.assertEqual(self.broker.counts()[COMPLETE], 1)
+
+    def test_expired_lease_is_requeued(self):
+        """A job whose worker stops heartbeating is claimed again, then failed after max attempts"""
+        job = self.broker.enqueue("Edge AI", max_attempts=2)
+        self.broker.claim("node-a", lease_seconds=0.01)
+        time.sleep(0.02)
+
+        retried = self.broker.claim("node-b", lease_seconds=0.01)
+        self.assertEqual((retried.id, retried.attempts, retried.worker), (job.id, 2, "node-b"))
+        self.assertFalse(self.broker.heartbeat(job.id, "node-a", 60))
+        time.sleep(0.02)
+
+        self.assertEqual(self.broker.requeue_expired(), 1)
+        self.assertEqual(self.broker.get(job.id).status, FAILED)
+        self.assertIsNone(self.broker.claim("node-c", lease_seconds=60))
+
+    def test_concurrent_claims_are_exclusive(self):
+        """Workers claiming at the same time never receive the same job"""
+        for i in range(20):
+            self.broker.enqueue(f"Topic {i}")
+        claimed = []
+
+        def claim_all(worker):
+            broker = SQLiteBroker(self.broker.db_path)
+            while True:
+                job = broker.claim(worker, lease_seconds=60)
+                if job is None:
+                    return
+                claimed.append(job.id)
+
+        threads = [threading.Thread(target=claim_all, args=(f"node-{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(claimed), 20)
+        self.assertEqual(len(set(claimed)), 20)
+        self.assertEqual(self.broker.counts()[QUEUED], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from src.agents.sectioned_writer import SectionedWriter
+from src.utils.checkpoints import COMPLETE, FAILED, RUNNING, CheckpointStore, active_checkpoint
+
+
+class TestCheckpoints(unittest.TestCase):
+    def setUp(self):
+        """Create an isolated checkpoint directory for each test"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = CheckpointStore(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_steps_survive_reopening(self):
+        """Saved steps are read back, in completion order, by a new store instance"""
+        run = self.store.create("Edge AI")
+        run.save("search-abc", {"query": "edge ai", "result": {"organic": []}})
+        run.save("research", {"raw": "Findings", "compaction": None})
+        reopened = CheckpointStore(self.tmp_dir.name).open(run.run_id)
+        self.assertEqual(reopened.topic, "Edge AI")
+        self.assertEqual(reopened.steps, ["search-abc", "research"])
+        self.assertEqual(reopened.get("research")["raw"], "Findings")
+        self.assertIsNone(reopened.get("keynote"))
+        self.assertIsNone(self.store.open("../elsewhere"))
+
+    def test_only_interrupted_runs_are_resumed(self):
+        """Failed runs and runs whose process died are resumable; live and finished runs are not"""
+        live = self.store.create("Edge AI")
+        self.assertFalse(live.is_resumable())
+        self.assertIsNone(self.store.latest_resumable("edge  ai"))
+
+        live.mark(COMPLETE)
+        self.assertFalse(live.is_resumable())
+
+        failed = self.store.create("Edge AI")
+        failed.mark(FAILED, error="provider error")
+        self.assertEqual(self.store.latest_resumable("edge ai").run_id, failed.run_id)
+        self.assertIsNone(self.store.latest_resumable("Fusion"))
+
+        abandoned = self.store.create("Fusion")
+        abandoned.meta["pid"] = 2 ** 22 + 1  # above the kernel's pid limit, so never alive
+        self.assertEqual(abandoned.status, RUNNING)
+        self.assertTrue(abandoned.is_resumable())
+
+        abandoned.meta.update(host="another-host", pid=os.getpid(), updated_at=0)
+        self.assertTrue(abandoned.is_resumable())
+
+    def test_delete_and_prune(self):
+        """Completed runs are deleted and old runs pruned"""
+        done, old = self.store.create("Edge AI"), self.store.create("Fusion")
+        self.store.delete(done.run_id)
+        self.assertIsNone(self.store.open(done.run_id))
+        self.assertEqual(self.store.prune(max_age_seconds=-1), 1)
+        self.assertEqual(self.store.list_runs(), [])
+        self.assertIsNone(self.store.open(old.run_id))
+
+    def test_active_checkpoint_and_restored_passes(self):
+        """Writing passes already in the checkpoint are loaded instead of run"""
+        run = self.store.create("Edge AI")
+        self.assertIsNone(active_checkpoint())
+        with run.activate():
+            self.assertIs(active_checkpoint(), run)
+        self.assertIsNone(active_checkpoint())
+
+        calls = []
+
+        def draft():
+            calls.append(1)
+            return "Drafted section"
+
+        # The passes don't touch the writer's crews, so skip building them
+        writer = SectionedWriter.__new__(SectionedWriter)
+        writer.restored = []
+        self.assertEqual(writer._pass(run, "section-1", draft), "Drafted section")
+        self.assertEqual(writer._pass(run, "section-1", draft), "Drafted section")
+        self.assertEqual((len(calls), writer.restored), (1, ["section-1"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
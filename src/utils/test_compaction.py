@@ -0,0 +1,59 @@
+import unittest
+
+from src.utils.compaction import compact, compact_research, estimate_tokens, split_units
+
+RESEARCH = """Thought: I now know the final answer
+Final Answer:
+## Quantum sensing
+- Quantum sensors measure magnetic fields with atomic precision, enabling new medical imaging.
+- Quantum sensors measure magnetic fields with atomic precision, enabling new medical imaging!
+- Diamond nitrogen-vacancy centers allow quantum sensing at room temperature.
+## Quantum networking
+- Quantum networks distribute entangled photons between cities for secure communication.
+- Quantum repeaters extend the range of quantum networks beyond fiber loss limits.
+Let me know if you need more details.
+"""
+
+
+class TestCompaction(unittest.TestCase):
+    def test_boilerplate_and_duplicates_removed(self):
+        """Agent scaffolding and repeated points never reach the writer"""
+        result = compact(RESEARCH, budget_tokens=10_000)
+        self.assertNotIn("Thought:", result.text)
+        self.assertNotIn("Let me know", result.text)
+        self.assertEqual(result.text.count("atomic precision"), 1)
+        self.assertEqual(result.duplicates_removed, 1)
+        self.assertEqual(result.ranked_out, 0)
+
+    def test_fits_budget_and_keeps_order(self):
+        """Long research is cut to the budget with units in their original order"""
+        long_research = "\n".join(
+            f"- Finding {i}: quantum error correction milestone number {i} improves logical qubit fidelity "
+            f"for variant {i * 7} of the {i % 5} architecture."
+            for i in range(200)
+        )
+        result = compact(long_research, budget_tokens=300, topic="quantum error correction")
+        self.assertLessEqual(result.compacted_tokens, 300)
+        self.assertGreater(result.savings_ratio, 0.8)
+
+        kept = [int(line.split(":")[0].split()[-1]) for line in result.text.splitlines()]
+        self.assertEqual(kept, sorted(kept))
+
+    def test_headings_follow_kept_units(self):
+        """A section heading is kept only when one of its points is"""
+        result = compact(RESEARCH, budget_tokens=estimate_tokens(RESEARCH) // 3, topic="quantum networking")
+        for heading in ("## Quantum sensing", "## Quantum networking"):
+            section_kept = any(
+                unit.section == next(u.section for u in split_units(RESEARCH) if u.text == heading)
+                and not unit.heading and unit.text in result.text
+                for unit in split_units(RESEARCH)
+            )
+            self.assertEqual(heading in result.text, section_kept)
+
+    def test_disabled_budget_passes_through(self):
+        """A zero budget disables compaction entirely"""
+        self.assertIsNone(compact_research(RESEARCH, budget_tokens=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.utils.output_store import OutputStore, atomic_write_text, page_offsets, read_text_range, topic_key
+
+
+class TestOutputStore(unittest.TestCase):
+    def setUp(self):
+        """Create an isolated store for each test"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = OutputStore(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_long_topics_do_not_collide(self):
+        """Topics sharing a long common prefix get distinct keys"""
+        prefix = "Research and analyze recent AI breakthroughs and their business applications"
+        first = self.store.artifact_path(prefix + " in healthcare", "research")
+        second = self.store.artifact_path(prefix + " in finance", "research")
+        self.assertNotEqual(first, second)
+
+    def test_key_ignores_case_and_whitespace(self):
+        """Trivial formatting differences map to the same key"""
+        self.assertEqual(topic_key("Quantum  Computing"), topic_key("quantum computing "))
+
+    def test_artifact_round_trip(self):
+        """Written artifacts can be read back and missing ones read as empty"""
+        self.store.write_artifact("quantum computing", "keynote", "Hello world")
+        self.assertEqual(self.store.read_artifact("quantum computing", "keynote"), "Hello world")
+        self.assertEqual(self.store.read_artifact("quantum computing", "research"), "")
+
+    def test_metadata_updates_index(self):
+        """Metadata writes merge fields and are reflected in the index"""
+        self.store.write_artifact("quantum computing", "research", "Summary")
+        self.store.write_metadata("quantum computing", model="mistral/mistral-large-latest", status="running")
+        meta = self.store.write_metadata("quantum computing", status="complete")
+
+        self.assertEqual(meta["model"], "mistral/mistral-large-latest")
+        self.assertIn("research", meta["artifacts"])
+        index = self.store.list_entries()
+        self.assertEqual(index[topic_key("quantum computing")]["status"], "complete")
+        self.assertEqual(self.store.rebuild_index(), index)
+
+    def test_atomic_write_leaves_no_temp_files(self):
+        """Atomic writes replace the target and clean up their temp file"""
+        target = Path(self.tmp_dir.name) / "file.txt"
+        atomic_write_text(target, "first")
+        atomic_write_text(target, "second")
+        self.assertEqual(target.read_text(encoding="utf-8"), "second")
+        self.assertEqual([p.name for p in target.parent.iterdir()], ["file.txt"])
+
+    def test_atomic_writes_use_the_umask_mode(self):
+        """Atomically written files get the umask-based mode, not mkstemp's owner-only one"""
+        target = Path(self.tmp_dir.name) / "file.txt"
+        atomic_write_text(target, "text")
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(stat.S_IMODE(os.stat(target).st_mode), 0o666 & ~umask)
+
+    def test_concurrent_metadata_writes_keep_every_field(self):
+        """Writers merging different fields into the same sidecar never drop each other's fields"""
+        def write(i):
+            for j in range(5):
+                OutputStore(self.tmp_dir.name).write_metadata("edge ai", **{f"field_{i}_{j}": j})
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        meta = self.store.read_metadata("edge ai")
+        self.assertEqual({k for k in meta if k.startswith("field_")},
+                         {f"field_{i}_{j}" for i in range(4) for j in range(5)})
+
+    def test_streamed_artifacts(self):
+        """Chunked writes appear only when complete, and chunked reads return the whole text"""
+        self.store.write_artifact("edge ai", "keynote", "Old keynote")
+        with self.assertRaises(RuntimeError):
+            with self.store.artifact_writer("edge ai", "keynote") as f:
+                f.write("Half a new keyn")
+                raise RuntimeError("generation failed")
+        self.assertEqual(self.store.read_artifact("edge ai", "keynote"), "Old keynote")
+
+        with self.store.artifact_writer("edge ai", "keynote") as f:
+            for i in range(1000):
+                f.write(f"Paragraph {i}.\n")
+        chunks = list(self.store.iter_artifact("edge ai", "keynote", chunk_chars=1000))
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual("".join(chunks), self.store.read_artifact("edge ai", "keynote"))
+        self.assertEqual(self.store.read_artifact("edge ai", "keynote", max_chars=9), "Paragraph")
+        self.assertEqual(list(self.store.iter_artifact("edge ai", "research")), [])
+
+    def test_pages_split_at_line_and_character_boundaries(self):
+        """Pages end at line breaks, never split a character, and cover the file exactly"""
+        target = Path(self.tmp_dir.name) / "long.txt"
+        text = "".join(f"Zeile {i}: Größe und Übermaß\n" for i in range(500)) + "é" * 3000
+        atomic_write_text(target, text)
+        offsets = page_offsets(target, 1000)
+        ends = offsets[1:] + [None]
+        pages = [read_text_range(target, start, end) for start, end in zip(offsets, ends)]
+
+        self.assertEqual("".join(pages), text)
+        self.assertTrue(all(page.endswith("\n") for page in pages[:-4]))
+        self.assertTrue(all(len(page.encode("utf-8")) <= 2000 for page in pages))
+        self.assertNotIn("\ufffd", "".join(pages))
+        self.assertEqual(page_offsets(Path(self.tmp_dir.name) / "missing.txt", 1000), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
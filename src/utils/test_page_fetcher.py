@@ -0,0 +1,115 @@
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.utils.page_fetcher import CONTENT_KEY, PageCache, PageFetcher, enrich_search_results, extract_main_text
+
+ARTICLE = """<html><head><title>Quantum sensing</title><script>var tracking = "do not read this";</script></head>
+<body><nav>Home | About | Products | Contact us today for more information</nav>
+<article><h1>Quantum sensing</h1>
+<p>Quantum sensors use entangled atoms to measure magnetic fields with unprecedented precision.</p>
+<p>Hospitals are piloting them for brain imaging without the need for cryogenic cooling.</p></article>
+<footer>Copyright 2025 Example Corp. All rights reserved. Terms of service apply here.</footer>
+</body></html>"""
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves the same article under every path, with an ETag and a small delay."""
+    requests = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests.append((self.path, self.headers.get("If-None-Match")))
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(0.05)
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = ARTICLE.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestPageFetcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Use an isolated page cache and reset the fixture's request log"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        FixtureHandler.requests = []
+        FixtureHandler.peak = 0
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_extracts_main_text(self):
+        """Scripts, navigation and footers are dropped from page text"""
+        text = extract_main_text(ARTICLE)
+        self.assertIn("entangled atoms", text)
+        self.assertNotIn("tracking", text)
+        self.assertNotIn("Contact us", text)
+        self.assertNotIn("Copyright", text)
+
+    def test_concurrency_is_bounded(self):
+        """No more than the configured number of downloads run at once"""
+        fetcher = PageFetcher(PageCache(self.tmp_dir.name), concurrency=2)
+        pages = fetcher.fetch(f"{self.base_url}/page{i}" for i in range(6))
+        self.assertEqual(len(pages), 6)
+        self.assertTrue(all("entangled atoms" in page.text for page in pages.values()))
+        self.assertLessEqual(FixtureHandler.peak, 2)
+
+    def test_cache_and_etag_revalidation(self):
+        """Fresh pages come from disk; stale ones are revalidated with their ETag"""
+        url = f"{self.base_url}/article"
+        PageFetcher(PageCache(self.tmp_dir.name)).fetch([url])
+        PageFetcher(PageCache(self.tmp_dir.name)).fetch([url])
+        self.assertEqual(len(FixtureHandler.requests), 1)
+
+        page = PageFetcher(PageCache(self.tmp_dir.name, ttl_seconds=0)).fetch([url])[url]
+        self.assertEqual(FixtureHandler.requests[-1], ("/article", '"v1"'))
+        self.assertEqual(page.status, 304)
+        self.assertIn("entangled atoms", page.text)
+
+    def test_enrich_search_results(self):
+        """Top organic results gain condensed page text; others are untouched"""
+        result = {"organic": [{"title": f"Result {i}", "link": f"{self.base_url}/r{i}"} for i in range(5)]}
+        fetcher = PageFetcher(PageCache(self.tmp_dir.name))
+        enriched = enrich_search_results(result, fetcher, "quantum sensing", top_n=2, content_tokens=30)
+
+        self.assertEqual(enriched, 2)
+        self.assertIn("entangled atoms", result["organic"][0][CONTENT_KEY])
+        self.assertLessEqual(len(result["organic"][0][CONTENT_KEY]), 30 * 4 + 10)
+        self.assertNotIn(CONTENT_KEY, result["organic"][2])
+        self.assertEqual(enrich_search_results(result, fetcher, "quantum sensing", top_n=2), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
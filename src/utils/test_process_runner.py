@@ -0,0 +1,74 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.utils.process_runner import ProcessRunner
+
+
+def python(code):
+    """Command running a snippet in a child interpreter"""
+    return [sys.executable, "-c", code]
+
+
+class TestProcessRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_path = Path(self.tmp_dir.name) / "run.log"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_child(self, code, **kwargs):
+        runner = ProcessRunner(python(code), log_path=self.log_path, **kwargs).start()
+        self.assertEqual(runner.wait(timeout=30), 0)
+        return runner
+
+    def test_interleaved_streams_are_kept_apart(self):
+        """Lines from stdout and stderr are all logged, tagged with their stream, and can be tailed separately"""
+        runner = self.run_child(
+            "import sys\n"
+            "for i in range(5):\n"
+            "    print(f'out {i}', flush=True)\n"
+            "    print(f'\\x1b[31merr {i}\\x1b[0m', file=sys.stderr, flush=True)\n"
+        )
+        self.assertEqual(runner.tail(stream="stdout"), [f"out {i}" for i in range(5)])
+        self.assertEqual(runner.tail(stream="stderr"), [f"err {i}" for i in range(5)])
+        self.assertEqual(runner.tail(2, stream="stderr"), ["err 3", "err 4"])
+        log = self.log_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(sorted(log), sorted([f"[stdout] out {i}" for i in range(5)] +
+                                             [f"[stderr] err {i}" for i in range(5)]))
+        # Each stream's lines keep their order in the log
+        self.assertEqual([line for line in log if line.startswith("[stderr]")],
+                         [f"[stderr] err {i}" for i in range(5)])
+
+    def test_tail_is_bounded(self):
+        """Only the last tail_lines lines stay in memory; the log file has them all"""
+        runner = self.run_child("for i in range(1000): print(i)", tail_lines=10)
+        self.assertEqual(runner.tail(), [str(i) for i in range(990, 1000)])
+        self.assertEqual(len(self.log_path.read_text(encoding="utf-8").splitlines()), 1000)
+
+    def test_output_larger_than_the_pipe_buffer(self):
+        """A child writing megabytes to both pipes never blocks, since nothing waits for the parent to read"""
+        runner = self.run_child(
+            "import sys\n"
+            "line = 'x' * 1023\n"
+            "for i in range(2048):\n"
+            "    print(line)\n"
+            "    print(line, file=sys.stderr)\n"
+            "print('done')\n"
+        )
+        self.assertEqual(runner.tail(1, stream="stdout"), ["done"])
+        self.assertEqual(len(self.log_path.read_text(encoding="utf-8").splitlines()), 2 * 2048 + 1)
+
+    def test_log_is_closed_when_the_command_cannot_start(self):
+        """A failed launch raises and leaves no open log file behind"""
+        runner = ProcessRunner([str(Path(self.tmp_dir.name) / "missing-executable")], log_path=self.log_path)
+        with self.assertRaises(OSError):
+            runner.start()
+        self.assertTrue(runner._log_file.closed)
+        self.assertIsNone(runner.process)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.utils.profiler import RunProfiler, load_profiles, profile_run, prune_profiles, summarize
+
+
+def busy(seconds):
+    """Burn CPU in the calling thread"""
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def idle(seconds):
+    time.sleep(seconds)
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def profile(self, run_id, **kwargs):
+        with RunProfiler(run_id, "Edge AI", interval=0.005, output_dir=self.dir, **kwargs) as profiler:
+            busy(0.3)
+            idle(0.3)
+        return load_profiles(self.dir)[-1], profiler
+
+    def test_separates_busy_and_waiting_code(self):
+        """Busy functions accrue CPU time; sleeping ones accrue only wall time"""
+        profile, profiler = self.profile("run-1", trace_allocations=True)
+        functions = {f["name"].split(" ")[0]: f for f in profile["functions"]}
+        self.assertGreater(profile["samples"], 20)
+        self.assertGreater(functions["busy"]["total_cpu_s"], 0.15)
+        self.assertGreater(functions["idle"]["self_wall_s"], 0.15)
+        self.assertLess(functions["idle"]["self_cpu_s"], 0.05)
+        self.assertIn("src.utils.test_profiler", profile["components"])
+        self.assertGreater(profile["rss_peak_bytes"] or 1, 0)
+        self.assertIsNotNone(profile["allocations"])
+        self.assertTrue((self.dir / "run-1.folded").read_text().strip())
+        self.assertEqual(profiler.path, self.dir / "run-1.json")
+
+    def test_summary_and_pruning(self):
+        """Profiles are aggregated across runs and only the most recent are kept"""
+        self.profile("run-1")
+        self.profile("run-2", use_cprofile=True)
+        self.assertTrue((self.dir / "run-2.pstats").exists())
+        summary = summarize(load_profiles(self.dir), sort="self_cpu_s")
+        self.assertEqual(summary["runs"], 2)
+        busy_entry = next(f for f in summary["functions"] if f["name"].startswith("busy "))
+        self.assertEqual(busy_entry["runs"], 2)
+
+        self.assertEqual(prune_profiles(self.dir, keep=1), 1)
+        self.assertEqual([p["run_id"] for p in load_profiles(self.dir)], ["run-2"])
+        self.assertFalse((self.dir / "run-1.folded").exists())
+
+    def test_rate_zero_disables_profiling(self):
+        """Runs outside the sampling rate are not profiled"""
+        with profile_run("run-3", rate=0) as profiler:
+            self.assertIsNone(profiler)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.utils.output_store import OutputStore
+from src.utils.result_cache import EXPIRED, FRESH, MISS, STALE, BackgroundRefresher, ResultCache
+
+HOUR = 3600
+
+
+class FakeRunner:
+    def __init__(self):
+        self.returncode = None
+        self.log_path = None
+
+    def poll(self):
+        return self.returncode
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        """Create an isolated store and pin list for each test"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = OutputStore(self.tmp_dir.name)
+        self.cache = ResultCache(self.store, ttl_seconds=HOUR, stale_seconds=24 * HOUR,
+                                 pins_file=Path(self.tmp_dir.name) / "pins.json")
+        self.now = time.time()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def complete_run(self, topic, age_s):
+        self.store.write_artifact(topic, "research", "Summary")
+        self.store.write_artifact(topic, "keynote", "Speech")
+        self.store.write_metadata(topic, status="complete", timings={"finished_at": self.now - age_s})
+
+    def test_states_follow_age(self):
+        """Results are fresh within the TTL, stale within the window and expired after it"""
+        self.assertEqual(self.cache.lookup("new topic", self.now).state, MISS)
+        for age, state in ((10, FRESH), (2 * HOUR, STALE), (30 * HOUR, EXPIRED)):
+            self.complete_run("quantum computing", age)
+            self.assertEqual(self.cache.lookup("quantum computing", self.now).state, state)
+
+    def test_pinned_topics_never_expire(self):
+        """Pinned topics stay servable and are listed for warming until fresh"""
+        self.complete_run("quantum computing", 30 * HOUR)
+        self.cache.pin("Quantum  Computing")
+        lookup = self.cache.lookup("quantum computing", self.now)
+        self.assertEqual(lookup.state, STALE)
+        self.assertTrue(lookup.servable)
+        self.assertIn("Quantum  Computing", self.cache.topics_to_warm(self.now))
+
+        self.complete_run("quantum computing", 0)
+        self.assertNotIn("Quantum  Computing", self.cache.topics_to_warm(self.now))
+
+    def test_running_refresh_keeps_previous_result(self):
+        """A refresh in progress still serves the last completed result"""
+        self.complete_run("quantum computing", 2 * HOUR)
+        self.store.write_metadata("quantum computing", status="running", started_at=self.now)
+        lookup = self.cache.lookup("quantum computing", self.now)
+        self.assertEqual(lookup.state, STALE)
+        self.assertTrue(lookup.refreshing)
+
+    def test_refresher_deduplicates_and_caps(self):
+        """Each topic refreshes once at a time and the concurrency cap is respected"""
+        runners = []
+
+        def launch(topic):
+            runners.append(FakeRunner())
+            return runners[-1]
+
+        refresher = BackgroundRefresher(launch=launch, max_concurrent=2)
+        self.assertEqual(refresher.warm(["a", "A ", "b", "c"]), ["a", "b"])
+        runners[0].returncode = 0
+        self.assertTrue(refresher.refresh("c"))
+        self.assertEqual(len(runners), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.utils.output_store import OutputStore
+from src.utils.run_history import RunHistory, build_match_query
+
+
+class TestRunHistory(unittest.TestCase):
+    def setUp(self):
+        """Create an isolated store and history database for each test"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.tmp_dir.name)
+        self.store = OutputStore(root / "outputs")
+        self.history = RunHistory(root / "history.db")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _complete_run(self, topic, research, keynote):
+        self.store.write_artifact(topic, "research", research)
+        self.store.write_artifact(topic, "keynote", keynote)
+        self.store.write_metadata(topic, model="mistral/mistral-large-latest", status="complete")
+        return self.history.record_run(self.store, topic)
+
+    def test_search_by_topic_and_content(self):
+        """Runs can be found by words in the topic or in the generated text"""
+        self.assertEqual(self._complete_run("Quantum computing", "Qubits and error correction", "Ladies and gentlemen"), 2)
+        self._complete_run("Renewable energy", "Solar panel efficiency records", "Friends, the sun")
+
+        self.assertEqual({r["topic"] for r in self.history.search("quantum")}, {"Quantum computing"})
+        self.assertEqual({r["topic"] for r in self.history.search("solar effic")}, {"Renewable energy"})
+
+    def test_rerun_replaces_previous_entry(self):
+        """Re-indexing a topic replaces its old content instead of duplicating it"""
+        self._complete_run("Quantum computing", "Old findings", "Old speech")
+        self._complete_run("Quantum computing", "New findings", "New speech")
+
+        self.assertEqual(self.history.search("old"), [])
+        self.assertEqual(len(self.history.search("quantum")), 2)
+
+    def test_rebuild_imports_legacy_files(self):
+        """Flat files from before the output store are picked up on rebuild"""
+        legacy = self.store.root / "space_tourism_research_summary.txt"
+        legacy.write_text("Orbital hotels", encoding="utf-8")
+
+        self.history.rebuild(self.store)
+        self.assertEqual([r["topic"] for r in self.history.search("orbital")], ["space tourism"])
+
+    def test_match_query_is_quoted(self):
+        """FTS syntax characters in user input are neutralized"""
+        self.assertEqual(build_match_query('AI "NEAR" ai-driven'), '"AI" "NEAR" "ai" "driven"*')
+        self.assertEqual(build_match_query("  "), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
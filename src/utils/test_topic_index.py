@@ -0,0 +1,39 @@
+import unittest
+
+from src.utils.topic_index import TopicIndex, tokenize
+
+
+class TestTopicIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TopicIndex([
+            "Recent AI breakthroughs in business",
+            "Quantum computing for finance",
+            "Renewable energy storage",
+        ])
+
+    def test_near_duplicate_is_matched(self):
+        """Rephrased topics with the same content words are matched"""
+        match = self.index.best_match("AI breakthroughs and business applications")
+        self.assertIsNotNone(match)
+        self.assertEqual(match.topic, "Recent AI breakthroughs in business")
+
+    def test_unrelated_topic_is_not_matched(self):
+        """Topics sharing only a generic word stay below the threshold"""
+        self.assertIsNone(self.index.best_match("AI in healthcare"))
+        self.assertIsNone(self.index.best_match("Deep sea exploration"))
+
+    def test_exact_match_scores_one(self):
+        """Normalized exact matches always score 1.0"""
+        match = self.index.best_match("renewable  ENERGY storage")
+        self.assertAlmostEqual(match.score, 1.0)
+
+    def test_empty_index(self):
+        """An empty index never matches"""
+        self.assertEqual(TopicIndex([]).similar("anything"), [])
+
+    def test_tokenize_strips_stopwords_and_plurals(self):
+        self.assertEqual(tokenize("Research the latest batteries and chips"), ["battery", "chip"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Local TF-IDF similarity index over previously researched topics.
+
+Used to spot near-duplicate topics (e.g. "Recent AI breakthroughs in business" vs.
+"AI breakthroughs and business applications") so earlier results can be reused
+instead of running the full pipeline again. Runs entirely in-process with NumPy.
+"""
+
+import math
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from src.utils.output_store import OutputStore, normalize_topic
+
+# Minimum cosine similarity for a past topic to be offered for reuse
+DEFAULT_SIMILARITY_THRESHOLD = 0.6
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "about", "an", "analyze", "analysis", "and", "are", "as", "at", "be", "by", "for",
+    "from", "how", "in", "into", "is", "it", "its", "latest", "new", "of", "on", "or",
+    "recent", "research", "the", "their", "to", "trends", "what", "with",
+}
+
+
+def _stem(word: str) -> str:
+    """Very light suffix stripping so plural/singular forms line up."""
+    for suffix, replacement in (("ies", "y"), ("sses", "ss"), ("s", "")):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith("ss"):
+            return word[: -len(suffix)] + replacement
+    return word
+
+
+def tokenize(topic: str) -> List[str]:
+    """Split a topic into normalized content words."""
+    return [_stem(w) for w in WORD_PATTERN.findall(topic.lower()) if w not in STOPWORDS]
+
+
+class TopicMatch(NamedTuple):
+    topic: str
+    score: float
+
+
+class TopicIndex:
+    """TF-IDF vectors for a set of topics with cosine-similarity lookup."""
+
+    def __init__(self, topics: Iterable[str]):
+        # Deduplicate on the same normalization the output store uses for keys
+        unique: Dict[str, str] = {}
+        for topic in topics:
+            unique.setdefault(normalize_topic(topic), topic)
+        self.topics = list(unique.values())
+
+        documents = [tokenize(topic) for topic in self.topics]
+        vocabulary = sorted({token for doc in documents for token in doc})
+        self.vocabulary = {token: i for i, token in enumerate(vocabulary)}
+
+        # Smoothed inverse document frequency, as in scikit-learn's TfidfVectorizer
+        doc_freq = np.zeros(len(vocabulary))
+        for doc in documents:
+            for token in set(doc):
+                doc_freq[self.vocabulary[token]] += 1
+        self.idf = np.log((1 + len(documents)) / (1 + doc_freq)) + 1
+
+        self.matrix = np.zeros((len(documents), len(vocabulary)))
+        for row, doc in enumerate(documents):
+            self.matrix[row] = self._vectorize(doc)
+
+    @classmethod
+    def from_store(cls, store: OutputStore) -> "TopicIndex":
+        """Build an index over every completed topic in the output store."""
+        entries = store.list_entries().values()
+        return cls(entry["topic"] for entry in entries if entry.get("status") == "complete" and entry.get("topic"))
+
+    def _vectorize(self, tokens: List[str]) -> np.ndarray:
+        vector = np.zeros(len(self.vocabulary))
+        for token in tokens:
+            index = self.vocabulary.get(token)
+            if index is not None:
+                vector[index] += 1
+        vector *= self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def similar(self, topic: str, threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+                limit: int = 5) -> List[TopicMatch]:
+        """Return past topics whose similarity to ``topic`` is at least ``threshold``."""
+        if not self.topics:
+            return []
+        tokens = tokenize(topic)
+        query = self._vectorize(tokens)
+        scores = self.matrix @ query
+
+        # Out-of-vocabulary words in the query still count against similarity
+        known = sum(1 for token in tokens if token in self.vocabulary)
+        if tokens and known < len(tokens):
+            scores = scores * math.sqrt(known / len(tokens))
+
+        # An exact (normalized) match is always a perfect hit
+        normalized = normalize_topic(topic)
+        for i, candidate in enumerate(self.topics):
+            if normalize_topic(candidate) == normalized:
+                scores[i] = 1.0
+
+        order = np.argsort(-scores)[:limit]
+        return [TopicMatch(self.topics[i], float(scores[i])) for i in order if scores[i] >= threshold]
+
+    def best_match(self, topic: str, threshold: float = DEFAULT_SIMILARITY_THRESHOLD) -> Optional[TopicMatch]:
+        """Return the single closest past topic above the threshold, if any."""
+        matches = self.similar(topic, threshold=threshold, limit=1)
+        return matches[0] if matches else None